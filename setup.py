@@ -52,6 +52,12 @@ setup(
             "flake8>=6.0.0",
             "mypy>=1.0.0",
         ],
+        "fast": [
+            "xxhash>=3.0.0",
+        ],
+        "tokenizer": [
+            "tiktoken>=0.5.0",
+        ],
     },
     entry_points={
         "console_scripts": [
@@ -0,0 +1,49 @@
+"""
+Persistent cache for CodeAnalyzer results, keyed by file content.
+"""
+
+import sys
+import hashlib
+from typing import Any, Dict, Optional
+
+from .response_cache import FileCache
+
+# Directory of the analysis cache inside the configured cache directory
+ANALYSIS_CACHE_SUBDIR = "analysis"
+
+
+class AnalysisCache(FileCache):
+    """
+    Content-addressed on-disk cache of file analyses with LRU eviction.
+
+    Keys cover the file content, the analyzer version and the Python version,
+    since the ast module differs between Python releases. Entries never need
+    to be invalidated: a change to any of these gives a different key, and
+    stale entries are evicted by prune().
+    """
+
+    @staticmethod
+    def make_key(content: str, analyzer_version: str) -> str:
+        """Build the cache key for analyzing some file content."""
+        digest = hashlib.sha256()
+        python_version = "%d.%d" % sys.version_info[:2]
+        digest.update(f"{analyzer_version}\0{python_version}\0".encode("utf-8"))
+        digest.update(content.encode("utf-8", "surrogatepass"))
+        return digest.hexdigest()
+
+    def get(self, key: str) -> Optional[Dict[str, Any]]:
+        """
+        Look up a cached analysis.
+
+        Args:
+            key: Cache key from make_key()
+
+        Returns:
+            The cached analysis, or None on a miss
+        """
+        analysis = self._read(key, "analysis")
+        return analysis if isinstance(analysis, dict) else None
+
+    def put(self, key: str, analysis: Dict[str, Any]) -> None:
+        """Store an analysis in the cache."""
+        self._write(key, {"analysis": analysis})
@@ -0,0 +1,244 @@
+"""
+Batch submission of LLM requests for large, latency-tolerant runs.
+"""
+
+import json
+import shutil
+import logging
+import uuid
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Any, Callable, Dict, Mapping, Optional
+
+logger = logging.getLogger(__name__)
+
+# Directory of batch files inside the configured cache directory
+BATCH_SUBDIR = "batches"
+
+# API endpoint every request of a batch is sent to
+BATCH_ENDPOINT = "/v1/chat/completions"
+
+# Time within which the API completes a batch
+BATCH_COMPLETION_WINDOW = "24h"
+
+# Batch statuses after which no more results will arrive
+TERMINAL_STATUSES = frozenset({"completed", "failed", "expired", "cancelled"})
+
+
+@dataclass
+class BatchResult:
+    """The outcome of one request of a batch."""
+
+    content: Optional[str] = None
+    usage: Optional[Dict[str, Any]] = None
+    error: Optional[str] = None
+
+
+def write_batch_file(path: Path, requests: Mapping[str, Dict[str, Any]]) -> None:
+    """
+    Write requests to a JSONL batch input file.
+
+    Args:
+        path: File to write
+        requests: Chat completion request bodies by custom ID
+    """
+    path.parent.mkdir(parents=True, exist_ok=True)
+    with open(path, "w", encoding="utf-8") as f:
+        for custom_id, body in requests.items():
+            line = {"custom_id": custom_id, "method": "POST", "url": BATCH_ENDPOINT, "body": body}
+            f.write(json.dumps(line) + "\n")
+
+
+def read_batch_output(text: str) -> Dict[str, BatchResult]:
+    """
+    Parse a JSONL batch output or error file.
+
+    Args:
+        text: File content
+
+    Returns:
+        Results by custom ID
+    """
+    results: Dict[str, BatchResult] = {}
+    for line in text.splitlines():
+        if not line.strip():
+            continue
+        entry = json.loads(line)
+        custom_id = entry.get("custom_id")
+        if not custom_id:
+            continue
+
+        response = entry.get("response") or {}
+        body = response.get("body") or {}
+        error = entry.get("error") or body.get("error")
+        if error or response.get("status_code") != 200:
+            message = error.get("message") if isinstance(error, dict) else error
+            results[custom_id] = BatchResult(error=str(message or f"status {response.get('status_code')}"))
+            continue
+
+        try:
+            content = body["choices"][0]["message"]["content"]
+        except (KeyError, IndexError, TypeError):
+            results[custom_id] = BatchResult(error="response has no completion")
+            continue
+        results[custom_id] = BatchResult(content=content, usage=body.get("usage"))
+    return results
+
+
+class BatchBackend:
+    """
+    Interface of a batch endpoint.
+
+    A backend accepts a JSONL file of chat completion requests, reports the
+    status of the batch and returns its results once it is complete.
+    """
+
+    def submit(self, batch_file: Path) -> str:
+        """
+        Submit a batch input file.
+
+        Args:
+            batch_file: File written by write_batch_file()
+
+        Returns:
+            The batch ID
+        """
+        raise NotImplementedError
+
+    def status(self, batch_id: str) -> str:
+        """Get the status of a batch, e.g. "in_progress" or "completed"."""
+        raise NotImplementedError
+
+    def results(self, batch_id: str) -> Dict[str, BatchResult]:
+        """Get the results of a batch by custom ID."""
+        raise NotImplementedError
+
+    def cleanup(self, batch_id: str) -> None:
+        """Remove the files of a batch whose results have been collected."""
+
+
+class OpenAIBatchBackend(BatchBackend):
+    """Batch endpoint of the OpenAI API."""
+
+    def __init__(self, client: Any):
+        self.client = client
+
+    def submit(self, batch_file: Path) -> str:
+        with open(batch_file, "rb") as f:
+            uploaded = self.client.files.create(file=f, purpose="batch")
+        batch = self.client.batches.create(
+            input_file_id=uploaded.id,
+            endpoint=BATCH_ENDPOINT,
+            completion_window=BATCH_COMPLETION_WINDOW
+        )
+        return str(batch.id)
+
+    def status(self, batch_id: str) -> str:
+        return str(self.client.batches.retrieve(batch_id).status)
+
+    def results(self, batch_id: str) -> Dict[str, BatchResult]:
+        batch = self.client.batches.retrieve(batch_id)
+        results: Dict[str, BatchResult] = {}
+        # Failed requests are reported in a separate error file
+        for file_id in (batch.error_file_id, batch.output_file_id):
+            if file_id:
+                results.update(read_batch_output(self.client.files.content(file_id).text))
+        return results
+
+
+class LocalBatchBackend(BatchBackend):
+    """
+    File-based stand-in for a batch endpoint.
+
+    Submitting copies the input file to ``<batch_id>.input.jsonl`` in the
+    backend directory. A batch is complete once ``<batch_id>.output.jsonl``
+    exists in the format of the OpenAI batch API, written either by another
+    process or, when a ``respond`` function is given, on submission. Both
+    files are deleted when the batch is cleaned up.
+    """
+
+    def __init__(self, directory: Path, respond: Optional[Callable[[Dict[str, Any]], str]] = None):
+        self.directory = directory
+        self.respond = respond
+
+    def submit(self, batch_file: Path) -> str:
+        self.directory.mkdir(parents=True, exist_ok=True)
+        batch_id = f"batch_local_{uuid.uuid4().hex[:16]}"
+        shutil.copyfile(batch_file, self._input_path(batch_id))
+        if self.respond is not None:
+            self.complete(batch_id, self.respond)
+        return batch_id
+
+    def complete(self, batch_id: str, respond: Callable[[Dict[str, Any]], str]) -> None:
+        """
+        Write the output file of a batch.
+
+        Args:
+            batch_id: Submitted batch
+            respond: Function giving the completion for a request body; a
+                request fails if it raises an exception
+        """
+        lines = []
+        with open(self._input_path(batch_id), "r", encoding="utf-8") as f:
+            for line in f:
+                if not line.strip():
+                    continue
+                request = json.loads(line)
+                entry: Dict[str, Any] = {"custom_id": request["custom_id"], "response": None, "error": None}
+                try:
+                    content = respond(request["body"])
+                    entry["response"] = {
+                        "status_code": 200,
+                        "body": {"choices": [{"message": {"role": "assistant", "content": content}}]},
+                    }
+                except Exception as e:
+                    entry["error"] = {"message": str(e)}
+                lines.append(json.dumps(entry))
+
+        # Write atomically so a polling process never reads a partial file
+        output_path = self._output_path(batch_id)
+        temp_path = output_path.with_suffix(".tmp")
+        temp_path.write_text("".join(f"{line}\n" for line in lines), encoding="utf-8")
+        temp_path.replace(output_path)
+
+    def status(self, batch_id: str) -> str:
+        if self._output_path(batch_id).exists():
+            return "completed"
+        if self._input_path(batch_id).exists():
+            return "in_progress"
+        raise ValueError(f"Unknown batch: {batch_id}")
+
+    def results(self, batch_id: str) -> Dict[str, BatchResult]:
+        return read_batch_output(self._output_path(batch_id).read_text(encoding="utf-8"))
+
+    def cleanup(self, batch_id: str) -> None:
+        self._input_path(batch_id).unlink(missing_ok=True)
+        self._output_path(batch_id).unlink(missing_ok=True)
+
+    def _input_path(self, batch_id: str) -> Path:
+        return self.directory / f"{batch_id}.input.jsonl"
+
+    def _output_path(self, batch_id: str) -> Path:
+        return self.directory / f"{batch_id}.output.jsonl"
+
+
+def create_batch_backend(name: str, client: Any, directory: Path) -> BatchBackend:
+    """
+    Create the batch backend selected in the configuration.
+
+    Args:
+        name: "openai" or "local"
+        client: OpenAI client
+        directory: Batch directory, used by the local backend
+
+    Returns:
+        The backend
+
+    Raises:
+        ValueError: If the backend name is unknown
+    """
+    if name == "openai":
+        return OpenAIBatchBackend(client)
+    if name == "local":
+        return LocalBatchBackend(directory / "local")
+    raise ValueError(f"Unknown batch backend: {name!r}")
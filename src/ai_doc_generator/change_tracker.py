@@ -2,16 +2,20 @@
 Change tracker for identifying modified files since last documentation run.
 """
 
+import os
 import json
 import subprocess
 from pathlib import Path
 from datetime import datetime
-from typing import List, Dict, Any, cast
+from typing import List, Dict, Any, Optional, Tuple
+from concurrent.futures import ThreadPoolExecutor
 import logging
 import hashlib
 
 from .config import Config
 from .file_scanner import FileScanner
+from .hashing import hash_file
+from .state_store import StateStore, open_state_store
 
 logger = logging.getLogger(__name__)
 
@@ -19,23 +23,58 @@ logger = logging.getLogger(__name__)
 class ChangeTracker:
     """Tracks changes to files between documentation runs."""
 
-    def __init__(self, config: Config):
+    def __init__(self, config: Config, file_scanner: Optional[FileScanner] = None):
         self.config = config
-        self.state_file = config.project_root / config.state_file
-        self.file_scanner = FileScanner(config)
+        # Share the caller's scanner so its compiled patterns are reused
+        self.file_scanner = file_scanner or FileScanner(config)
         self._state = self._load_state()
+        self.state_file = self._state.path
+        if not self._state.get("files"):
+            self._state["hash_algorithm"] = config.hash_algorithm
+        else:
+            # Stored hashes keep the algorithm they were calculated with (states
+            # written before it was recorded used SHA-256)
+            self._state.setdefault("hash_algorithm", "sha256")
+        # Set when stat information was refreshed without documenting the file
+        self._state_dirty = False
+        # Hashes calculated during change detection, by file: (mtime_ns, size, hash)
+        self._detected_hashes: Dict[Path, Tuple[int, int, str]] = {}
 
     def has_previous_run(self) -> bool:
         """Check if there's a previous documentation run."""
         return self.state_file.exists() and bool(self._state.get("files"))
 
+    def get_tracked_files(self) -> List[str]:
+        """Get the documented files recorded in the state, relative to the project root."""
+        return list(self._state["files"])
+
+    def get_import_graph(self) -> Optional[Dict[str, Any]]:
+        """Get the import graph stored by the previous run, if any."""
+        return self._state.get("import_graph")
+
     def get_changed_files(self) -> List[Path]:
         """
         Get list of files that have changed since last run.
 
+        With git discovery in a git repository with a recorded commit from the
+        previous run, only the files reported by git are checked. Otherwise
+        every file in the project is compared against the stored state.
+
         Returns:
             List of Path objects for changed files
         """
+        changed_files = None
+        if self._uses_git_detection():
+            changed_files = self._get_git_changed_files()
+        if changed_files is None:
+            changed_files = self._get_scanned_changed_files()
+
+        if self._state_dirty:
+            self._save_state()
+        return changed_files
+
+    def _get_scanned_changed_files(self) -> List[Path]:
+        """Find changed files by comparing every project file against the state."""
         changed_files = []
 
         # Get all current files
@@ -44,13 +83,13 @@ class ChangeTracker:
         current_file_set = set(str(f.relative_to(self.config.project_root)) for f in current_files)
 
         # Get previous file set
-        previous_files = self._state.get("files", {})
+        previous_files = dict(self._state["files"].items())
         previous_file_set = set(previous_files.keys())
 
         # Find new files
         new_files = current_file_set - previous_file_set
         for file_path_str in new_files:
-            changed_files.append(Path(file_path_str))
+            changed_files.append(self.config.project_root / file_path_str)
             logger.info(f"New file: {file_path_str}")
 
         # Find deleted files (we'll handle these in the doc builder)
@@ -59,156 +98,274 @@ class ChangeTracker:
             logger.info(f"Deleted file: {file_path_str}")
 
         # Find modified files
+        candidates = []
         for file_path in current_files:
             relative_str = str(file_path.relative_to(self.config.project_root))
             if relative_str in previous_files:
-                # Check multiple indicators of change
-                if self._has_file_changed(file_path, previous_files[relative_str]):
-                    changed_files.append(file_path)
-                    logger.info(f"Modified file: {file_path}")
+                candidates.append((file_path, relative_str, previous_files[relative_str]))
 
-        # Also check for files affected by git changes
-        git_changed = self._get_git_changed_files()
-        for git_file in git_changed:
-            if git_file.exists() and git_file not in changed_files:
-                changed_files.append(git_file)
+        for file_path in self._find_modified_files(candidates):
+            changed_files.append(file_path)
+            logger.info(f"Modified file: {file_path}")
 
-        return sorted(list(set(changed_files)))
+        return sorted(changed_files)
 
     def _has_file_changed(self, file_path: Path, previous_info: Dict) -> bool:
         """Check if a file has changed since last run."""
-        try:
-            # Get current file stats
-            stat = file_path.stat()
-            current_mtime = stat.st_mtime
-            current_size = stat.st_size
+        relative_str = str(file_path.relative_to(self.config.project_root))
+        return bool(self._find_modified_files([(file_path, relative_str, previous_info)]))
 
-            # Check modification time
-            if current_mtime > previous_info.get("mtime", 0):
-                return True
+    def _find_modified_files(self, candidates: List[Tuple[Path, str, Dict]]) -> List[Path]:
+        """
+        Find the files that changed since their state was recorded.
 
-            # Check file size
-            if current_size != previous_info.get("size", -1):
-                return True
+        When ``trust_file_stat`` is enabled and the modification time, size,
+        inode and change time all match the state, the file is unchanged and
+        is not read. Otherwise a size change means the file changed, and the
+        content hash decides for everything else; the hashes are calculated
+        concurrently. If only the stat information changed (e.g. the file was
+        touched), the stored stat is refreshed so the file is not hashed again
+        on the next run.
 
-            # Check content hash as final verification
-            current_hash = self._calculate_file_hash(file_path)
-            if current_hash != previous_info.get("hash"):
-                return True
+        Args:
+            candidates: (file, relative path, stored state entry) triples to check
 
-        except Exception as e:
-            logger.error(f"Error checking file {file_path}: {e}")
-            return True
+        Returns:
+            List of modified files
+        """
+        modified = []
+        to_hash = []
 
-        return False
+        for file_path, relative_str, previous_info in candidates:
+            try:
+                stat = file_path.stat()
+            except OSError as e:
+                logger.error(f"Error checking file {file_path}: {e}")
+                modified.append(file_path)
+                continue
+
+            if self.config.trust_file_stat and self._stat_matches(stat, previous_info):
+                continue
+
+            # Check file size
+            if stat.st_size != previous_info.get("size", -1):
+                modified.append(file_path)
+                continue
+
+            to_hash.append((file_path, relative_str, previous_info, stat))
+
+        # Check content hash as final verification
+        hashes = self._hash_files([file_path for file_path, _, _, _ in to_hash])
+        for file_path, relative_str, previous_info, stat in to_hash:
+            current_hash = hashes[file_path]
+            self._detected_hashes[file_path] = (stat.st_mtime_ns, stat.st_size, current_hash)
+
+            if not current_hash or current_hash != previous_info.get("hash"):
+                modified.append(file_path)
+            else:
+                self._state["files"][relative_str] = {**previous_info, **self._stat_info(stat)}
+                self._state_dirty = True
+
+        return modified
+
+    @staticmethod
+    def _stat_info(stat: os.stat_result) -> Dict[str, Any]:
+        """Get the stat information stored for a file."""
+        return {
+            "mtime": stat.st_mtime,
+            "mtime_ns": stat.st_mtime_ns,
+            "ctime_ns": stat.st_ctime_ns,
+            "inode": stat.st_ino,
+            "size": stat.st_size,
+        }
+
+    @staticmethod
+    def _stat_matches(stat: os.stat_result, previous_info: Dict) -> bool:
+        """Check whether a file's stat information matches the stored one."""
+        return (
+            stat.st_mtime_ns == previous_info.get("mtime_ns")
+            and stat.st_size == previous_info.get("size")
+            and stat.st_ino == previous_info.get("inode")
+            and stat.st_ctime_ns == previous_info.get("ctime_ns")
+        )
 
     def _calculate_file_hash(self, file_path: Path) -> str:
-        """Calculate SHA256 hash of file content."""
+        """Calculate the hash of a file's content, or an empty string on error."""
         try:
-            with open(file_path, 'rb') as f:
-                return hashlib.sha256(f.read()).hexdigest()
+            return hash_file(file_path, self._state["hash_algorithm"])
         except Exception:
             return ""
 
-    def _get_git_changed_files(self) -> List[Path]:
-        """Get files changed according to git."""
-        changed_files = []
+    def _hash_files(self, file_paths: List[Path]) -> Dict[Path, str]:
+        """Hash several files, using a thread pool when there is more than one."""
+        workers = min(self.config.hash_workers, len(file_paths))
+        if workers <= 1:
+            return {file_path: self._calculate_file_hash(file_path) for file_path in file_paths}
+
+        # hashlib releases the GIL while hashing, so threads hash in parallel
+        with ThreadPoolExecutor(max_workers=workers) as executor:
+            return dict(zip(file_paths, executor.map(self._calculate_file_hash, file_paths)))
+
+    def _uses_git_detection(self) -> bool:
+        """
+        Check whether changes are read from git.
+
+        Git never reports files ignored by .gitignore, which the file system
+        walk documents, so git is only asked when it also lists the files.
+        """
+        return self.config.git_change_detection and self.config.discovery == "git"
+
+    def _get_git_changed_files(self) -> Optional[List[Path]]:
+        """
+        Get changed files from git, relative to the last documented commit.
+
+        Runs one ``git diff`` against the recorded commit (committed, staged
+        and unstaged changes) and one ``git ls-files --others`` for untracked
+        files, so only the reported files are stat-checked. Files ignored by
+        .gitignore are not reported.
+
+        Returns:
+            List of changed files, or None if git cannot answer (no recorded
+            commit, not a repository, or the scanner settings changed)
+        """
+        last_commit = self._state.get("last_commit")
+        if not last_commit or self._state.get("scan_signature") != self._scan_signature():
+            return None
 
         try:
-            # Check if we're in a git repository
-            subprocess.run(
-                ["git", "rev-parse", "--git-dir"],
-                cwd=self.config.project_root,
-                check=True,
-                capture_output=True
-            )
-
-            # Get the last documentation timestamp
-            last_run = self._state.get("last_run")
-
-            if last_run:
-                # Get files changed since last run
-                since_date = datetime.fromisoformat(last_run).strftime("%Y-%m-%d %H:%M:%S")
-                result = subprocess.run(
-                    ["git", "log", f"--since='{since_date}'", "--name-only", "--format="],
-                    cwd=self.config.project_root,
-                    capture_output=True,
-                    text=True
-                )
-
-                if result.returncode == 0:
-                    for line in result.stdout.strip().split('\n'):
-                        if line and line.endswith('.py'):
-                            file_path = self.config.project_root / line
-                            if file_path.exists():
-                                changed_files.append(file_path)
-
-            # Also check for uncommitted changes
-            result = subprocess.run(
-                ["git", "diff", "--name-only", "HEAD"],
-                cwd=self.config.project_root,
-                capture_output=True,
-                text=True
-            )
-
-            if result.returncode == 0:
-                for line in result.stdout.strip().split('\n'):
-                    if line and line.endswith('.py'):
-                        file_path = self.config.project_root / line
-                        if file_path.exists():
-                            changed_files.append(file_path)
-
-        except subprocess.CalledProcessError:
-            # Not a git repository or git not available
-            logger.debug("Git not available or not a git repository")
+            diff = self._run_git("diff", "--name-only", "--relative", "-z", last_commit)
+            untracked = self._run_git("ls-files", "-z", "--others", "--exclude-standard")
+        except (OSError, subprocess.CalledProcessError):
+            # Not a git repository, git not available, or the commit is gone
+            logger.debug("Git change detection unavailable, checking all files")
+            return None
+
+        relative_paths = [p for p in (diff + "\0" + untracked).split("\0") if p]
+        previous_files = self._state.get("files", {})
+        changed_files = []
+        candidates = []
 
-        return changed_files
+        for file_path in self.file_scanner.filter_paths(relative_paths):
+            relative_str = str(file_path.relative_to(self.config.project_root))
+            if relative_str not in previous_files:
+                changed_files.append(file_path)
+                logger.info(f"New file: {relative_str}")
+            else:
+                candidates.append((file_path, relative_str, previous_files[relative_str]))
+
+        # Reported files may already be documented in their current form
+        for file_path in self._find_modified_files(candidates):
+            changed_files.append(file_path)
+            logger.info(f"Modified file: {file_path}")
 
-    def update_state(self, documented_files: List[Path]) -> None:
-        """Update the state with newly documented files."""
+        for relative_path in relative_paths:
+            if not (self.config.project_root / relative_path).exists() and relative_path in previous_files:
+                logger.info(f"Deleted file: {relative_path}")
+
+        return sorted(changed_files)
+
+    def _get_head_commit(self) -> Optional[str]:
+        """Get the SHA of the current HEAD commit, if in a git repository."""
+        try:
+            return self._run_git("rev-parse", "--verify", "HEAD").strip() or None
+        except (OSError, subprocess.CalledProcessError):
+            return None
+
+    def _run_git(self, *args: str) -> str:
+        """Run a git command in the project root and return its output."""
+        result = subprocess.run(
+            ["git", *args],
+            cwd=self.config.project_root,
+            capture_output=True,
+            check=True
+        )
+        return os.fsdecode(result.stdout)
+
+    def _scan_signature(self) -> str:
+        """Hash the settings that decide which files are documented."""
+        settings = [
+            self.config.include_patterns,
+            self.config.exclude_dirs,
+            self.config.exclude_files,
+            self.config.max_file_size,
+            self.config.include_tests,
+        ]
+        return hashlib.sha256(json.dumps(settings).encode("utf-8")).hexdigest()
+
+    def update_state(self, documented_files: List[Path], record_commit: bool = True,
+                     import_graph: Optional[Dict[str, Any]] = None) -> None:
+        """
+        Update the state with newly documented files.
+
+        Args:
+            documented_files: Files documented in this run
+            record_commit: Whether to record the current commit as the base for
+                the next git change detection. Pass False when some files
+                failed, so they are reported by git again next time.
+            import_graph: Import graph to store for the next run
+        """
         # Update file information
+        stats = {}
         for file_path in documented_files:
             try:
-                stat = file_path.stat()
                 relative_path = file_path.relative_to(self.config.project_root)
-                self._state["files"][str(relative_path)] = {
-                    "mtime": stat.st_mtime,
-                    "size": stat.st_size,
-                    "hash": self._calculate_file_hash(file_path),
-                    "last_documented": datetime.now().isoformat()
-                }
+                stats[file_path] = (str(relative_path), file_path.stat())
             except Exception as e:
                 logger.error(f"Error updating state for {file_path}: {e}")
 
+        # Switch to the configured hash algorithm once every file is re-hashed
+        if (self._state["hash_algorithm"] != self.config.hash_algorithm
+                and {key for key, _ in stats.values()}.issuperset(self._state["files"])):
+            self._state["hash_algorithm"] = self.config.hash_algorithm
+            self._detected_hashes.clear()
+
+        # Reuse the hashes calculated during change detection
+        hashes = {}
+        for file_path, (_, stat) in stats.items():
+            detected = self._detected_hashes.get(file_path)
+            if detected and detected[:2] == (stat.st_mtime_ns, stat.st_size):
+                hashes[file_path] = detected[2]
+        hashes.update(self._hash_files([f for f in stats if f not in hashes]))
+
+        self._state["files"].update({
+            relative_key: {
+                **self._stat_info(stat),
+                "hash": hashes[file_path],
+                "last_documented": datetime.now().isoformat()
+            }
+            for file_path, (relative_key, stat) in stats.items()
+        })
+
+        if import_graph is not None:
+            self._state["import_graph"] = import_graph
+
         # Update last run timestamp
         self._state["last_run"] = datetime.now().isoformat()
 
+        if self._uses_git_detection() and record_commit:
+            self._state["last_commit"] = self._get_head_commit()
+            self._state["scan_signature"] = self._scan_signature()
+
         # Save state
         self._save_state()
 
-    def _load_state(self) -> Dict[str, Any]:
-        """Load state from file."""
-        if self.state_file.exists():
-            try:
-                with open(self.state_file, 'r') as f:
-                    data = json.load(f)
-                    return cast(Dict[str, Any], data)
-            except Exception as e:
-                logger.error(f"Error loading state: {e}")
-
-        return {"files": {}, "last_run": None}
+    def _load_state(self) -> StateStore:
+        """Open the configured state store."""
+        return open_state_store(self.config.project_root / self.config.state_file,
+                                self.config.state_backend)
 
     def _save_state(self) -> None:
         """Save state to file."""
         try:
-            with open(self.state_file, 'w') as f:
-                json.dump(self._state, f, indent=2)
+            self._state.commit()
+            self._state_dirty = False
         except Exception as e:
             logger.error(f"Error saving state: {e}")
 
     def clear_state(self) -> None:
         """Clear the state (useful for forcing full regeneration)."""
-        self._state = {"files": {}, "last_run": None}
+        self._state.reset()
+        self._state["hash_algorithm"] = self.config.hash_algorithm
         self._save_state()
 
     def get_documentation_stats(self) -> Dict:
@@ -0,0 +1,146 @@
+"""
+Checkpointing of completed documentation so interrupted runs can be resumed.
+"""
+
+import json
+import logging
+from pathlib import Path
+from typing import Any, Dict, Optional, Tuple
+
+from .fileutils import atomic_write
+from .records import Record
+
+logger = logging.getLogger(__name__)
+
+
+def _json_default(value: Any) -> Any:
+    """Serialize values that json does not handle natively."""
+    if isinstance(value, (set, frozenset)):
+        return sorted(value)
+    if isinstance(value, Record):
+        return value.to_dict()
+    return str(value)
+
+
+class Checkpoint:
+    """
+    Records documentation completed during a run.
+
+    For every completed file the checkpoint keeps its documentation entry and
+    the file's modification time and size when it was documented. The
+    checkpoint file is rewritten atomically every ``interval`` completed
+    files and removed when the run finishes, so it only exists after an
+    interrupted run.
+    """
+
+    def __init__(self, path: Path, project_root: Path, interval: int = 10):
+        self.path = path
+        self.project_root = project_root
+        self.interval = interval
+        self.full_run = False
+        self._entries: Dict[str, Dict[str, Any]] = {}
+        self._unsaved = 0
+
+    @property
+    def enabled(self) -> bool:
+        """Whether completed files are checkpointed."""
+        return self.interval > 0
+
+    def exists(self) -> bool:
+        """Check if a checkpoint from an interrupted run exists."""
+        return self.path.exists()
+
+    def load(self) -> int:
+        """
+        Load the checkpoint of an interrupted run.
+
+        Returns:
+            Number of files completed before the interruption
+        """
+        self._entries = {}
+        try:
+            with open(self.path, 'r') as f:
+                data = json.load(f)
+            self.full_run = bool(data.get("full_run", False))
+            self._entries = dict(data.get("files", {}))
+        except FileNotFoundError:
+            pass
+        except Exception as e:
+            logger.error(f"Error loading checkpoint: {e}")
+
+        return len(self._entries)
+
+    def snapshot(self, file_path: Path) -> Optional[Tuple[int, int]]:
+        """Get the (mtime_ns, size) of a file, or None if it cannot be read."""
+        try:
+            stat = file_path.stat()
+        except OSError:
+            return None
+        return stat.st_mtime_ns, stat.st_size
+
+    def get(self, file_path: Path) -> Optional[Dict[str, Any]]:
+        """
+        Get the checkpointed documentation of a file.
+
+        Args:
+            file_path: File to look up
+
+        Returns:
+            The documentation entry, or None if the file was not completed or
+            has changed since
+        """
+        entry = self._entries.get(self._key(file_path))
+        if not entry or entry.get("snapshot") != list(self.snapshot(file_path) or ()):
+            return None
+        return dict(entry["documentation"])
+
+    def add(self, file_path: Path, snapshot: Optional[Tuple[int, int]],
+            documentation: Dict[str, Any]) -> None:
+        """
+        Record a completed file, saving the checkpoint every ``interval`` files.
+
+        Args:
+            file_path: Documented file
+            snapshot: The file's snapshot() taken before it was read
+            documentation: The file's documentation entry
+        """
+        if not self.enabled or snapshot is None:
+            return
+
+        self._entries[self._key(file_path)] = {
+            "snapshot": list(snapshot),
+            "documentation": documentation,
+        }
+        self._unsaved += 1
+        if self._unsaved >= self.interval:
+            self.save()
+
+    def save(self) -> None:
+        """Write the checkpoint if files were completed since the last save."""
+        if not self._unsaved:
+            return
+
+        data = {"full_run": self.full_run, "files": self._entries}
+        try:
+            atomic_write(self.path, json.dumps(data, default=_json_default))
+            self._unsaved = 0
+            logger.debug(f"Checkpointed {len(self._entries)} completed files")
+        except Exception as e:
+            logger.error(f"Error saving checkpoint: {e}")
+
+    def clear(self) -> None:
+        """Forget all completed files and remove the checkpoint file."""
+        self._entries = {}
+        self._unsaved = 0
+        try:
+            self.path.unlink()
+        except FileNotFoundError:
+            pass
+        except OSError as e:
+            logger.error(f"Error removing checkpoint: {e}")
+
+    def _key(self, file_path: Path) -> str:
+        """Get the checkpoint key (path relative to the project root) for a file."""
+        if file_path.is_absolute():
+            file_path = file_path.relative_to(self.project_root)
+        return str(file_path)
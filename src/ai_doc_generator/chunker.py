@@ -0,0 +1,171 @@
+"""
+Splitting of large files into chunks along class and function boundaries.
+"""
+
+from dataclasses import dataclass, field
+from typing import Any, Callable, List, Mapping, Optional, Tuple
+
+
+@dataclass
+class Chunk:
+    """A contiguous range of lines of a file, documented on its own."""
+
+    start_line: int
+    end_line: int
+    source: str
+    # Top-level symbols, or "Class.method" for parts of a split class
+    symbols: List[str] = field(default_factory=list)
+    # Header line of the class whose methods the chunk starts with
+    context: Optional[str] = None
+
+
+@dataclass
+class _Segment:
+    """A range of lines that is never split further."""
+
+    start_line: int
+    end_line: int
+    size: int
+    symbols: List[str]
+    context_class: Optional[str] = None
+    context: Optional[str] = None
+
+
+def split_into_chunks(content: str, analysis: Mapping[str, Any], budget: int,
+                      measure: Callable[[str], int] = len) -> List[Chunk]:
+    """
+    Split a file into chunks that each fit a size budget.
+
+    Top-level classes and functions are kept whole when they fit, and lines
+    between them stay with the symbol that follows. A class that does not fit
+    is split between its methods; a function or method that does not fit is
+    split into blocks of lines. Consecutive pieces are then packed into
+    chunks of at most ``budget``.
+
+    Args:
+        content: File content
+        analysis: CodeAnalyzer output for the content
+        budget: Maximum size of a chunk, as returned by measure
+        measure: Function giving the size of a piece of source
+
+    Returns:
+        Chunks in file order, covering every line
+    """
+    lines = content.splitlines()
+    segments: List[_Segment] = []
+
+    def text(start: int, end: int) -> str:
+        return "\n".join(lines[start - 1:end])
+
+    def add(start: int, end: int, symbols: List[str], context_class: Optional[str] = None,
+            context: Optional[str] = None) -> None:
+        if start > end:
+            return
+        size = measure(text(start, end))
+        if size <= budget or start == end:
+            segments.append(_Segment(start, end, size, symbols, context_class, context))
+            return
+        # Too large even on its own: split into blocks of lines
+        for block_start, block_end, block_size in _split_lines(lines, start, end, budget, measure):
+            segments.append(_Segment(block_start, block_end, block_size, symbols,
+                                     context_class, context))
+
+    position = 1
+    for name, kind, info, start, end in _top_level_symbols(analysis):
+        if start < position or end > len(lines):
+            continue
+
+        if kind == "class" and measure(text(position, end)) > budget:
+            header = lines[info["line"] - 1].strip()
+            piece_start = position
+            for method in sorted(info.get("methods", []), key=_start_line):
+                method_start = _start_line(method)
+                method_end = method.get("end_line")
+                if not method_end or method_start < piece_start:
+                    continue
+                if piece_start == position:
+                    # Class header up to the first method
+                    add(piece_start, method_start - 1, [name])
+                    piece_start = method_start
+                add(piece_start, method_end, [f"{name}.{method['name']}"], name, header)
+                piece_start = method_end + 1
+            if piece_start == position:
+                add(position, end, [name])
+            else:
+                add(piece_start, end, [], name, header)
+        else:
+            add(position, end, [name])
+        position = end + 1
+
+    # Module-level code after the last symbol
+    add(position, len(lines), [])
+
+    return _pack(segments, lines, budget)
+
+
+def _top_level_symbols(analysis: Mapping[str, Any]) -> List[Tuple[str, str, Any, int, int]]:
+    """List (name, kind, info, start line, end line) of top-level symbols in file order."""
+    symbols = []
+    for kind, key in (("function", "functions"), ("class", "classes")):
+        for info in analysis.get(key, []):
+            if info.get("end_line"):
+                symbols.append((info["name"], kind, info, _start_line(info), info["end_line"]))
+    return sorted(symbols, key=lambda symbol: symbol[3])
+
+
+def _start_line(info: Mapping[str, Any]) -> int:
+    """Get the first line of a definition, including its decorators."""
+    return int(info.get("start_line") or info["line"])
+
+
+def _split_lines(lines: List[str], start: int, end: int, budget: int,
+                 measure: Callable[[str], int]) -> List[Tuple[int, int, int]]:
+    """Split a range of lines into (start, end, size) blocks of at most budget."""
+    blocks = []
+    block_start = start
+    block_size = 0
+    for line_no in range(start, end + 1):
+        line_size = measure(lines[line_no - 1]) + 1
+        if block_size and block_size + line_size > budget:
+            blocks.append((block_start, line_no - 1, block_size))
+            block_start = line_no
+            block_size = 0
+        block_size += line_size
+    blocks.append((block_start, end, block_size))
+    return blocks
+
+
+def _pack(segments: List[_Segment], lines: List[str], budget: int) -> List[Chunk]:
+    """Pack consecutive segments into chunks of at most budget."""
+    chunks: List[Chunk] = []
+    current: Optional[_Segment] = None
+
+    for segment in segments:
+        if current is not None and current.size + segment.size + 1 <= budget and (
+                segment.context_class is None
+                or segment.context_class == current.context_class
+                or segment.context_class in current.symbols):
+            current.end_line = segment.end_line
+            current.size += segment.size + 1
+            current.symbols.extend(segment.symbols)
+            continue
+
+        if current is not None:
+            chunks.append(_to_chunk(current, lines))
+        current = _Segment(segment.start_line, segment.end_line, segment.size,
+                           list(segment.symbols), segment.context_class, segment.context)
+
+    if current is not None:
+        chunks.append(_to_chunk(current, lines))
+    return chunks
+
+
+def _to_chunk(segment: _Segment, lines: List[str]) -> Chunk:
+    """Create the chunk for a packed segment."""
+    return Chunk(
+        start_line=segment.start_line,
+        end_line=segment.end_line,
+        source="\n".join(lines[segment.start_line - 1:segment.end_line]),
+        symbols=segment.symbols,
+        context=segment.context,
+    )
@@ -39,11 +39,32 @@ Examples:
   # Force full regeneration
   ai-doc-gen --full
 
+  # Continue an interrupted run
+  ai-doc-gen --resume
+
   # Specify output directory
   ai-doc-gen --output docs/api
 
   # Use specific OpenAI model
   ai-doc-gen --model gpt-4o-mini
+
+  # Document 8 files concurrently
+  ai-doc-gen --jobs 8
+
+  # Parse files on 16 processes before documenting them
+  ai-doc-gen --full --analysis-workers 16
+
+  # Render module pages on 8 threads
+  ai-doc-gen --render-workers 8
+
+  # Regenerate everything through the batch API (cheaper, within 24 hours)
+  ai-doc-gen --full --batch
+
+  # Bypass the response and analysis caches
+  ai-doc-gen --full --no-cache
+
+  # Shrink the response and analysis caches to their configured size limit
+  ai-doc-gen --prune-cache
         """
     )
 
@@ -99,12 +120,72 @@ Examples:
         help="Additional directories to exclude"
     )
 
+    parser.add_argument(
+        "--discovery",
+        choices=["walk", "git"],
+        help="Find files by walking the file system or from the git index (default: walk)"
+    )
+
+    parser.add_argument(
+        "--state-backend",
+        choices=["json", "sqlite"],
+        help="Store the change tracking state in a JSON file or a SQLite database (default: json)"
+    )
+
+    parser.add_argument(
+        "--jobs", "-j",
+        type=int,
+        help="Number of files to document concurrently (default: 1)"
+    )
+
+    parser.add_argument(
+        "--analysis-workers",
+        type=int,
+        help="Number of processes analyzing files before they are documented (default: 1)"
+    )
+
+    parser.add_argument(
+        "--split-api-reference",
+        choices=["letter", "package"],
+        help="Split the API reference into a page per initial letter or per package"
+    )
+
+    parser.add_argument(
+        "--render-workers",
+        type=int,
+        help="Number of module pages rendered in parallel (default: 1)"
+    )
+
+    parser.add_argument(
+        "--batch",
+        action="store_true",
+        help="Submit all prompts as one batch and wait for it to complete (cheaper, slower)"
+    )
+
+    parser.add_argument(
+        "--no-cache",
+        action="store_true",
+        help="Do not read or write the LLM response and code analysis caches"
+    )
+
+    parser.add_argument(
+        "--prune-cache",
+        action="store_true",
+        help="Evict least-recently-used cached responses and analyses down to the size limit and exit"
+    )
+
     parser.add_argument(
         "--verbose", "-v",
         action="store_true",
         help="Enable verbose logging"
     )
 
+    parser.add_argument(
+        "--resume",
+        action="store_true",
+        help="Resume an interrupted run, skipping files it already documented"
+    )
+
     parser.add_argument(
         "--dry-run",
         action="store_true",
@@ -149,6 +230,44 @@ Examples:
         if args.exclude:
             config.exclude_dirs.extend(args.exclude)
 
+        if args.discovery:
+            config.discovery = args.discovery
+
+        if args.state_backend:
+            config.state_backend = args.state_backend
+
+        if args.jobs:
+            config.max_concurrency = args.jobs
+
+        if args.analysis_workers:
+            config.analysis_workers = args.analysis_workers
+
+        if args.split_api_reference:
+            config.api_reference_split = args.split_api_reference
+
+        if args.render_workers:
+            config.render_workers = args.render_workers
+
+        if args.batch:
+            config.batch_mode = True
+
+        if args.no_cache:
+            config.use_cache = False
+            config.use_analysis_cache = False
+
+        # Cache maintenance does not need an API key
+        if args.prune_cache:
+            from .response_cache import ResponseCache
+            from .analysis_cache import AnalysisCache, ANALYSIS_CACHE_SUBDIR
+            cache_dir = config.project_root / config.cache_dir
+            removed, freed = ResponseCache(cache_dir, config.cache_max_size).prune()
+            print(f"Removed {removed} cached responses ({freed} bytes)")
+            removed, freed = AnalysisCache(
+                cache_dir / ANALYSIS_CACHE_SUBDIR, config.cache_max_size
+            ).prune()
+            print(f"Removed {removed} cached analyses ({freed} bytes)")
+            sys.exit(0)
+
         # Validate configuration
         errors = config.validate()
         if errors:
@@ -179,12 +298,12 @@ Examples:
         # Create and run generator
         logger.info(f"Starting documentation generation for {config.project_root}")
         generator = DocumentationGenerator(config)
-        generator.generate_documentation(force_full=args.full)
+        generator.generate_documentation(force_full=args.full, resume=args.resume)
         
         logger.info(f"Documentation generated successfully in {config.output_dir}")
 
     except KeyboardInterrupt:
-        logger.info("Documentation generation cancelled by user")
+        logger.info("Documentation generation cancelled by user; run again with --resume to continue")
         sys.exit(1)
     except Exception as e:
         logger.error(f"Error: {str(e)}")
@@ -3,16 +3,110 @@ Code analyzer for extracting structural information from Python files.
 """
 
 import ast
+from concurrent.futures import FIRST_COMPLETED, Future, ProcessPoolExecutor, wait
 from pathlib import Path
-from typing import Dict, List, Any, Optional
+from typing import Dict, Iterable, List, Any, Optional, Set, Tuple, Union
 import logging
 
+from .analysis_cache import AnalysisCache
+
 logger = logging.getLogger(__name__)
 
+# Bump whenever the analysis output changes so cached analyses are not reused
+ANALYZER_VERSION = "2"
+
+# Files sent to an analysis worker process at once
+ANALYSIS_CHUNK_SIZE = 16
+
+
+def _analyze_chunk(chunk: List[Tuple[str, str, str]]) -> List[Tuple[str, Dict[str, Any]]]:
+    """
+    Analyze a chunk of files in a worker process.
+
+    Args:
+        chunk: (cache key, file path, content) tuples
+
+    Returns:
+        (cache key, analysis) pairs
+    """
+    analyzer = CodeAnalyzer()
+    return [(key, analyzer.analyze_file(Path(path), content)) for key, path, content in chunk]
+
 
 class CodeAnalyzer:
     """Analyzes Python code to extract structural information."""
 
+    def __init__(self, cache: Optional[AnalysisCache] = None):
+        """
+        Initialize the analyzer.
+
+        Args:
+            cache: Optional cache of analyses of previously seen content
+        """
+        self.cache = cache
+        # Analyses computed ahead by prepare(), keyed by cache key
+        self._prepared: Dict[str, Dict[str, Any]] = {}
+
+    def prepare(self, files: Iterable[Tuple[Path, str]], workers: int) -> int:
+        """
+        Analyze files ahead of time in worker processes.
+
+        Parsing is CPU bound, so it is spread over a process pool. Content
+        found in the cache is not sent to the pool. A later analyze_file()
+        call for the same content returns the prepared analysis. Files are
+        consumed lazily and at most two chunks per worker are in flight.
+
+        Args:
+            files: (file path, content) pairs
+            workers: Number of worker processes
+
+        Returns:
+            Number of files analyzed by the workers
+        """
+        cache = self.cache if self.cache is not None and self.cache.enabled else None
+        analyzed = 0
+        chunk: List[Tuple[str, str, str]] = []
+        futures: Set["Future[List[Tuple[str, Dict[str, Any]]]]"] = set()
+
+        def collect(done: Iterable["Future[List[Tuple[str, Dict[str, Any]]]]"]) -> int:
+            count = 0
+            for future in done:
+                for key, analysis in future.result():
+                    if cache is not None and "error" not in analysis:
+                        cache.put(key, analysis)
+                    self._prepared[key] = analysis
+                    count += 1
+            return count
+
+        try:
+            with ProcessPoolExecutor(max_workers=workers) as executor:
+                for file_path, content in files:
+                    key = AnalysisCache.make_key(content, ANALYZER_VERSION)
+                    if key in self._prepared:
+                        continue
+                    if cache is not None:
+                        cached = cache.get(key)
+                        if cached is not None:
+                            self._prepared[key] = cached
+                            continue
+
+                    chunk.append((key, str(file_path), content))
+                    if len(chunk) >= ANALYSIS_CHUNK_SIZE:
+                        futures.add(executor.submit(_analyze_chunk, chunk))
+                        chunk = []
+                        if len(futures) >= workers * 2:
+                            done, futures = wait(futures, return_when=FIRST_COMPLETED)
+                            analyzed += collect(done)
+
+                if chunk:
+                    futures.add(executor.submit(_analyze_chunk, chunk))
+                analyzed += collect(futures)
+        except Exception as e:
+            # Files that were not prepared are analyzed on demand
+            logger.warning(f"Parallel analysis failed, analyzing files sequentially: {e}")
+
+        return analyzed
+
     def analyze_file(self, file_path: Path, content: str) -> Dict[str, Any]:
         """
         Analyze a Python file and extract its structure.
@@ -24,6 +118,17 @@ class CodeAnalyzer:
         Returns:
             Dictionary containing analysis results
         """
+        cache_key = None
+        cache = self.cache if self.cache is not None and self.cache.enabled else None
+        if cache is not None or self._prepared:
+            cache_key = AnalysisCache.make_key(content, ANALYZER_VERSION)
+            cached = self._prepared.pop(cache_key, None)
+            if cached is None and cache is not None:
+                cached = cache.get(cache_key)
+            if cached is not None:
+                cached["file_path"] = str(file_path)
+                return cached
+
         analysis: Dict[str, Any] = {
             "file_path": str(file_path),
             "module_docstring": None,
@@ -34,8 +139,8 @@ class CodeAnalyzer:
             "loc": len(content.splitlines()),
             "complexity": 0,
             "has_main": False,
-            "decorators_used": set(),
-            "dependencies": set()
+            "decorators_used": [],
+            "dependencies": []
         }
 
         try:
@@ -50,8 +155,8 @@ class CodeAnalyzer:
                 "functions": analyzer.functions,
                 "constants": analyzer.constants,
                 "has_main": analyzer.has_main,
-                "decorators_used": list(analyzer.decorators_used),
-                "dependencies": list(analyzer.dependencies)
+                "decorators_used": sorted(analyzer.decorators_used),
+                "dependencies": sorted(analyzer.dependencies)
             })
 
             # Calculate complexity
@@ -64,6 +169,10 @@ class CodeAnalyzer:
             logger.error(f"Error analyzing {file_path}: {e}")
             analysis["error"] = str(e)
 
+        # Unexpected errors may be transient, so only cache real results
+        if cache is not None and cache_key is not None and "error" not in analysis:
+            cache.put(cache_key, analysis)
+
         return analysis
 
     def _calculate_complexity(self, analyzer: 'ASTAnalyzer') -> int:
@@ -85,7 +194,14 @@ class CodeAnalyzer:
 
 
 class ASTAnalyzer(ast.NodeVisitor):
-    """AST visitor for extracting information from Python code."""
+    """
+    AST visitor for extracting information from Python code.
+
+    The tree is visited once. Function bodies are visited with a scope for
+    the function pushed on a stack, so yields and raises are attributed to
+    the innermost enclosing function only. Definitions, imports and
+    assignments inside function bodies are not recorded.
+    """
 
     def __init__(self) -> None:
         self.module_docstring: Optional[str] = None
@@ -97,6 +213,8 @@ class ASTAnalyzer(ast.NodeVisitor):
         self.decorators_used: set[str] = set()
         self.dependencies: set[str] = set()
         self._current_class: Optional[Dict[str, Any]] = None
+        # Yield/raise facts of the enclosing functions, innermost last
+        self._scopes: List[Dict[str, Any]] = []
 
     def visit_Module(self, node: ast.Module) -> None:
         """Visit module node to extract module docstring."""
@@ -107,6 +225,9 @@ class ASTAnalyzer(ast.NodeVisitor):
 
     def visit_Import(self, node: ast.Import) -> None:
         """Visit import statements."""
+        if self._scopes:
+            return
+
         for alias in node.names:
             import_info = {
                 "type": "import",
@@ -125,6 +246,9 @@ class ASTAnalyzer(ast.NodeVisitor):
 
     def visit_ImportFrom(self, node: ast.ImportFrom) -> None:
         """Visit from-import statements."""
+        if self._scopes:
+            return
+
         module = node.module or ""
         for alias in node.names:
             import_info = {
@@ -147,9 +271,17 @@ class ASTAnalyzer(ast.NodeVisitor):
 
     def visit_ClassDef(self, node: ast.ClassDef) -> None:
         """Visit class definitions."""
+        if self._scopes:
+            # Classes local to a function are not recorded, but their bodies
+            # may still raise on behalf of the function
+            self.generic_visit(node)
+            return
+
         class_info = {
             "name": node.name,
             "line": node.lineno,
+            "start_line": self._get_start_line(node),
+            "end_line": getattr(node, "end_lineno", None),
             "docstring": ast.get_docstring(node),
             "bases": [self._get_name(base) for base in node.bases],
             "decorators": [self._get_decorator_name(dec) for dec in node.decorator_list],
@@ -183,18 +315,57 @@ class ASTAnalyzer(ast.NodeVisitor):
         """Visit async function definitions."""
         self._process_function(node, is_async=True)
 
+    def visit_Lambda(self, node: ast.Lambda) -> None:
+        """Visit lambdas in their own scope."""
+        self._scopes.append(self._new_scope())
+        self.generic_visit(node)
+        self._scopes.pop()
+
+    def visit_Raise(self, node: ast.Raise) -> None:
+        """Record the exception raised in the enclosing function."""
+        if self._scopes and node.exc:
+            exc_name = self._get_exception_name(node.exc)
+            raises = self._scopes[-1]["raises"]
+            if exc_name and exc_name not in raises:
+                raises.append(exc_name)
+        self.generic_visit(node)
+
+    def visit_Yield(self, node: ast.Yield) -> None:
+        """Mark the enclosing function as a generator."""
+        if self._scopes:
+            self._scopes[-1]["is_generator"] = True
+        self.generic_visit(node)
+
+    def visit_YieldFrom(self, node: ast.YieldFrom) -> None:
+        """Mark the enclosing function as a generator."""
+        if self._scopes:
+            self._scopes[-1]["is_generator"] = True
+        self.generic_visit(node)
+
     def _process_function(self, node: Any, is_async: bool = False) -> None:
         """Process function or async function definition."""
+        scope = self._new_scope()
+        self._scopes.append(scope)
+        for stmt in node.body:
+            self.visit(stmt)
+        self._scopes.pop()
+
+        if self._scopes:
+            # Nested functions are not part of the module interface
+            return
+
         func_info = {
             "name": node.name,
             "line": node.lineno,
+            "start_line": self._get_start_line(node),
+            "end_line": getattr(node, "end_lineno", None),
             "docstring": ast.get_docstring(node),
             "decorators": [self._get_decorator_name(dec) for dec in node.decorator_list],
             "args": self._extract_arguments(node.args),
             "returns": self._get_return_annotation(node),
             "is_async": is_async,
-            "is_generator": self._is_generator(node),
-            "raises": self._extract_exceptions(node)
+            "is_generator": scope["is_generator"],
+            "raises": scope["raises"]
         }
 
         # Track decorators
@@ -217,14 +388,14 @@ class ASTAnalyzer(ast.NodeVisitor):
     def visit_If(self, node: ast.If) -> None:
         """Visit if statements to check for main guard."""
         # Check for if __name__ == "__main__":
-        if self._is_main_guard(node):
+        if not self._scopes and self._is_main_guard(node):
             self.has_main = True
 
         self.generic_visit(node)
 
     def visit_AnnAssign(self, node: ast.AnnAssign) -> None:
         """Visit annotated assignments (type hints)."""
-        if isinstance(node.target, ast.Name) and self._current_class:
+        if isinstance(node.target, ast.Name) and self._current_class and not self._scopes:
             attr_info = {
                 "name": node.target.id,
                 "type": self._get_annotation(node.annotation),
@@ -237,7 +408,7 @@ class ASTAnalyzer(ast.NodeVisitor):
     def visit_Assign(self, node: ast.Assign) -> None:
         """Visit assignments to find constants."""
         # Look for module-level constants (UPPER_CASE names)
-        if not self._current_class and node.targets:
+        if not self._current_class and not self._scopes and node.targets:
             for target in node.targets:
                 if isinstance(target, ast.Name):
                     name = target.id
@@ -294,6 +465,10 @@ class ASTAnalyzer(ast.NodeVisitor):
             # For complex expressions, return a simplified representation
             return f"<{type(node).__name__}>"
 
+    def _get_start_line(self, node: Union[ast.FunctionDef, ast.AsyncFunctionDef, ast.ClassDef]) -> int:
+        """Get the first line of a definition, including its decorators."""
+        return min([node.lineno] + [dec.lineno for dec in node.decorator_list])
+
     def _get_decorator_name(self, node: ast.AST) -> str:
         """Get decorator name as a string."""
         if isinstance(node, ast.Name):
@@ -366,25 +541,19 @@ class ASTAnalyzer(ast.NodeVisitor):
             return self._get_annotation(node.returns)
         return None
 
-    def _is_generator(self, node: ast.FunctionDef) -> bool:
-        """Check if a function is a generator."""
-        for child in ast.walk(node):
-            if isinstance(child, (ast.Yield, ast.YieldFrom)):
-                return True
-        return False
-
-    def _extract_exceptions(self, node: ast.FunctionDef) -> list:
-        """Extract exceptions that might be raised."""
-        exceptions = []
-        for child in ast.walk(node):
-            if isinstance(child, ast.Raise) and child.exc:
-                if isinstance(child.exc, ast.Call) and hasattr(child.exc, 'func'):
-                    exc_name = self._get_name(child.exc.func)
-                    if exc_name and exc_name != f"<{type(child.exc.func).__name__}>":
-                        exceptions.append(exc_name)
-                elif isinstance(child.exc, ast.Name):
-                    exceptions.append(child.exc.id)
-        return list(set(exceptions))
+    def _new_scope(self) -> Dict[str, Any]:
+        """Create the yield/raise facts of a function scope."""
+        return {"is_generator": False, "raises": []}
+
+    def _get_exception_name(self, exc: ast.AST) -> Optional[str]:
+        """Get the name of a raised exception, or None if it is an expression."""
+        if isinstance(exc, ast.Call):
+            exc_name = self._get_name(exc.func)
+            if exc_name and exc_name != f"<{type(exc.func).__name__}>":
+                return exc_name
+        elif isinstance(exc, ast.Name):
+            return exc.id
+        return None
 
     def _is_exception_class(self, node: ast.ClassDef) -> bool:
         """Check if a class is an exception class."""
@@ -8,6 +8,8 @@ from pathlib import Path
 from typing import List, Optional
 from dataclasses import dataclass, field, asdict
 
+from .hashing import available_algorithms
+
 
 @dataclass
 class Config:
@@ -16,18 +18,25 @@ class Config:
     # OpenAI settings
     openai_api_key: Optional[str] = field(default_factory=lambda: os.getenv("OPENAI_API_KEY"))
     model: str = "gpt-4-turbo-preview"
+    temperature: float = 0.3
+    max_tokens: int = 2000  # Completion budget, lowered to fit the model's context window
+    max_content_tokens: int = 2500  # Source code tokens per prompt; larger files are chunked or truncated
 
     # Project settings
     project_root: Path = field(default_factory=lambda: Path.cwd())
     output_dir: Path = field(default_factory=lambda: Path("docs/generated"))
+    doc_store: str = "json"  # "json" documentation.json or "sharded" per-file records loaded on demand
     state_file: Path = field(default_factory=lambda: Path(".doc_state.json"))
+    state_backend: str = "json"  # "json" file or "sqlite" database (state file with a .db suffix)
+    checkpoint_file: Path = field(default_factory=lambda: Path(".doc_checkpoint.json"))
 
     # File scanning settings
+    discovery: str = "walk"  # "walk" the file system or list files from the "git" index
     include_patterns: List[str] = field(default_factory=lambda: ["*.py"])
     exclude_dirs: List[str] = field(default_factory=lambda: [
         "__pycache__", ".git", ".venv", "venv", "env", ".env",
         "node_modules", ".pytest_cache", ".mypy_cache", "build",
-        "dist", "*.egg-info", ".tox", "htmlcov", ".coverage"
+        "dist", "*.egg-info", ".tox", "htmlcov", ".coverage", ".doc_cache"
     ])
     exclude_files: List[str] = field(default_factory=lambda: [
         "setup.py", "conftest.py", "__init__.py"
@@ -35,8 +44,43 @@ class Config:
 
     # Documentation settings
     max_file_size: int = 100000  # Maximum file size in bytes to process
+    chunk_large_files: bool = True  # Document files too large for one prompt in chunks instead of truncating
     include_tests: bool = False
     include_examples: bool = True
+    api_reference_split: str = "none"  # Split the API reference into "letter" or "package" pages
+    symbol_level_updates: bool = False  # Re-document only changed classes/functions
+    git_change_detection: bool = True  # With git discovery, ask git for changes since the last documented commit
+    invalidate_dependents: bool = True  # Re-document direct importers of changed public APIs
+    dependency_api_context: bool = False  # Show the APIs of imported project files in every prompt
+    trust_file_stat: bool = True  # Treat files with unchanged stat information as unchanged
+    hash_algorithm: str = "blake2b"  # "sha256", "blake2b" or "xxh3" (requires xxhash)
+
+    # Performance settings
+    max_concurrency: int = 1  # Number of files documented in parallel
+    hash_workers: int = 4  # Number of files hashed in parallel
+    analysis_workers: int = 1  # Processes parsing files ahead of the LLM stage (1 parses on demand)
+    render_workers: int = 1  # Module pages rendered in parallel
+    render_processes: bool = False  # Format module pages in processes instead of threads
+    checkpoint_interval: int = 10  # Completed files between checkpoints (0 disables checkpointing)
+
+    # Batch settings
+    batch_mode: bool = False  # Send prompts through the batch API (cheaper, completes within 24 hours)
+    batch_backend: str = "openai"  # "openai" batch API or "local" file-based stand-in
+    batch_poll_interval: float = 60.0  # Seconds between batch status checks
+
+    # Rate limiting settings (0 disables the corresponding budget)
+    requests_per_minute: int = 0
+    tokens_per_minute: int = 0
+    max_retries: int = 5
+    retry_base_delay: float = 1.0  # Initial backoff delay in seconds
+    retry_max_delay: float = 60.0  # Maximum backoff delay in seconds
+
+    # Response cache settings
+    use_cache: bool = True
+    cache_dir: Path = field(default_factory=lambda: Path(".doc_cache"))
+    cache_max_size: int = 100 * 1024 * 1024  # Maximum cache size in bytes
+    use_analysis_cache: bool = True  # Reuse code analyses of unchanged content
+    compact_analysis: bool = True  # Hold analyses in memory as slotted records
 
     # LLM prompt settings
     system_prompt: str = """You are an expert technical documentation writer specializing in Python projects. 
@@ -62,6 +106,10 @@ Format everything in clean, readable Markdown."""
             data['output_dir'] = Path(data['output_dir'])
         if 'state_file' in data:
             data['state_file'] = Path(data['state_file'])
+        if 'cache_dir' in data:
+            data['cache_dir'] = Path(data['cache_dir'])
+        if 'checkpoint_file' in data:
+            data['checkpoint_file'] = Path(data['checkpoint_file'])
 
         return cls(**data)
 
@@ -73,6 +121,8 @@ Format everything in clean, readable Markdown."""
         data['project_root'] = str(data['project_root'])
         data['output_dir'] = str(data['output_dir'])
         data['state_file'] = str(data['state_file'])
+        data['cache_dir'] = str(data['cache_dir'])
+        data['checkpoint_file'] = str(data['checkpoint_file'])
 
         # Don't save the API key
         data.pop('openai_api_key', None)
@@ -90,4 +140,45 @@ Format everything in clean, readable Markdown."""
         if not self.project_root.exists():
             errors.append(f"Project root does not exist: {self.project_root}")
 
+        if self.discovery not in ("walk", "git"):
+            errors.append(f"discovery must be 'walk' or 'git', not {self.discovery!r}")
+
+        if self.state_backend not in ("json", "sqlite"):
+            errors.append(f"state_backend must be 'json' or 'sqlite', not {self.state_backend!r}")
+
+        if self.api_reference_split not in ("none", "letter", "package"):
+            errors.append(f"api_reference_split must be 'none', 'letter' or 'package', "
+                          f"not {self.api_reference_split!r}")
+
+        if self.doc_store not in ("json", "sharded"):
+            errors.append(f"doc_store must be 'json' or 'sharded', not {self.doc_store!r}")
+
+        if self.max_content_tokens < 1:
+            errors.append("max_content_tokens must be at least 1")
+
+        if self.max_concurrency < 1:
+            errors.append("max_concurrency must be at least 1")
+
+        if self.checkpoint_interval < 0:
+            errors.append("checkpoint_interval must not be negative")
+
+        if self.batch_backend not in ("openai", "local"):
+            errors.append(f"batch_backend must be 'openai' or 'local', not {self.batch_backend!r}")
+
+        if self.batch_poll_interval < 0:
+            errors.append("batch_poll_interval must not be negative")
+
+        if self.hash_workers < 1:
+            errors.append("hash_workers must be at least 1")
+
+        if self.analysis_workers < 1:
+            errors.append("analysis_workers must be at least 1")
+
+        if self.render_workers < 1:
+            errors.append("render_workers must be at least 1")
+
+        if self.hash_algorithm not in available_algorithms():
+            errors.append(f"hash_algorithm must be one of {', '.join(available_algorithms())}, "
+                          f"not {self.hash_algorithm!r}")
+
         return errors
\ No newline at end of file
@@ -2,34 +2,98 @@
 Documentation builder for organizing and formatting the final documentation.
 """
 
+import os
 import json
-from typing import Dict, List, Any
+import time
+import filecmp
+import tempfile
+import threading
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
+from typing import Dict, Iterable, Iterator, List, Any, Mapping, MutableMapping, Optional, Set, Tuple
 
 from pathlib import Path
 from datetime import datetime
-from typing import Dict, List
 import logging
 
 from .config import Config
+from .fileutils import atomic_write
+from .records import compact_analysis, json_default
+from .doc_store import DOC_STORE_DIR, ShardedDocumentationStore, open_documentation_store
+from .symbol_index import SYMBOL_INDEX_FILE, Symbol, SymbolIndex
 
 logger = logging.getLogger(__name__)
 
+# Module pages sent to a rendering process at a time
+RENDER_CHUNK_SIZE = 16
+
+# Slowest module pages listed in the (debug) timing report
+SLOWEST_PAGES_REPORTED = 10
+
+# Directory of the API reference pages when the reference is split
+API_REFERENCE_DIR = "api-reference"
+
+# Write buffer size of streamed pages in bytes
+STREAM_BUFFER_SIZE = 1024 * 1024
+
 
 class DocumentationBuilder:
     """Builds and organizes the final documentation structure."""
 
     def __init__(self, config: Config):
         self.config = config
-        self.documentation: Dict[str, Any] = {}
+        self.documentation: MutableMapping[str, Any] = {}
         self.project_structure: Dict[str, Any] = {}
+        # Files changed since the pages on disk were rendered (None renders
+        # every page), and whether the README, API reference and overview,
+        # which cover every file's path and analysis, are stale
+        self._dirty_files: Optional[Set[str]] = None
+        self._aggregates_dirty = True
+        # Classes and functions of every file, for the project-wide pages;
+        # files whose analysis changed since they were indexed (None indexes
+        # every file), and whether the index file matches the index
+        self.symbol_index = SymbolIndex()
+        self._unindexed: Optional[Set[str]] = None
+        self._index_saved = False
+        self.pages_written = 0
+        self.pages_unchanged = 0
+        # Seconds spent rendering and writing each module page in the last build
+        self.render_timings: Dict[str, float] = {}
+        self._counter_lock = threading.Lock()
 
     def load_existing_documentation(self) -> None:
-        """Load existing documentation for incremental updates."""
+        """
+        Load existing documentation for incremental updates.
+
+        With the sharded store, only its manifest is read; entries are read
+        when first accessed.
+        """
+        if self.config.doc_store == "sharded":
+            try:
+                store = open_documentation_store(self.config.output_dir, self.config.compact_analysis)
+                self.documentation = store
+                if store.manifest_path.exists():
+                    self._dirty_files = set()
+                    self._aggregates_dirty = False
+                    self._load_symbol_index()
+                    logger.info(f"Opened existing documentation with {len(store)} files")
+            except Exception as e:
+                logger.error(f"Error loading existing documentation: {e}")
+                self.documentation = {}
+            return
+
         doc_file = self.config.output_dir / "documentation.json"
         if doc_file.exists():
             try:
                 with open(doc_file, 'r') as f:
                     self.documentation = json.load(f)
+                if self.config.compact_analysis:
+                    for doc in self.documentation.values():
+                        if isinstance(doc.get("analysis"), dict):
+                            doc["analysis"] = compact_analysis(doc["analysis"])
+                # The pages on disk were rendered from this documentation
+                self._dirty_files = set()
+                self._aggregates_dirty = False
+                self._load_symbol_index()
                 logger.info(f"Loaded existing documentation with {len(self.documentation)} files")
             except Exception as e:
                 logger.error(f"Error loading existing documentation: {e}")
@@ -37,37 +101,178 @@ class DocumentationBuilder:
 
     def add_file_documentation(self, file_path: Path, doc_content: Dict) -> None:
         """Add documentation for a single file."""
-        relative_path = file_path.relative_to(self.config.project_root)
-        self.documentation[str(relative_path)] = doc_content
+        if self.config.compact_analysis and isinstance(doc_content.get("analysis"), dict):
+            doc_content = {**doc_content, "analysis": compact_analysis(doc_content["analysis"])}
+        key = self._relative_key(file_path)
+        previous = self.documentation.get(key)
+        self.documentation[key] = doc_content
+
+        if previous is None:
+            analysis_changed = documentation_changed = True
+        else:
+            analysis_changed = previous.get("analysis") != doc_content.get("analysis")
+            documentation_changed = previous.get("documentation") != doc_content.get("documentation")
+        if analysis_changed:
+            self._aggregates_dirty = True
+            if self._unindexed is not None:
+                self._unindexed.add(key)
+        if self._dirty_files is not None and (analysis_changed or documentation_changed):
+            self._dirty_files.add(key)
+
+    def get_file_documentation(self, file_path: Path) -> Optional[Dict]:
+        """Get the current documentation entry for a file, if any."""
+        return self.documentation.get(self._relative_key(file_path))
+
+    def _relative_key(self, file_path: Path) -> str:
+        """Get the documentation key (path relative to the project root) for a file."""
+        if file_path.is_absolute():
+            file_path = file_path.relative_to(self.config.project_root)
+        return str(file_path)
 
     def build_documentation(self) -> None:
-        """Build the final documentation structure."""
+        """
+        Build the final documentation structure.
+
+        After load_existing_documentation(), only the pages affected by the
+        files added since are rendered: the index of each module containing
+        a file whose documentation or analysis changed, and the README, API
+        reference and project overview when a file was added or its analysis
+        changed. Pages missing from disk are always rendered, and a page is
+        only written if its content changed.
+        """
         # Ensure output directory exists
-        self.config.output_dir.mkdir(parents=True, exist_ok=True)
+        output_dir = self.config.output_dir
+        output_dir.mkdir(parents=True, exist_ok=True)
+        self.pages_written = 0
+        self.pages_unchanged = 0
 
-        # Save raw documentation data
-        self._save_documentation_json()
+        modules = self._group_files_by_module()
+        if self._dirty_files is None:
+            stale_modules = set(modules)
+        else:
+            stale_modules = {self._module_name(file_path) for file_path in self._dirty_files}
+            modules_dir = output_dir / "modules"
+            stale_modules.update(module for module in modules
+                                 if not (self._module_dir(modules_dir, module) / "index.md").exists())
 
-        # Build project structure
-        self._build_project_structure()
+        def stale(page: str) -> bool:
+            return self._dirty_files is None or self._aggregates_dirty or not (output_dir / page).exists()
 
         # Generate markdown files
-        self._generate_readme()
-        self._generate_module_docs()
-        self._generate_api_reference()
-        self._generate_project_overview()
-
-        logger.info(f"Documentation built in {self.config.output_dir}")
+        if stale("README.md"):
+            self._build_project_structure()
+            self._generate_readme()
+        self._generate_module_docs(module for module in modules if module in stale_modules)
+        if stale("api-reference.md"):
+            self._generate_api_reference()
+        if stale("project-overview.md"):
+            self._generate_project_overview()
+
+        # Save raw documentation data last, so an interrupted build is
+        # rendered again from the previous data. An outdated symbol index is
+        # removed first and saved after the data, so it never describes
+        # data other than the saved one.
+        self._get_symbol_index()
+        index_path = output_dir / SYMBOL_INDEX_FILE
+        if not self._index_saved:
+            index_path.unlink(missing_ok=True)
+        if self.config.doc_store == "sharded":
+            self._save_documentation_store()
+        elif (self._dirty_files is None or self._dirty_files or self._aggregates_dirty
+                or not (output_dir / "documentation.json").exists()):
+            self._save_documentation_json()
+        if not self._index_saved:
+            self._save_symbol_index(index_path)
+
+        self._dirty_files = set()
+        self._aggregates_dirty = False
+
+        logger.info(f"Documentation built in {output_dir}: {self.pages_written} pages written, "
+                    f"{self.pages_unchanged} unchanged")
+
+    def _write_page(self, path: Path, content: str, ignore_prefix: Optional[str] = None) -> None:
+        """
+        Write a page unless the file already has the same content.
+
+        Skipping identical writes keeps the modification times of unchanged
+        pages stable for tools that rebuild on changes.
+
+        Args:
+            path: Page to write
+            content: Page content
+            ignore_prefix: Lines starting with this prefix (e.g. a timestamp)
+                are ignored when comparing with the existing page
+        """
+        data = content.encode("utf-8")
+        try:
+            existing = path.read_bytes()
+        except OSError:
+            existing = None
+
+        if ignore_prefix is not None and existing is not None:
+            old_lines = _strip_lines(existing.decode("utf-8", "replace"), ignore_prefix)
+            unchanged = old_lines == _strip_lines(content, ignore_prefix)
+        else:
+            unchanged = existing == data
+        if unchanged:
+            with self._counter_lock:
+                self.pages_unchanged += 1
+            return
+
+        atomic_write(path, data)
+        with self._counter_lock:
+            self.pages_written += 1
 
     def _save_documentation_json(self) -> None:
         """Save the raw documentation data as JSON."""
         doc_file = self.config.output_dir / "documentation.json"
         try:
             with open(doc_file, 'w') as f:
-                json.dump(self.documentation, f, indent=2)
+                json.dump(self.documentation, f, indent=2, default=json_default)
         except Exception as e:
             logger.error(f"Error saving documentation JSON: {e}")
 
+    def _save_documentation_store(self) -> None:
+        """Save changed entries to the sharded documentation store."""
+        if not isinstance(self.documentation, ShardedDocumentationStore):
+            store = ShardedDocumentationStore(self.config.output_dir / DOC_STORE_DIR,
+                                              compact=self.config.compact_analysis)
+            store.update(self.documentation)
+            self.documentation = store
+        try:
+            written = self.documentation.save()
+            logger.debug(f"Wrote {written} documentation shards")
+        except Exception as e:
+            logger.error(f"Error saving documentation store: {e}")
+
+    def _load_symbol_index(self) -> None:
+        """Load the symbol index saved with the existing documentation, if any."""
+        index = SymbolIndex.load(self.config.output_dir / SYMBOL_INDEX_FILE)
+        if index is None:
+            self.symbol_index = SymbolIndex()
+            self._unindexed = None
+            self._index_saved = False
+        else:
+            self.symbol_index = index
+            self._unindexed = set()
+            self._index_saved = True
+
+    def _save_symbol_index(self, index_path: Path) -> None:
+        """Save the symbol index for the next incremental build."""
+        try:
+            self.symbol_index.save(index_path)
+            self._index_saved = True
+        except Exception as e:
+            logger.error(f"Error saving symbol index: {e}")
+
+    def _get_symbol_index(self) -> SymbolIndex:
+        """Get the symbol index, first indexing the files changed since it was updated."""
+        if self._unindexed is None or self._unindexed or len(self.symbol_index) != len(self.documentation):
+            if self.symbol_index.refresh(self.documentation, self._unindexed):
+                self._index_saved = False
+            self._unindexed = set()
+        return self.symbol_index
+
     def _build_project_structure(self) -> None:
         """Build a hierarchical project structure from documented files."""
         self.project_structure = {"name": "root", "children": {}, "type": "directory"}
@@ -118,45 +323,108 @@ class DocumentationBuilder:
         ]
 
         try:
-            with open(readme_path, 'w') as f:
-                f.write('\n'.join(content))
+            self._write_page(readme_path, '\n'.join(content), ignore_prefix="Generated on: ")
         except Exception as e:
             logger.error(f"Error writing README: {e}")
 
-    def _generate_module_docs(self) -> None:
-        """Generate documentation for each module."""
+    def _generate_module_docs(self, module_paths: Optional[Iterable[str]] = None) -> None:
+        """
+        Generate documentation for each module.
+
+        Args:
+            module_paths: Modules to generate, or None for every module
+        """
         modules_dir = self.config.output_dir / "modules"
         modules_dir.mkdir(exist_ok=True)
 
         # Group files by module
         modules = self._group_files_by_module()
-
-        for module_path, files in modules.items():
-            self._generate_module_doc(module_path, files, modules_dir)
+        if module_paths is not None:
+            modules = {module: modules[module] for module in module_paths if module in modules}
+
+        self.render_timings = {}
+        workers = max(1, min(self.config.render_workers, len(modules)))
+        use_processes = workers > 1 and self.config.render_processes
+        start = time.perf_counter()
+
+        if workers == 1:
+            for module_path, files in modules.items():
+                self._generate_module_doc(module_path, files, modules_dir)
+        elif use_processes:
+            # Format pages in worker processes and write them as they arrive
+            module_docs = [(module_path, self._module_documents(files)) for module_path, files in modules.items()]
+            with ProcessPoolExecutor(max_workers=workers) as executor:
+                pages = executor.map(_render_module_page_timed, module_docs, chunksize=RENDER_CHUNK_SIZE)
+                for (module_path, _), (content, seconds) in zip(module_docs, pages):
+                    self._write_module_doc(module_path, content, modules_dir, seconds)
+        else:
+            with ThreadPoolExecutor(max_workers=workers) as executor:
+                list(executor.map(lambda item: self._generate_module_doc(item[0], item[1], modules_dir),
+                                  modules.items()))
+
+        if modules:
+            kind = "processes" if use_processes else "threads" if workers > 1 else "thread"
+            logger.info(f"Rendered {len(modules)} module pages with {workers} {kind} "
+                        f"in {time.perf_counter() - start:.2f}s")
+            slowest = sorted(self.render_timings.items(), key=lambda item: (-item[1], item[0]))
+            for page, seconds in slowest[:SLOWEST_PAGES_REPORTED]:
+                logger.debug(f"  {seconds * 1000:.1f}ms {page}")
+
+    def _module_documents(self, files: List[str]) -> List[Tuple[str, Mapping[str, Any]]]:
+        """Get the (file path, entry) pairs of a module's files in page order."""
+        return [(file_path, self.documentation[file_path]) for file_path in sorted(files)]
 
     def _generate_module_doc(self, module_path: str, files: List[str], output_dir: Path) -> None:
         """Generate documentation for a single module."""
+        start = time.perf_counter()
+        content = self._render_module_page(module_path, self._module_documents(files))
+        self._write_module_doc(module_path, content, output_dir, time.perf_counter() - start)
+
+    def _write_module_doc(self, module_path: str, content: str, output_dir: Path,
+                          render_seconds: float) -> None:
+        """Write a module's index page and record how long it took."""
+        start = time.perf_counter()
         # Create module directory
-        module_dir = output_dir / module_path.replace('/', '_')
+        module_dir = self._module_dir(output_dir, module_path)
         module_dir.mkdir(exist_ok=True)
 
         # Create module index
         index_path = module_dir / "index.md"
 
+        try:
+            self._write_page(index_path, content)
+        except Exception as e:
+            logger.error(f"Error writing module documentation for {module_path}: {e}")
+
+        page = str(index_path.relative_to(self.config.output_dir))
+        with self._counter_lock:
+            self.render_timings[page] = render_seconds + time.perf_counter() - start
+
+    @staticmethod
+    def _render_module_page(module_path: str, docs: List[Tuple[str, Mapping[str, Any]]]) -> str:
+        """
+        Render a module's index page.
+
+        Args:
+            module_path: Module (directory) of the files
+            docs: (file path, documentation entry) pairs in page order
+
+        Returns:
+            The page content
+        """
         content = [
             f"# Module: {module_path}",
             "",
             "## Overview",
             "",
-            self._generate_module_overview(module_path, files),
+            DocumentationBuilder._generate_module_overview([doc for _, doc in docs]),
             "",
             "## Files",
             ""
         ]
 
         # Add file documentation
-        for file_path in sorted(files):
-            doc = self.documentation[file_path]
+        for file_path, doc in docs:
             file_name = Path(file_path).name
 
             content.extend([
@@ -166,62 +434,159 @@ class DocumentationBuilder:
                 "",
                 "#### Code Analysis",
                 "",
-                self._format_analysis(doc.get("analysis", {})),
+                DocumentationBuilder._format_analysis(doc.get("analysis", {})),
                 "",
                 "---",
                 ""
             ])
 
-        try:
-            with open(index_path, 'w') as f:
-                f.write('\n'.join(content))
-        except Exception as e:
-            logger.error(f"Error writing module documentation for {module_path}: {e}")
+        return '\n'.join(content)
+
+    @staticmethod
+    def _module_dir(modules_dir: Path, module_path: str) -> Path:
+        """Get the output directory of a module's pages."""
+        return modules_dir / module_path.replace('/', '_')
 
     def _generate_api_reference(self) -> None:
-        """Generate comprehensive API reference."""
+        """
+        Generate comprehensive API reference.
+
+        Symbols are taken from the symbol index in name order and each one's
+        section is rendered from the index as the page is streamed to disk,
+        so unchanged files' documentation is not read. Depending on api_reference_split, the reference is one page, or
+        an index page linking to a page per initial letter or per package.
+        """
         api_path = self.config.output_dir / "api-reference.md"
+        pages_dir = self.config.output_dir / API_REFERENCE_DIR
+        split = self.config.api_reference_split
 
-        content = [
+        index = self._get_symbol_index()
+        classes = index.symbols("class")
+        functions = index.symbols("function")
+
+        try:
+            if split == "none":
+                self._stream_page(api_path, self._api_reference_lines(
+                    "API Reference", "Complete API documentation for all classes and functions.",
+                    classes, functions))
+                self._remove_stale_pages(pages_dir, set())
+                return
+
+            groups = self._group_symbols(classes, functions, split)
+            pages = set()
+            for key, (group_classes, group_functions) in groups.items():
+                page = f"{key.replace('/', '_')}.md"
+                description = (f"Classes and functions starting with `{key}`." if split == "letter"
+                               else f"Classes and functions of `{key}`.")
+                self._stream_page(pages_dir / page, self._api_reference_lines(
+                    f"API Reference: {key}", description, group_classes, group_functions))
+                pages.add(page)
+            self._remove_stale_pages(pages_dir, pages)
+            self._write_page(api_path, self._api_reference_index(groups))
+        except Exception as e:
+            logger.error(f"Error writing API reference: {e}")
+
+    def _api_reference_lines(self, title: str, description: str,
+                             classes: List[Symbol], functions: List[Symbol]) -> Iterator[str]:
+        """Generate the lines of an API reference page, one symbol at a time."""
+        yield from [f"# {title}", "", description, "", "## Classes", ""]
+        for cls in classes:
+            yield from self._format_class_reference(cls)
+
+        yield from ["", "## Functions", ""]
+        for func in functions:
+            yield from self._format_function_reference(func)
+
+    @staticmethod
+    def _group_symbols(classes: List[Symbol], functions: List[Symbol],
+                       split: str) -> Dict[str, Tuple[List[Symbol], List[Symbol]]]:
+        """
+        Group sorted symbols into API reference pages.
+
+        Args:
+            classes: Classes sorted by name
+            functions: Functions sorted by name
+            split: "letter" to group by the initial letter of the name
+                ("_" for other names), "package" to group by module
+
+        Returns:
+            (classes, functions) of each page, sorted by page key
+        """
+        def key(symbol: Symbol) -> str:
+            if split == "package":
+                return DocumentationBuilder._module_name(symbol.file_path)
+            initial = symbol.name[:1].upper()
+            return initial if initial.isalpha() else "_"
+
+        groups: Dict[str, Tuple[List[Symbol], List[Symbol]]] = {}
+        for index, symbols in enumerate((classes, functions)):
+            for symbol in symbols:
+                groups.setdefault(key(symbol), ([], []))[index].append(symbol)
+        return dict(sorted(groups.items()))
+
+    @staticmethod
+    def _api_reference_index(groups: Mapping[str, Tuple[List, List]]) -> str:
+        """Render the index page of a split API reference."""
+        lines = [
             "# API Reference",
             "",
             "Complete API documentation for all classes and functions.",
-            "",
-            "## Classes",
             ""
         ]
+        for key, (classes, functions) in groups.items():
+            page = f"{API_REFERENCE_DIR}/{key.replace('/', '_')}.md"
+            lines.append(f"- [{key}]({page}) - {len(classes)} classes, {len(functions)} functions")
+        lines.append("")
+        return '\n'.join(lines)
 
-        # Collect all classes
-        all_classes = []
-        for file_path, doc in self.documentation.items():
-            analysis = doc.get("analysis", {})
-            for cls in analysis.get("classes", []):
-                cls["file_path"] = file_path
-                all_classes.append(cls)
-
-        # Sort and document classes
-        for cls in sorted(all_classes, key=lambda x: x["name"]):
-            content.extend(self._format_class_reference(cls))
-
-        content.extend(["", "## Functions", ""])
-
-        # Collect all functions
-        all_functions = []
-        for file_path, doc in self.documentation.items():
-            analysis = doc.get("analysis", {})
-            for func in analysis.get("functions", []):
-                func["file_path"] = file_path
-                all_functions.append(func)
-
-        # Sort and document functions
-        for func in sorted(all_functions, key=lambda x: x["name"]):
-            content.extend(self._format_function_reference(func))
-
+    def _stream_page(self, path: Path, lines: Iterable[str]) -> None:
+        """
+        Write a page line by line, keeping the existing file if it is unchanged.
+
+        Lines are joined with newlines and written through a buffered file
+        next to the page, so memory use does not grow with the page size.
+        The file then replaces the page atomically, or is discarded if the
+        page already has the same content.
+
+        Args:
+            path: Page to write
+            lines: Lines of the page
+        """
+        path.parent.mkdir(parents=True, exist_ok=True)
+        fd, tmp_name = tempfile.mkstemp(dir=str(path.parent), prefix=f".{path.name}.", suffix=".tmp")
         try:
-            with open(api_path, 'w') as f:
-                f.write('\n'.join(content))
-        except Exception as e:
-            logger.error(f"Error writing API reference: {e}")
+            with os.fdopen(fd, 'w', encoding='utf-8', newline='', buffering=STREAM_BUFFER_SIZE) as f:
+                separator = ""
+                for line in lines:
+                    f.write(separator)
+                    f.write(line)
+                    separator = "\n"
+
+            if path.is_file() and filecmp.cmp(tmp_name, path, shallow=False):
+                os.unlink(tmp_name)
+                with self._counter_lock:
+                    self.pages_unchanged += 1
+                return
+
+            os.replace(tmp_name, path)
+        except BaseException:
+            try:
+                os.unlink(tmp_name)
+            except OSError:
+                pass
+            raise
+
+        with self._counter_lock:
+            self.pages_written += 1
+
+    @staticmethod
+    def _remove_stale_pages(pages_dir: Path, keep: Set[str]) -> None:
+        """Delete the pages of a generated directory that are not in keep."""
+        if not pages_dir.is_dir():
+            return
+        for page in pages_dir.glob("*.md"):
+            if page.name not in keep:
+                page.unlink()
 
     def _generate_project_overview(self) -> None:
         """Generate project overview documentation."""
@@ -249,8 +614,7 @@ class DocumentationBuilder:
         ]
 
         try:
-            with open(overview_path, 'w') as f:
-                f.write('\n'.join(content))
+            self._write_page(overview_path, '\n'.join(content))
         except Exception as e:
             logger.error(f"Error writing project overview: {e}")
 
@@ -280,9 +644,7 @@ class DocumentationBuilder:
         modules: Dict[str, List[str]] = {}
 
         for file_path in self.documentation.keys():
-            module = str(Path(file_path).parent)
-            if module == ".":
-                module = "root"
+            module = self._module_name(file_path)
 
             if module not in modules:
                 modules[module] = []
@@ -290,24 +652,32 @@ class DocumentationBuilder:
 
         return modules
 
-    def _generate_module_overview(self, module_path: str, files: List[str]) -> str:
-        """Generate an overview for a module based on its files."""
+    @staticmethod
+    def _module_name(file_path: str) -> str:
+        """Get the module (directory) a documented file belongs to."""
+        module = str(Path(file_path).parent)
+        return "root" if module == "." else module
+
+    @staticmethod
+    def _generate_module_overview(docs: List[Mapping[str, Any]]) -> str:
+        """Generate an overview for a module based on the entries of its files."""
         total_classes = 0
         total_functions = 0
         total_loc = 0
 
-        for file_path in files:
-            analysis = self.documentation[file_path].get("analysis", {})
+        for doc in docs:
+            analysis = doc.get("analysis", {})
             total_classes += len(analysis.get("classes", []))
             total_functions += len(analysis.get("functions", []))
             total_loc += analysis.get("loc", 0)
 
-        return f"""This module contains {len(files)} files with a total of:
+        return f"""This module contains {len(docs)} files with a total of:
 - {total_classes} classes
 - {total_functions} functions
 - {total_loc} lines of code"""
 
-    def _format_analysis(self, analysis: Dict) -> str:
+    @staticmethod
+    def _format_analysis(analysis: Mapping[str, Any]) -> str:
         """Format code analysis results."""
         lines = []
 
@@ -334,77 +704,54 @@ class DocumentationBuilder:
 
         return '\n'.join(lines)
 
-    def _format_class_reference(self, cls: Dict) -> List[str]:
+    def _format_class_reference(self, cls: Symbol) -> List[str]:
         """Format class information for API reference."""
         lines = [
-            f"### class {cls['name']}",
-            f"*File: {cls['file_path']}*",
+            f"### class {cls.name}",
+            f"*File: {cls.file_path}*",
             ""
         ]
 
-        if cls.get("docstring"):
-            lines.extend([cls["docstring"], ""])
+        if cls.docstring:
+            lines.extend([cls.docstring, ""])
 
-        if cls.get("bases"):
-            lines.extend([f"**Inherits from:** {', '.join(cls['bases'])}", ""])
+        if cls.bases:
+            lines.extend([f"**Inherits from:** {', '.join(cls.bases)}", ""])
 
-        if cls.get("methods"):
+        if cls.methods:
             lines.extend(["**Methods:**", ""])
-            for method in cls["methods"]:
-                method_sig = f"- `{method['name']}("
-                if method.get("args"):
-                    args = [arg["name"] for arg in method["args"] if arg["name"] != "self"]
-                    method_sig += ", ".join(args)
-                method_sig += ")`"
-
-                if method.get("docstring"):
-                    first_line = method['docstring'].split('\n')[0]
-                    method_sig += f" - {first_line}"
+            for name, params, summary in cls.methods:
+                method_sig = f"- `{name}({params})`"
+                if summary is not None:
+                    method_sig += f" - {summary}"
 
                 lines.append(method_sig)
 
         lines.extend(["", "---", ""])
         return lines
 
-    def _format_function_reference(self, func: Dict) -> List[str]:
+    def _format_function_reference(self, func: Symbol) -> List[str]:
         """Format function information for API reference."""
         lines = [
-            f"### {func['name']}",
-            f"*File: {func['file_path']}*",
+            f"### {func.name}",
+            f"*File: {func.file_path}*",
+            "",
+            f"`{func.signature}`",
             ""
         ]
 
-        # Build function signature
-        sig = f"`{func['name']}("
-        if func.get("args"):
-            args = []
-            for arg in func["args"]:
-                arg_str = arg["name"]
-                if arg.get("annotation"):
-                    arg_str += f": {arg['annotation']}"
-                args.append(arg_str)
-            sig += ", ".join(args)
-        sig += ")"
-
-        if func.get("returns"):
-            sig += f" -> {func['returns']}"
-        sig += "`"
-
-        lines.append(sig)
-        lines.append("")
-
-        if func.get("docstring"):
-            lines.extend([func["docstring"], ""])
+        if func.docstring:
+            lines.extend([func.docstring, ""])
 
-        if func.get("decorators"):
+        if func.decorators:
             lines.extend([
-                "**Decorators:** " + ", ".join(func["decorators"]),
+                "**Decorators:** " + ", ".join(func.decorators),
                 ""
             ])
 
-        if func.get("raises"):
+        if func.raises:
             lines.extend([
-                "**Raises:** " + ", ".join(func["raises"]),
+                "**Raises:** " + ", ".join(func.raises),
                 ""
             ])
 
@@ -421,19 +768,11 @@ class DocumentationBuilder:
 
     def _count_classes(self) -> int:
         """Count total number of classes."""
-        total = 0
-        for doc in self.documentation.values():
-            analysis = doc.get("analysis", {})
-            total += len(analysis.get("classes", []))
-        return total
+        return self._get_symbol_index().count("class")
 
     def _count_functions(self) -> int:
         """Count total number of functions."""
-        total = 0
-        for doc in self.documentation.values():
-            analysis = doc.get("analysis", {})
-            total += len(analysis.get("functions", []))
-        return total
+        return self._get_symbol_index().count("function")
 
     def _analyze_architecture(self) -> str:
         """Analyze and describe the project architecture."""
@@ -460,11 +799,7 @@ class DocumentationBuilder:
 
     def _analyze_dependencies(self) -> str:
         """Analyze project dependencies."""
-        all_deps = set()
-
-        for doc in self.documentation.values():
-            analysis = doc.get("analysis", {})
-            all_deps.update(analysis.get("dependencies", []))
+        all_deps = self._get_symbol_index().dependencies()
 
         if all_deps:
             return '\n'.join([f"- {dep}" for dep in sorted(all_deps)])
@@ -476,17 +811,17 @@ class DocumentationBuilder:
         components = []
 
         # Services
-        services = [doc for path, doc in self.documentation.items() if "service" in path.lower()]
+        services = [path for path in self.documentation if "service" in path.lower()]
         if services:
             components.append(f"- **Services:** {len(services)} service modules identified")
 
         # Controllers
-        controllers = [doc for path, doc in self.documentation.items() if "controller" in path.lower()]
+        controllers = [path for path in self.documentation if "controller" in path.lower()]
         if controllers:
             components.append(f"- **Controllers:** {len(controllers)} controller modules identified")
 
         # Models/Entities
-        entities = [doc for path, doc in self.documentation.items() if "entity" in path.lower() or "model" in path.lower()]
+        entities = [path for path in self.documentation if "entity" in path.lower() or "model" in path.lower()]
         if entities:
             components.append(f"- **Domain Entities:** {len(entities)} entity modules identified")
 
@@ -497,20 +832,29 @@ class DocumentationBuilder:
         patterns = []
 
         # Look for common patterns
-        for doc in self.documentation.values():
-            analysis = doc.get("analysis", {})
-
+        for _, entry in self._get_symbol_index().files():
             # Check for decorators (Decorator pattern)
-            if analysis.get("decorators_used"):
-                if "@property" in analysis["decorators_used"]:
-                    patterns.append("Property decorators for encapsulation")
-                if "@classmethod" in analysis["decorators_used"] or "@staticmethod" in analysis["decorators_used"]:
-                    patterns.append("Class and static methods for alternative constructors")
+            if "@property" in entry.decorators:
+                patterns.append("Property decorators for encapsulation")
+            if "@classmethod" in entry.decorators or "@staticmethod" in entry.decorators:
+                patterns.append("Class and static methods for alternative constructors")
 
             # Check for base classes (Template Method, Strategy patterns)
-            for cls in analysis.get("classes", []):
-                if cls.get("bases") and any("Abstract" in base or "Base" in base for base in cls["bases"]):
-                    patterns.append("Abstract base classes for interface definition")
-                    break
+            if entry.abstract_bases:
+                patterns.append("Abstract base classes for interface definition")
+
+        # In order of first use, so the page is the same on every run
+        unique = dict.fromkeys(patterns)
+        return '\n'.join([f"- {pattern}" for pattern in unique]) if patterns else "Pattern analysis in progress."
+
+
+def _strip_lines(text: str, prefix: str) -> List[str]:
+    """Get the lines of a text that do not start with prefix."""
+    return [line for line in text.split('\n') if not line.startswith(prefix)]
+
 
-        return '\n'.join([f"- {pattern}" for pattern in set(patterns)]) if patterns else "Pattern analysis in progress."
\ No newline at end of file
+def _render_module_page_timed(module: Tuple[str, List[Tuple[str, Mapping[str, Any]]]]) -> Tuple[str, float]:
+    """Render a module page in a worker process, returning it with the seconds taken."""
+    start = time.perf_counter()
+    content = DocumentationBuilder._render_module_page(*module)
+    return content, time.perf_counter() - start
@@ -5,11 +5,17 @@ Generates comprehensive documentation using OpenAI's API.
 """
 
 import sys
+import json
+import time
 import logging
+import threading
+from concurrent.futures import ThreadPoolExecutor, as_completed
 from pathlib import Path
-from typing import Dict, Optional
+from types import SimpleNamespace
+from typing import Any, Dict, Iterator, List, Optional, Set, Tuple
 from datetime import datetime
 
+import openai
 from openai import OpenAI
 from tqdm import tqdm
 
@@ -17,6 +23,17 @@ from .file_scanner import FileScanner
 from .code_analyzer import CodeAnalyzer
 from .change_tracker import ChangeTracker
 from .doc_builder import DocumentationBuilder
+from .response_cache import ResponseCache
+from .analysis_cache import AnalysisCache, ANALYSIS_CACHE_SUBDIR
+from .rate_limiter import RateLimiter
+from .symbol_tracker import SymbolTracker
+from .checkpoint import Checkpoint
+from .import_graph import ImportGraph
+from .chunker import Chunk, split_into_chunks
+from .tokens import TokenCounter, TokenUsage
+from .batch import (
+    BatchBackend, BATCH_SUBDIR, TERMINAL_STATUSES, create_batch_backend, write_batch_file
+)
 from .config import Config
 
 # Configure logging
@@ -26,26 +43,95 @@ logging.basicConfig(
 )
 logger = logging.getLogger(__name__)
 
+# Signature lines of an imported project file included in a prompt
+MAX_DEPENDENCY_API_LINES = 40
+
+# Tokens reserved in every prompt for instructions, the code analysis and
+# the dependency APIs, on top of the system prompt and the source code
+PROMPT_OVERHEAD_TOKENS = 1000
+
+# Smallest source code budget used when a model's context window is tight
+MIN_CONTENT_TOKENS = 256
+
+# Transient API errors retried by the rate limiter
+RETRYABLE_ERRORS = (
+    openai.RateLimitError,
+    openai.APITimeoutError,
+    openai.APIConnectionError,
+    openai.InternalServerError,
+)
+
 
 class DocumentationGenerator:
     """Main class for generating project documentation using LLM."""
 
     def __init__(self, config: Config):
         self.config = config
-        self.client = OpenAI(api_key=config.openai_api_key)
+        # Retries are handled by the shared rate limiter
+        self.client = OpenAI(api_key=config.openai_api_key, max_retries=0)
         self.file_scanner = FileScanner(config)
-        self.code_analyzer = CodeAnalyzer()
-        self.change_tracker = ChangeTracker(config)
+        self.analysis_cache = AnalysisCache(
+            config.project_root / config.cache_dir / ANALYSIS_CACHE_SUBDIR,
+            config.cache_max_size,
+            enabled=config.use_analysis_cache
+        )
+        self.code_analyzer = CodeAnalyzer(self.analysis_cache)
+        self.change_tracker = ChangeTracker(config, self.file_scanner)
         self.doc_builder = DocumentationBuilder(config)
-
-    def generate_documentation(self, force_full: bool = False) -> None:
+        self.symbol_tracker = SymbolTracker()
+        self.response_cache = ResponseCache(
+            config.project_root / config.cache_dir,
+            config.cache_max_size,
+            enabled=config.use_cache
+        )
+        self.import_graph = ImportGraph(config.project_root, self.change_tracker.get_import_graph())
+        # Public APIs of imported project files, and files re-documented
+        # because an import changed, for the current run
+        self._public_apis: Dict[str, List[str]] = {}
+        self._invalidated_files: Set[Path] = set()
+        self.checkpoint = Checkpoint(
+            config.project_root / config.checkpoint_file,
+            config.project_root,
+            interval=config.checkpoint_interval
+        )
+        self.rate_limiter = RateLimiter(
+            requests_per_minute=config.requests_per_minute,
+            tokens_per_minute=config.tokens_per_minute,
+            max_retries=config.max_retries,
+            base_delay=config.retry_base_delay,
+            max_delay=config.retry_max_delay
+        )
+        self.token_counter = TokenCounter(config.model)
+        self.token_usage = TokenUsage()
+        # Bounds the requests in flight across file workers and their chunks
+        self._request_slots = threading.BoundedSemaphore(max(1, config.max_concurrency))
+        if not self.token_counter.exact:
+            logger.debug("tiktoken is not installed; estimating token counts")
+        # Batch endpoint, created on first use; requests queued while a batch
+        # is collected (None otherwise) and completions of finished batches
+        self.batch_backend: Optional[BatchBackend] = None
+        self._batch_requests: Optional[Dict[str, Tuple[int, Dict[str, Any]]]] = None
+        self._batch_results: Dict[str, str] = {}
+
+    def generate_documentation(self, force_full: bool = False, resume: bool = False) -> None:
         """
         Generate documentation for the project.
 
         Args:
             force_full: If True, regenerate all documentation regardless of changes
+            resume: If True, reuse the documentation of files completed by an
+                interrupted run (unless they changed since)
         """
         logger.info("Starting documentation generation...")
+        self._request_slots = threading.BoundedSemaphore(max(1, self.config.max_concurrency))
+
+        # Pick up or discard the checkpoint of an interrupted run
+        if resume and self.checkpoint.load():
+            logger.info("Resuming interrupted documentation run...")
+            force_full = force_full or self.checkpoint.full_run
+        elif self.checkpoint.exists():
+            logger.info("Discarding checkpoint of an interrupted run (use --resume to continue it)")
+            self.checkpoint.clear()
 
         # Determine which files need documentation
         if force_full or not self.change_tracker.has_previous_run():
@@ -59,6 +145,7 @@ class DocumentationGenerator:
 
         if not files_to_document:
             logger.info("No files need documentation.")
+            self.checkpoint.clear()
             return
 
         logger.info(f"Found {len(files_to_document)} files to document.")
@@ -67,29 +154,318 @@ class DocumentationGenerator:
         if not is_full_run:
             self.doc_builder.load_existing_documentation()
 
-        # Process each file
-        documented_files = []
-        with tqdm(total=len(files_to_document), desc="Documenting files") as pbar:
-            for file_path in files_to_document:
-                try:
-                    doc_content = self._document_file(file_path)
-                    if doc_content:
-                        self.doc_builder.add_file_documentation(file_path, doc_content)
-                        documented_files.append(file_path)
-                except Exception as e:
-                    logger.error(f"Error documenting {file_path}: {str(e)}")
-                finally:
-                    pbar.update(1)
+        self.checkpoint.full_run = is_full_run
+
+        # Register the project's files so their imports can be resolved
+        self.import_graph.add_modules(self.change_tracker.get_tracked_files())
+        self.import_graph.add_modules(self._relative_path(f) for f in files_to_document)
+        self._public_apis.clear()
+        self._invalidated_files.clear()
+
+        if self.config.batch_mode:
+            self._run_batch(files_to_document)
+        documented_files, api_changed = self._document_and_add(files_to_document)
+
+        if is_full_run:
+            self.import_graph.retain(self._relative_path(f) for f in files_to_document)
+        elif api_changed and self.config.invalidate_dependents:
+            # Re-document unchanged files importing a changed public API
+            queued = {self._relative_path(f) for f in files_to_document}
+            dependents = sorted({d for f in api_changed for d in self.import_graph.dependents(f)} - queued)
+            stale_files = self.file_scanner.filter_paths(dependents)
+            if stale_files:
+                logger.info(f"Re-documenting {len(stale_files)} files importing changed APIs")
+                self._invalidated_files.update(stale_files)
+                if self.config.batch_mode:
+                    self._run_batch(stale_files)
+                stale_documented, _ = self._document_and_add(stale_files)
+                documented_files += stale_documented
+                files_to_document = files_to_document + stale_files
 
         # Build the final documentation
         logger.info("Building final documentation structure...")
         self.doc_builder.build_documentation()
 
-        # Update the change tracker
-        self.change_tracker.update_state(documented_files)
+        # Update the change tracker; keep the previous commit as the git base
+        # if some files failed so they are picked up again next run
+        self.change_tracker.update_state(
+            documented_files,
+            record_commit=len(documented_files) == len(files_to_document),
+            import_graph=self.import_graph.to_dict()
+        )
+
+        self.checkpoint.clear()
+        self._batch_results.clear()
+
+        for cache in (self.response_cache, self.analysis_cache):
+            if cache.enabled:
+                cache.prune()
 
+        self._log_run_summary(files_to_document, documented_files)
         logger.info("Documentation generation complete!")
 
+    def _document_and_add(self, files: List[Path]) -> Tuple[List[Path], List[str]]:
+        """
+        Document files and add them to the documentation and import graph.
+
+        Documentation completed before an interruption is reused.
+
+        Args:
+            files: Files to document
+
+        Returns:
+            Tuple of (documented files, files whose public API changed)
+        """
+        results: Dict[Path, Optional[Dict]] = {}
+        for file_path in files:
+            checkpointed = self.checkpoint.get(file_path)
+            if checkpointed:
+                results[file_path] = checkpointed
+        if results:
+            logger.info(f"Reusing {len(results)} files documented before the interruption")
+
+        results.update(self._document_files([f for f in files if f not in results]))
+
+        # Add results in input order so the output is deterministic
+        documented_files = []
+        api_changed = []
+        for file_path in files:
+            doc_content = results.get(file_path)
+            if doc_content:
+                incomplete = doc_content.pop("incomplete", False)
+                self.doc_builder.add_file_documentation(file_path, doc_content)
+                if not incomplete:
+                    documented_files.append(file_path)
+                relative_path = self._relative_path(file_path)
+                if self.import_graph.update(relative_path, doc_content["analysis"]):
+                    api_changed.append(relative_path)
+
+        return documented_files, api_changed
+
+    def _run_batch(self, files: List[Path]) -> None:
+        """
+        Request the completions for documenting files through the batch API.
+
+        The files are put through the documentation pipeline once with every
+        request that misses the response cache queued instead of sent. The
+        queued requests are submitted as one batch, which is polled until it
+        finishes, and its completions are stored in the response cache, so
+        documenting the files afterwards needs no synchronous requests
+        except for the ones the batch failed to complete.
+
+        A batch submitted by an interrupted run is collected first instead
+        of being submitted again.
+
+        Args:
+            files: Files about to be documented
+        """
+        batch_dir = self.config.project_root / self.config.cache_dir / BATCH_SUBDIR
+        pending_path = batch_dir / "pending"
+        if self.batch_backend is None:
+            self.batch_backend = create_batch_backend(self.config.batch_backend, self.client, batch_dir)
+        backend = self.batch_backend
+
+        if pending_path.exists():
+            pending = json.loads(pending_path.read_text(encoding="utf-8"))
+            logger.info(f"Collecting batch {pending['id']} submitted by an interrupted run")
+            self._collect_batch(backend, pending, pending_path)
+
+        requests = self._queue_batch_requests([f for f in files if not self.checkpoint.get(f)])
+        if not requests:
+            logger.info("Every prompt has a cached response; no batch needed")
+            return
+
+        batch_file = batch_dir / f"batch-{datetime.now():%Y%m%d-%H%M%S}.jsonl"
+        write_batch_file(batch_file, {key: body for key, (_, body) in requests.items()})
+        batch_id = backend.submit(batch_file)
+        logger.info(f"Submitted batch {batch_id} with {len(requests)} requests")
+
+        # Remember the batch so an interrupted run does not pay for it twice
+        pending = {
+            "id": batch_id,
+            "file": str(batch_file),
+            "prompt_tokens": {key: tokens for key, (tokens, _) in requests.items()},
+        }
+        pending_path.write_text(json.dumps(pending), encoding="utf-8")
+        self._collect_batch(backend, pending, pending_path)
+
+    def _queue_batch_requests(self, files: List[Path]) -> Dict[str, Tuple[int, Dict[str, Any]]]:
+        """
+        Collect the uncached requests for documenting files without sending them.
+
+        Returns:
+            (prompt tokens, request body) by response cache key
+        """
+        if self.config.analysis_workers > 1 and len(files) > 1:
+            self._prepare_analyses(files)
+
+        self._batch_requests = {}
+        try:
+            for file_path in tqdm(files, desc="Preparing batch"):
+                self._safe_document_file(file_path)
+            return self._batch_requests
+        finally:
+            self._batch_requests = None
+
+    def _collect_batch(self, backend: BatchBackend, pending: Dict[str, Any], pending_path: Path) -> None:
+        """
+        Wait for a submitted batch to finish and store its completions.
+
+        Args:
+            backend: Batch endpoint the batch was submitted to
+            pending: Batch ID, input file and prompt tokens by cache key
+            pending_path: File recording the batch, removed once it is collected
+        """
+        batch_id = pending["id"]
+        status = backend.status(batch_id)
+        while status not in TERMINAL_STATUSES:
+            logger.debug(f"Batch {batch_id} is {status}")
+            time.sleep(self.config.batch_poll_interval)
+            status = backend.status(batch_id)
+
+        prompt_tokens: Dict[str, int] = pending["prompt_tokens"]
+        completed = 0
+        if status == "completed":
+            for key, result in backend.results(batch_id).items():
+                if key not in prompt_tokens:
+                    continue
+                if result.content is None:
+                    logger.debug(f"Batch request {key} failed: {result.error}")
+                    continue
+                self._batch_results[key] = result.content
+                self.response_cache.put(key, result.content)
+                self.token_usage.record(prompt_tokens[key], SimpleNamespace(**(result.usage or {})))
+                completed += 1
+        else:
+            logger.warning(f"Batch {batch_id} ended with status {status}")
+
+        failed = len(prompt_tokens) - completed
+        logger.info(f"Batch {batch_id} completed {completed} of {len(prompt_tokens)} requests")
+        if failed:
+            logger.warning(f"{failed} requests missing from batch {batch_id} will be sent individually")
+
+        # The completions are in the response cache now
+        backend.cleanup(batch_id)
+        Path(pending["file"]).unlink(missing_ok=True)
+        pending_path.unlink()
+
+    def _relative_path(self, file_path: Path) -> str:
+        """Get a file's path relative to the project root."""
+        if file_path.is_absolute():
+            file_path = file_path.relative_to(self.config.project_root)
+        return str(file_path)
+
+    def _log_run_summary(self, files_to_document: List[Path], documented_files: List[Path]) -> None:
+        """Log documentation, cache and rate limiting counters for the run."""
+        logger.info(f"Documented {len(documented_files)} of {len(files_to_document)} files")
+
+        documented = set(documented_files)
+        failed_files = [f for f in files_to_document if f not in documented]
+        if failed_files:
+            logger.warning(f"{len(failed_files)} files could not be documented and will be "
+                           f"retried on the next run:")
+            for file_path in failed_files:
+                logger.warning(f"  - {file_path}")
+
+        if self.response_cache.enabled:
+            logger.info(f"Response cache: {self.response_cache.hits} hits, "
+                        f"{self.response_cache.misses} misses")
+        if self.analysis_cache.enabled:
+            logger.info(f"Analysis cache: {self.analysis_cache.hits} hits, "
+                        f"{self.analysis_cache.misses} misses")
+
+        tokens = self.token_usage.stats()
+        if tokens["requests"]:
+            message = (f"Token usage: {tokens['requests']} requests, "
+                       f"{tokens['estimated_prompt_tokens']} estimated prompt tokens")
+            if tokens["estimate_error_percent"] is not None:
+                message += (f", {tokens['prompt_tokens']} actual prompt and "
+                            f"{tokens['completion_tokens']} completion tokens "
+                            f"(estimate off by {tokens['estimate_error_percent']:+}%)")
+            logger.info(message)
+
+        stats = self.rate_limiter.stats()
+        logger.info(f"Rate limiting: {stats['throttled_waits']} throttled waits "
+                    f"({stats['throttled_seconds']}s), {stats['retries']} retries, "
+                    f"{stats['failures']} failed requests")
+
+    def _document_files(self, files_to_document: List[Path]) -> Dict[Path, Optional[Dict]]:
+        """
+        Document a list of files, concurrently when max_concurrency > 1.
+
+        Completed files are added to the checkpoint, which is saved before
+        returning, including when the run is interrupted.
+
+        Args:
+            files_to_document: Files to document
+
+        Returns:
+            Dictionary mapping each file to its documentation (None on failure)
+        """
+        results: Dict[Path, Optional[Dict]] = {}
+        workers = min(self.config.max_concurrency, len(files_to_document))
+        # Taken before the files are read, so later edits invalidate the checkpoint
+        snapshots = {file_path: self.checkpoint.snapshot(file_path) for file_path in files_to_document}
+
+        if self.config.analysis_workers > 1 and len(files_to_document) > 1:
+            self._prepare_analyses(files_to_document)
+
+        def complete(file_path: Path, result: Optional[Dict]) -> None:
+            results[file_path] = result
+            if result:
+                self.checkpoint.add(file_path, snapshots[file_path], result)
+            pbar.update(1)
+
+        with tqdm(total=len(files_to_document), desc="Documenting files") as pbar:
+            try:
+                if workers <= 1:
+                    for file_path in files_to_document:
+                        complete(file_path, self._safe_document_file(file_path))
+                else:
+                    # The OpenAI client is thread-safe; requests are I/O bound
+                    with ThreadPoolExecutor(max_workers=workers) as executor:
+                        futures = {
+                            executor.submit(self._safe_document_file, file_path): file_path
+                            for file_path in files_to_document
+                        }
+                        try:
+                            for future in as_completed(futures):
+                                complete(futures[future], future.result())
+                        except BaseException:
+                            # Do not start queued files after an interruption
+                            for future in futures:
+                                future.cancel()
+                            raise
+            finally:
+                self.checkpoint.save()
+
+        return results
+
+    def _prepare_analyses(self, files: List[Path]) -> None:
+        """Analyze files in worker processes ahead of the LLM stage."""
+        workers = min(self.config.analysis_workers, len(files))
+        start = time.perf_counter()
+        analyzed = self.code_analyzer.prepare(self._read_sources(files), workers)
+        logger.info(f"Analyzed {analyzed} files with {workers} processes "
+                    f"in {time.perf_counter() - start:.1f}s")
+
+    def _read_sources(self, files: List[Path]) -> Iterator[Tuple[Path, str]]:
+        """Read files lazily, skipping unreadable ones (reported when documented)."""
+        for file_path in files:
+            try:
+                with open(file_path, 'r', encoding='utf-8') as f:
+                    yield file_path, f.read()
+            except Exception:
+                continue
+
+    def _safe_document_file(self, file_path: Path) -> Optional[Dict]:
+        """Document a single file, isolating any error to that file."""
+        try:
+            return self._document_file(file_path)
+        except Exception as e:
+            logger.error(f"Error documenting {file_path}: {str(e)}")
+            return None
+
     def _document_file(self, file_path: Path) -> Optional[Dict]:
         """
         Generate documentation for a single file.
@@ -113,41 +489,239 @@ class DocumentationGenerator:
         # Analyze the code
         analysis = self.code_analyzer.analyze_file(file_path, content)
 
-        # Prepare the prompt for the LLM
-        prompt = self._create_documentation_prompt(file_path, content, analysis)
+        # Find the changed symbols if only those should be re-documented
+        symbols = None
+        existing = None
+        changed_symbols: List[str] = []
+        removed_symbols: List[str] = []
+        if self.config.symbol_level_updates:
+            symbols = self.symbol_tracker.fingerprint(content, analysis)
+            existing = self.doc_builder.get_file_documentation(file_path)
+            # Files re-documented for a changed import are documented as a whole
+            if (existing and existing.get("symbols") and existing.get("documentation")
+                    and file_path not in self._invalidated_files):
+                changed_symbols, removed_symbols = self.symbol_tracker.diff(existing["symbols"], symbols)
+                if not self.symbol_tracker.can_update_symbols(changed_symbols, removed_symbols, symbols):
+                    existing = None
+            else:
+                existing = None
 
         # Get documentation from LLM
+        doc_content: Optional[str] = None
+        failed_symbols: List[str] = []
         try:
-            response = self.client.chat.completions.create(
-                model=self.config.model,
-                messages=[
-                    {"role": "system", "content": self.config.system_prompt},
-                    {"role": "user", "content": prompt}
-                ],
-                temperature=0.3,
-                max_tokens=2000
-            )
-
-            doc_content = response.choices[0].message.content
-
-            return {
+            if existing and symbols is not None:
+                doc_content, failed_symbols = self._document_symbols(
+                    file_path, content, analysis, existing["documentation"], changed_symbols, removed_symbols
+                )
+                if doc_content is None:
+                    logger.debug(f"Could not update the symbols of {file_path}, documenting the whole file")
+                # Keep the documented fingerprints of symbols whose sections
+                # were kept, so they are documented again
+                for name in failed_symbols:
+                    if name in existing["symbols"]:
+                        symbols[name] = existing["symbols"][name]
+                    else:
+                        del symbols[name]
+            if doc_content is None:
+                doc_content = self._document_whole_file(file_path, content, analysis)
+            if doc_content is None:
+                # Not recorded, so the file is documented again on the next run
+                logger.error(f"LLM returned no documentation for {file_path}")
+                return None
+
+            result: Dict[str, Any] = {
                 "path": str(file_path),
                 "analysis": analysis,
                 "documentation": doc_content,
                 "timestamp": datetime.now().isoformat()
             }
+            if symbols is not None:
+                result["symbols"] = symbols
+            if failed_symbols:
+                # Added without marking the file documented, so the next run retries it
+                result["incomplete"] = True
+            return result
 
         except Exception as e:
             logger.error(f"LLM error for {file_path}: {str(e)}")
             return None
 
+    def _document_whole_file(self, file_path: Path, content: str, analysis: Dict) -> Optional[str]:
+        """Document a file with one prompt, or chunk by chunk if it is too large."""
+        if self.config.chunk_large_files and self.token_counter.count(content) > self._content_budget():
+            return self._document_chunks(file_path, content, analysis)
+        prompt = self._create_documentation_prompt(file_path, content, analysis)
+        return self._request_completion(prompt)
+
+    def _document_symbols(self, file_path: Path, content: str, analysis: Dict, documentation: str,
+                          changed: List[str], removed: List[str]) -> Tuple[Optional[str], List[str]]:
+        """
+        Update existing file documentation for changed and removed symbols only.
+
+        A symbol whose section comes back empty keeps its previous section.
+
+        Args:
+            file_path: Path to the file
+            content: Current file content
+            analysis: Current code analysis
+            documentation: Existing documentation of the file
+            changed: Symbols that were added or modified
+            removed: Symbols that no longer exist
+
+        Returns:
+            Tuple of (the updated documentation, or None if the source of a
+            changed symbol could not be found, symbols that kept their
+            previous section)
+        """
+        logger.debug(f"Updating {len(changed)} changed and {len(removed)} removed symbols in {file_path}")
+
+        sources = {}
+        for name in changed:
+            source = self.symbol_tracker.get_symbol_source(content, analysis, name)
+            if source is None:
+                return None, []
+            sources[name] = source
+
+        for name in removed:
+            documentation = self.symbol_tracker.splice(documentation, name, None)
+
+        failed = []
+        for name, source in sources.items():
+            prompt = self._create_symbol_prompt(file_path, name, source, analysis)
+            section = self._request_completion(prompt)
+            if not section:
+                logger.warning(f"LLM returned no documentation for {name} in {file_path}, keeping its previous section")
+                failed.append(name)
+                continue
+            # A class's section also holds the sections of its unchanged methods
+            is_class = self.symbol_tracker.symbol_kind(analysis, name) == "class"
+            documentation = self.symbol_tracker.splice(documentation, name, section,
+                                                       keep_subsections=is_class)
+
+        return documentation, failed
+
+    def _document_chunks(self, file_path: Path, content: str, analysis: Dict) -> str:
+        """
+        Document a file that is too large for one prompt, chunk by chunk.
+
+        The file is split along class and function boundaries. An overview
+        of the whole file and every chunk are documented concurrently, and
+        the results are joined in file order.
+
+        Args:
+            file_path: Path to the file
+            content: File content
+            analysis: Code analysis of the file
+
+        Returns:
+            The documentation of the whole file
+        """
+        chunks = split_into_chunks(content, analysis, self._content_budget(), self.token_counter.count)
+        logger.info(f"Documenting {file_path} in {len(chunks)} chunks")
+
+        prompts = [self._create_overview_prompt(file_path, analysis)] + [
+            self._create_chunk_prompt(file_path, chunk, index, len(chunks), analysis)
+            for index, chunk in enumerate(chunks, 1)
+        ]
+        workers = min(self.config.max_concurrency, len(prompts))
+        if workers <= 1:
+            sections = [self._request_completion(prompt) for prompt in prompts]
+        else:
+            with ThreadPoolExecutor(max_workers=workers) as executor:
+                sections = list(executor.map(self._request_completion, prompts))
+
+        return "\n\n".join(section.strip() for section in sections if section)
+
+    def _request_completion(self, prompt: str) -> Optional[str]:
+        """
+        Get the LLM completion for a prompt, using the response cache when possible.
+
+        Args:
+            prompt: User prompt to send
+
+        Returns:
+            The generated content
+        """
+        prompt_tokens = self.token_counter.count(self.config.system_prompt) + self.token_counter.count(prompt)
+        # Leave the completion whatever the prompt leaves of the context window
+        max_tokens = min(self.config.max_tokens, self.token_counter.context_window - prompt_tokens)
+        if max_tokens < 1:
+            raise ValueError(f"Prompt of {prompt_tokens} tokens exceeds the "
+                             f"{self.token_counter.context_window} token context window of {self.config.model}")
+
+        cache_key = ResponseCache.make_key(
+            self.config.model,
+            self.config.system_prompt,
+            prompt,
+            self.config.temperature,
+            max_tokens
+        )
+        batched = self._batch_results.get(cache_key)
+        if batched is not None:
+            return batched
+
+        if self._batch_requests is not None:
+            # Collecting a batch: queue uncached requests instead of sending them
+            if not self.response_cache.contains(cache_key):
+                self._batch_requests[cache_key] = (prompt_tokens, {
+                    "model": self.config.model,
+                    "messages": [
+                        {"role": "system", "content": self.config.system_prompt},
+                        {"role": "user", "content": prompt}
+                    ],
+                    "temperature": self.config.temperature,
+                    "max_tokens": max_tokens
+                })
+            return ""
+
+        cached = self.response_cache.get(cache_key)
+        if cached is not None:
+            return cached
+
+        # Chunk requests run on threads of their own, so the concurrency limit
+        # is enforced per request rather than per file
+        with self._request_slots:
+            response = self.rate_limiter.call(
+                lambda: self.client.chat.completions.create(
+                    model=self.config.model,
+                    messages=[
+                        {"role": "system", "content": self.config.system_prompt},
+                        {"role": "user", "content": prompt}
+                    ],
+                    temperature=self.config.temperature,
+                    max_tokens=max_tokens
+                ),
+                tokens=prompt_tokens + max_tokens,
+                retryable=RETRYABLE_ERRORS
+            )
+        self.token_usage.record(prompt_tokens, getattr(response, "usage", None))
+
+        content = response.choices[0].message.content
+        self.response_cache.put(cache_key, content)
+        return content
+
+    def _content_budget(self) -> int:
+        """
+        Get the number of source code tokens to include in one prompt.
+
+        This is max_content_tokens, lowered when the model's context window
+        cannot hold the system prompt, the rest of the prompt and max_tokens
+        of output besides it.
+        """
+        available = (self.token_counter.context_window
+                     - self.token_counter.count(self.config.system_prompt)
+                     - PROMPT_OVERHEAD_TOKENS
+                     - self.config.max_tokens)
+        return max(MIN_CONTENT_TOKENS, min(self.config.max_content_tokens, available))
+
     def _create_documentation_prompt(self, file_path: Path, content: str, analysis: Dict) -> str:
         """Create a prompt for the LLM to generate documentation."""
 
         # Truncate content if too long
-        max_content_length = 10000
-        if len(content) > max_content_length:
-            content = content[:max_content_length] + "\n... (truncated)"
+        budget = self._content_budget()
+        if self.token_counter.count(content) > budget:
+            content = self.token_counter.truncate(content, budget) + "\n... (truncated)"
 
         prompt = f"""Please generate comprehensive documentation for the following Python file.
 
@@ -160,7 +734,7 @@ Code Analysis:
 - Imports: {len(analysis.get('imports', []))}
 - Lines of Code: {analysis.get('loc', 0)}
 
-File Content:
+{self._format_dependency_apis(file_path, analysis)}File Content:
 ```python
 {content}
 ```
@@ -177,6 +751,141 @@ Format the documentation in clean Markdown with appropriate headers and sections
 
         return prompt
 
+    def _create_overview_prompt(self, file_path: Path, analysis: Dict) -> str:
+        """Create a prompt for the overview of a file whose code is documented in chunks."""
+        module_docstring = analysis.get("module_docstring") or "None"
+
+        # Keep the API listing within the content budget
+        budget = self._content_budget()
+        api_lines: List[str] = []
+        size = 0
+        for line in ImportGraph.public_api(analysis):
+            size += self.token_counter.count(line) + 1
+            if size > budget:
+                api_lines.append("...")
+                break
+            api_lines.append(line)
+        api = "\n".join(api_lines) or "# No public API"
+
+        prompt = f"""Please write an overview of the following Python file.
+The file is too large to show in full; its classes and functions are documented separately.
+
+File Path: {file_path}
+File Type: {file_path.suffix}
+Module Docstring: {module_docstring}
+
+Code Analysis:
+- Classes: {len(analysis.get('classes', []))}
+- Functions: {len(analysis.get('functions', []))}
+- Imports: {len(analysis.get('imports', []))}
+- Lines of Code: {analysis.get('loc', 0)}
+
+{self._format_dependency_apis(file_path, analysis)}Public API:
+```python
+{api}
+```
+
+Please provide:
+1. A brief overview of the file's purpose
+2. The main classes and functions and how they relate to each other
+3. Key dependencies and imports
+4. Any important notes or considerations
+
+Do not describe each class and function in detail. Format the overview in clean Markdown."""
+
+        return prompt
+
+    def _create_chunk_prompt(self, file_path: Path, chunk: Chunk, index: int, total: int,
+                             analysis: Dict) -> str:
+        """Create a prompt for one chunk of a file that is documented in chunks."""
+        module_docstring = analysis.get("module_docstring") or "None"
+        context = f"Enclosing Class: `{chunk.context}`\n" if chunk.context else ""
+
+        prompt = f"""Please generate documentation for part {index} of {total} of the following Python file.
+The file overview and the other parts are documented separately, so only describe the code shown here.
+
+File Path: {file_path}
+Lines: {chunk.start_line}-{chunk.end_line}
+Module Docstring: {module_docstring}
+{context}
+Code:
+```python
+{chunk.source}
+```
+
+Please provide, for each class and function in this part:
+1. A description of its purpose (and key methods for classes)
+2. Parameters, return values and exceptions
+3. Usage examples where applicable
+
+Use a heading for each class and function, without a heading for the part itself.
+Format the documentation in clean Markdown."""
+
+        return prompt
+
+    def _create_symbol_prompt(self, file_path: Path, name: str, source: str, analysis: Dict) -> str:
+        """Create a prompt for the LLM to document a single class, method or function."""
+        module_docstring = analysis.get("module_docstring") or "None"
+
+        prompt = f"""Please generate documentation for `{name.split('#')[0]}` in the following Python file.
+Only this symbol was added or modified; the documentation of the rest of the file is unchanged.
+
+File Path: {file_path}
+Module Docstring: {module_docstring}
+
+Source:
+```python
+{source}
+```
+
+Please describe its purpose, parameters, return values and exceptions, with a short usage example
+where helpful. Do not start with a heading; the section heading is added automatically.
+
+Format the documentation in clean Markdown."""
+
+        return prompt
+
+    def _format_dependency_apis(self, file_path: Path, analysis: Dict) -> str:
+        """
+        Format the public APIs of the project files imported by a file.
+
+        They are included for files re-documented because an API they import
+        changed, so the documentation matches the new signatures and the
+        prompt differs from the cached one, and for every file when
+        dependency_api_context is set. Other prompts are left unchanged.
+
+        Returns:
+            A prompt section, or an empty string if nothing is included
+        """
+        if not self.config.dependency_api_context and file_path not in self._invalidated_files:
+            return ""
+
+        sections = []
+        for target in self.import_graph.resolve_imports(self._relative_path(file_path), analysis):
+            api = self._get_public_api(target)
+            if api:
+                lines = api[:MAX_DEPENDENCY_API_LINES]
+                if len(api) > len(lines):
+                    lines.append("...")
+                sections.append(f"# {target}\n" + "\n".join(lines))
+
+        if not sections:
+            return ""
+        apis = "\n\n".join(sections)
+        return f"Project APIs Used:\n```python\n{apis}\n```\n\n"
+
+    def _get_public_api(self, relative_path: str) -> List[str]:
+        """Get the public API of a project file, analyzing it once per run."""
+        if relative_path not in self._public_apis:
+            try:
+                content = (self.config.project_root / relative_path).read_text(encoding="utf-8")
+                analysis = self.code_analyzer.analyze_file(Path(relative_path), content)
+                self._public_apis[relative_path] = ImportGraph.public_api(analysis)
+            except Exception as e:
+                logger.debug(f"Could not read the API of {relative_path}: {e}")
+                self._public_apis[relative_path] = []
+        return self._public_apis[relative_path]
+
 
 def main() -> None:
     """Main entry point for the documentation generator."""
@@ -185,6 +894,7 @@ def main() -> None:
     parser = argparse.ArgumentParser(description="Generate project documentation using AI")
     parser.add_argument("--config", type=str, help="Path to configuration file")
     parser.add_argument("--full", action="store_true", help="Force full documentation regeneration")
+    parser.add_argument("--resume", action="store_true", help="Resume an interrupted documentation run")
     parser.add_argument("--api-key", type=str, help="OpenAI API key (overrides config)")
     parser.add_argument("--output", type=str, help="Output directory for documentation")
 
@@ -209,7 +919,7 @@ def main() -> None:
 
     # Create and run generator
     generator = DocumentationGenerator(config)
-    generator.generate_documentation(force_full=args.full)
+    generator.generate_documentation(force_full=args.full, resume=args.resume)
 
 
 if __name__ == "__main__":
@@ -0,0 +1,195 @@
+"""
+Sharded storage of per-file documentation entries.
+"""
+
+import os
+import json
+import hashlib
+import logging
+from pathlib import Path
+from typing import Any, Dict, Iterator, MutableMapping, Optional, Set
+
+from .fileutils import atomic_write
+from .records import compact_analysis, json_default
+
+logger = logging.getLogger(__name__)
+
+# Directory of the sharded store inside the output directory
+DOC_STORE_DIR = ".doc_store"
+
+# Version of the manifest format
+MANIFEST_VERSION = 1
+
+
+class ShardedDocumentationStore(MutableMapping[str, Any]):
+    """
+    Documentation entries stored as one content-addressed file per source file.
+
+    A small manifest maps each documented file to the hash of its shard,
+    which holds the file's entry as compact JSON. Opening the store only
+    reads the manifest; entries are read from their shards when first
+    accessed and kept in memory afterwards. save() writes the shards of
+    entries assigned since the store was opened, then the manifest, and
+    removes shards no longer referenced. Entries must be assigned back to
+    the store after they are modified.
+    """
+
+    def __init__(self, directory: Path, compact: bool = False):
+        """
+        Initialize the store.
+
+        Args:
+            directory: Directory holding the manifest and the shards
+            compact: Convert analyses to records when entries are read
+        """
+        self.directory = directory
+        self.compact = compact
+        # Shard hash of every entry (None until an assigned entry is saved)
+        self._shards: Dict[str, Optional[str]] = {}
+        self._entries: Dict[str, Any] = {}
+        self._dirty: Set[str] = set()
+        # Whether shards may have become unreferenced since the last save;
+        # unknown until the manifest has been read
+        self._garbage = True
+
+    @property
+    def manifest_path(self) -> Path:
+        """Path of the manifest file."""
+        return self.directory / "manifest.json"
+
+    def load(self) -> bool:
+        """
+        Read the manifest, discarding any unsaved entries.
+
+        Returns:
+            True if a manifest was found
+        """
+        self._shards = {}
+        self._entries = {}
+        self._dirty = set()
+        if not self.manifest_path.exists():
+            return False
+        self._garbage = False
+
+        with open(self.manifest_path, 'r', encoding='utf-8') as f:
+            manifest = json.load(f)
+        if manifest.get("version") != MANIFEST_VERSION:
+            raise ValueError(f"Unsupported documentation store version: {manifest.get('version')}")
+        self._shards = dict(manifest["entries"])
+        return True
+
+    def __getitem__(self, key: str) -> Any:
+        if key not in self._entries:
+            shard = self._shards[key]
+            if shard is None:
+                raise KeyError(key)
+            with open(self._shard_path(shard), 'r', encoding='utf-8') as f:
+                entry = json.load(f)
+            if self.compact and isinstance(entry.get("analysis"), dict):
+                entry["analysis"] = compact_analysis(entry["analysis"])
+            self._entries[key] = entry
+        return self._entries[key]
+
+    def __setitem__(self, key: str, value: Any) -> None:
+        self._entries[key] = value
+        self._shards.setdefault(key, None)
+        self._dirty.add(key)
+
+    def __delitem__(self, key: str) -> None:
+        del self._shards[key]
+        self._entries.pop(key, None)
+        self._dirty.discard(key)
+        self._garbage = True
+
+    def __contains__(self, key: object) -> bool:
+        return key in self._shards
+
+    def __iter__(self) -> Iterator[str]:
+        return iter(self._shards)
+
+    def __len__(self) -> int:
+        return len(self._shards)
+
+    def save(self) -> int:
+        """
+        Write changed entries and the manifest.
+
+        Returns:
+            Number of shards written
+        """
+        written = 0
+        for key in self._dirty:
+            data = json.dumps(self._entries[key], sort_keys=True, separators=(",", ":"),
+                              default=json_default).encode("utf-8")
+            shard = hashlib.sha256(data).hexdigest()[:32]
+            shard_path = self._shard_path(shard)
+            # Identical content is already stored under the same name
+            if not shard_path.exists():
+                atomic_write(shard_path, data)
+                written += 1
+            if self._shards[key] not in (None, shard):
+                self._garbage = True
+            self._shards[key] = shard
+        self._dirty = set()
+
+        manifest = {"version": MANIFEST_VERSION, "entries": self._shards}
+        atomic_write(self.manifest_path, json.dumps(manifest, separators=(",", ":")))
+        if self._garbage:
+            self._remove_unreferenced_shards()
+            self._garbage = False
+        return written
+
+    def _shard_path(self, shard: str) -> Path:
+        """Get the file holding a shard."""
+        return self.directory / "shards" / shard[:2] / f"{shard}.json"
+
+    def _remove_unreferenced_shards(self) -> None:
+        """Delete shards that the manifest no longer references."""
+        referenced = {f"{shard}.json" for shard in self._shards.values()}
+        shards_dir = self.directory / "shards"
+        if not shards_dir.is_dir():
+            return
+
+        for prefix in os.scandir(shards_dir):
+            if not prefix.is_dir():
+                continue
+            for entry in os.scandir(prefix.path):
+                if entry.name.endswith(".json") and entry.name not in referenced:
+                    try:
+                        os.unlink(entry.path)
+                    except OSError as e:
+                        logger.debug(f"Could not remove unreferenced shard {entry.path}: {e}")
+
+
+def open_documentation_store(output_dir: Path, compact: bool = False) -> ShardedDocumentationStore:
+    """
+    Open the sharded documentation store of an output directory.
+
+    When the store does not exist yet but a ``documentation.json`` does, its
+    entries are imported and saved once, and the JSON file is renamed with a
+    ``.migrated`` suffix.
+
+    Args:
+        output_dir: Documentation output directory
+        compact: Convert analyses to records when entries are read
+
+    Returns:
+        The opened store
+    """
+    store = ShardedDocumentationStore(output_dir / DOC_STORE_DIR, compact=compact)
+    if store.load():
+        return store
+
+    json_path = output_dir / "documentation.json"
+    if json_path.exists():
+        with open(json_path, 'r', encoding='utf-8') as f:
+            legacy = json.load(f)
+        for key, entry in legacy.items():
+            if compact and isinstance(entry.get("analysis"), dict):
+                entry["analysis"] = compact_analysis(entry["analysis"])
+            store[key] = entry
+        store.save()
+        json_path.rename(json_path.with_name(json_path.name + ".migrated"))
+        logger.info(f"Migrated {len(store)} documentation entries from {json_path} to {store.directory}")
+
+    return store
@@ -3,22 +3,54 @@ File scanner for identifying Python files in the project.
 """
 
 import os
+import re
 import fnmatch
+import subprocess
 from pathlib import Path
-from typing import List, Dict, Any, cast
+from stat import S_ISREG
+from typing import List, Dict, Any, Iterable, Optional, Pattern, cast
 import logging
-from pathlib import PurePath
 
 from .config import Config
 
 logger = logging.getLogger(__name__)
 
 
+class PatternMatcher:
+    """Matches names against a fixed set of glob patterns, compiled once."""
+
+    def __init__(self, patterns: List[str]):
+        """
+        Compile the patterns.
+
+        Plain names are matched with a set lookup; patterns containing
+        wildcards are combined into a single regular expression.
+
+        Args:
+            patterns: fnmatch-style patterns
+        """
+        normalized = [os.path.normcase(p) for p in patterns]
+        self.literals = frozenset(p for p in normalized if not _has_wildcards(p))
+        wildcards = [fnmatch.translate(p) for p in normalized if _has_wildcards(p)]
+        self._regex = re.compile('|'.join(f"(?:{p})" for p in wildcards)) if wildcards else None
+
+    def matches(self, name: str) -> bool:
+        """Check whether a name matches any of the patterns."""
+        name = os.path.normcase(name)
+        if name in self.literals:
+            return True
+        return self._regex is not None and self._regex.match(name) is not None
+
+
 class FileScanner:
     """Scans the project directory for files to document."""
 
     def __init__(self, config: Config):
         self.config = config
+        self._include_names = PatternMatcher([p for p in config.include_patterns if '/' not in p])
+        self._include_paths = self._compile_path_patterns([p for p in config.include_patterns if '/' in p])
+        self._exclude_dirs = PatternMatcher(config.exclude_dirs)
+        self._exclude_files = PatternMatcher(config.exclude_files)
 
     def scan_all_files(self) -> List[Path]:
         """
@@ -27,58 +59,153 @@ class FileScanner:
         Returns:
             List of Path objects for files to document
         """
-        files = []
-
-        for pattern in self.config.include_patterns:
-            files.extend(self._find_files(pattern))
+        candidates = None
+        if self.config.discovery == "git":
+            candidates = self._git_files()
+        if candidates is None:
+            candidates = self._walk_files()
 
-        # Remove duplicates and sort
-        files = sorted(list(set(files)))
+        files = sorted(candidates)
 
         logger.info(f"Found {len(files)} files matching patterns")
         return files
 
-    def _find_files(self, pattern: str) -> List[Path]:
-        """Find all files matching the given pattern."""
+    def filter_paths(self, relative_paths: Iterable[str]) -> List[Path]:
+        """
+        Apply the include, exclude, test and size rules to a list of paths.
+
+        Args:
+            relative_paths: POSIX paths relative to the project root
+
+        Returns:
+            List of absolute Path objects for the files that should be documented
+        """
+        root = self.config.project_root
+        excluded_dirs: Dict[str, bool] = {}
         matches = []
 
-        # Use glob for patterns with **
-        if '**' in pattern:
-            for file_path in self.config.project_root.glob(pattern):
-                if file_path.is_file() and self._should_include_file(file_path):
-                    # Check if any parent directory should be excluded
-                    should_exclude = False
-                    for parent in file_path.parents:
-                        if self._should_exclude_dir(parent):
-                            should_exclude = True
-                            break
-                    if not should_exclude:
-                        matches.append(file_path)
-        else:
-            # Use walk for simple patterns
-            for root, dirs, files in os.walk(self.config.project_root):
-                # Convert to Path for easier handling
-                root_path = Path(root)
-
-                # Skip excluded directories
-                dirs_filtered = [d for d in dirs if not self._should_exclude_dir(root_path / d)]
-                dirs.clear()
-                dirs.extend(dirs_filtered)
-
-                # Skip if we're in a test directory and not including tests
-                if not self.config.include_tests and self._is_test_directory(root_path):
-                    continue
+        for relative_path in dict.fromkeys(relative_paths):
+            directory, _, filename = relative_path.rpartition('/')
+
+            if directory not in excluded_dirs:
+                excluded_dirs[directory] = self._skip_files_in(directory)
+            if excluded_dirs[directory]:
+                continue
+
+            if not self._matches_include_patterns(filename, relative_path):
+                continue
+
+            file_path = root / relative_path
+            try:
+                stat = file_path.stat()
+            except OSError:
+                # Deleted from the working tree but still in the index
+                continue
+            if not S_ISREG(stat.st_mode):
+                continue
 
-                # Check files
-                for filename in files:
-                    if fnmatch.fnmatch(filename, pattern):
-                        file_path = root_path / filename
+            if self._should_include_file(file_path, stat.st_size):
+                matches.append(file_path)
 
-                        if self._should_include_file(file_path):
-                            matches.append(file_path)
+        return matches
+
+    def _git_files(self) -> Optional[List[Path]]:
+        """
+        List candidate files from the git index.
+
+        Tracked files and untracked files not ignored by .gitignore are
+        returned, so ignored build and data directories are never visited.
+
+        Returns:
+            Files passing the scanner rules, or None if git is unavailable
+        """
+        try:
+            result = subprocess.run(
+                ["git", "ls-files", "-z", "--cached", "--others", "--exclude-standard"],
+                cwd=self.config.project_root,
+                capture_output=True,
+                check=True
+            )
+        except (OSError, subprocess.CalledProcessError):
+            logger.debug("Git not available or not a git repository, walking the file system")
+            return None
+
+        relative_paths = [p for p in os.fsdecode(result.stdout).split('\0') if p]
+        return self.filter_paths(relative_paths)
+
+    def _skip_files_in(self, directory: str) -> bool:
+        """Check whether files in a directory (relative to the project root) are skipped."""
+        if not directory:
+            return not self.config.include_tests and self._is_test_directory(self.config.project_root)
+
+        parts = directory.split('/')
+        if any(self._exclude_dirs.matches(part) for part in parts):
+            return True
+
+        # Like the walk, only files directly inside a test directory are skipped
+        return not self.config.include_tests and self._is_test_directory(Path(parts[-1]))
+
+    def _walk_files(self) -> List[Path]:
+        """Walk the project tree once, matching every include pattern per file."""
+        matches = []
+        # Stack of (directory, directory path relative to the project root)
+        stack = [(str(self.config.project_root), "")]
+
+        while stack:
+            dir_path, relative_dir = stack.pop()
+            try:
+                with os.scandir(dir_path) as it:
+                    entries = list(it)
+            except OSError as e:
+                logger.debug(f"Cannot read directory {dir_path}: {e}")
+                continue
+
+            # Skip files if we're in a test directory and not including tests
+            skip_files = not self.config.include_tests and self._is_test_directory(Path(dir_path))
+
+            for entry in entries:
+                relative_path = relative_dir + entry.name
+
+                try:
+                    if entry.is_dir():
+                        # Like os.walk, do not descend into symlinked directories
+                        if not entry.is_symlink() and not self._should_exclude_dir(Path(entry.path)):
+                            stack.append((entry.path, relative_path + "/"))
+                        continue
+                    if skip_files or not entry.is_file():
+                        continue
+                    if not self._matches_include_patterns(entry.name, relative_path):
+                        continue
+                    # DirEntry caches the stat result on most platforms
+                    size = entry.stat().st_size
+                except OSError:
+                    continue
+
+                file_path = Path(entry.path)
+                if self._should_include_file(file_path, size):
+                    matches.append(file_path)
 
         return matches
 
+    def _matches_include_patterns(self, filename: str, relative_path: str) -> bool:
+        """
+        Check a file against all include patterns at once.
+
+        Patterns without a slash (e.g. ``*.py``) match the file name in any
+        directory. Patterns with a slash (e.g. ``**/*.md``) match the path
+        relative to the project root.
+        """
+        if self._include_names.matches(filename):
+            return True
+        return self._include_paths is not None and self._include_paths.match(relative_path) is not None
+
+    @staticmethod
+    def _compile_path_patterns(patterns: List[str]) -> Optional[Pattern[str]]:
+        """Compile path glob patterns, where ``**`` spans zero or more directories, into one regex."""
+        if not patterns:
+            return None
+        return re.compile('|'.join(f"(?:{_glob_to_regex(p)})" for p in patterns))
+
     def _should_exclude_dir(self, dir_path: Path) -> bool:
         """Check if a directory should be excluded."""
         # Skip if directory is the project root itself
@@ -87,43 +214,47 @@ class FileScanner:
         dir_name = dir_path.name
 
         # Check against exclude patterns
-        for exclude_pattern in self.config.exclude_dirs:
-            if fnmatch.fnmatch(dir_name, exclude_pattern):
+        if self._exclude_dirs.matches(dir_name):
+            if logger.isEnabledFor(logging.DEBUG):
                 logger.debug(f"Excluding directory: {dir_path}")
-                return True
+            return True
 
         return False
 
-    def _should_include_file(self, file_path: Path) -> bool:
+    def _should_include_file(self, file_path: Path, size: Optional[int] = None) -> bool:
         """Check if a file should be included in documentation."""
 
         # Check file size
         try:
-            if file_path.stat().st_size > self.config.max_file_size:
-                logger.debug(f"Excluding large file: {file_path}")
+            if size is None:
+                size = file_path.stat().st_size
+            if size > self.config.max_file_size:
+                logger.info(f"Excluding file larger than max_file_size ({size} bytes): {file_path}")
                 return False
         except OSError:
             return False
 
         # Check against exclude patterns
         filename = file_path.name
-        for exclude_pattern in self.config.exclude_files:
-            if fnmatch.fnmatch(filename, exclude_pattern):
-                # Special handling for __init__.py - include if it has content
-                if filename == "__init__.py":
-                    try:
-                        content = file_path.read_text().strip()
-                        # Include if it has more than just imports or docstrings
-                        if len(content) > 100 or "class" in content or "def " in content:
-                            return True
-                    except:
-                        pass
+        if self._exclude_files.matches(filename):
+            # Special handling for __init__.py - include if it has content
+            # (empty files are skipped without being read)
+            if filename == "__init__.py" and size > 0:
+                try:
+                    content = file_path.read_text().strip()
+                    # Include if it has more than just imports or docstrings
+                    if len(content) > 100 or "class" in content or "def " in content:
+                        return True
+                except:
+                    pass
+            if logger.isEnabledFor(logging.DEBUG):
                 logger.debug(f"Excluding file: {file_path}")
-                return False
+            return False
 
         # Skip test files if not including tests
         if not self.config.include_tests and self._is_test_file(file_path):
-            logger.debug(f"Excluding test file: {file_path}")
+            if logger.isEnabledFor(logging.DEBUG):
+                logger.debug(f"Excluding test file: {file_path}")
             return False
 
         return True
@@ -163,4 +294,44 @@ class FileScanner:
             file_name = parts[-1]
             current[file_name] = {"name": file_name, "type": "file", "path": str(file_path)}
 
-        return structure
\ No newline at end of file
+        return structure
+
+
+def _has_wildcards(pattern: str) -> bool:
+    """Check whether a pattern contains fnmatch wildcards."""
+    return any(char in pattern for char in '*?[')
+
+
+def _glob_to_regex(pattern: str) -> str:
+    """Translate a path glob, where ``**`` spans zero or more directories, into a regex."""
+    parts = pattern.strip('/').split('/')
+    regex = ''
+    for i, part in enumerate(parts):
+        is_last = i == len(parts) - 1
+        if part == '**':
+            regex += '.*' if is_last else '(?:.*/)?'
+            continue
+
+        # Translate a single path segment; wildcards never cross '/'
+        j = 0
+        while j < len(part):
+            char = part[j]
+            if char == '*':
+                regex += '[^/]*'
+            elif char == '?':
+                regex += '[^/]'
+            elif char == '[' and ']' in part[j + 1:]:
+                end = part.index(']', j + 1)
+                body = part[j + 1:end]
+                if body.startswith('!'):
+                    body = '^' + body[1:]
+                regex += f"[{body}]"
+                j = end
+            else:
+                regex += re.escape(char)
+            j += 1
+
+        if not is_last:
+            regex += '/'
+
+    return f"(?s:{regex})\\Z"
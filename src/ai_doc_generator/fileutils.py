@@ -0,0 +1,36 @@
+"""
+File system helpers shared by the documentation generator modules.
+"""
+
+import os
+import tempfile
+from pathlib import Path
+from typing import Union
+
+
+def atomic_write(path: Path, data: Union[str, bytes], encoding: str = "utf-8") -> None:
+    """
+    Write data to a file atomically.
+
+    The data is written to a temporary file in the same directory, which is
+    then renamed over the target, so readers never observe a partial file.
+
+    Args:
+        path: Destination file
+        data: Text or bytes to write
+        encoding: Encoding used when data is text
+    """
+    path.parent.mkdir(parents=True, exist_ok=True)
+    payload = data.encode(encoding) if isinstance(data, str) else data
+
+    fd, tmp_name = tempfile.mkstemp(dir=str(path.parent), prefix=f".{path.name}.", suffix=".tmp")
+    try:
+        with os.fdopen(fd, 'wb') as f:
+            f.write(payload)
+        os.replace(tmp_name, path)
+    except BaseException:
+        try:
+            os.unlink(tmp_name)
+        except OSError:
+            pass
+        raise
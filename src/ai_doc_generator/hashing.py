@@ -0,0 +1,75 @@
+"""
+Streaming file hashing for change detection.
+"""
+
+import mmap
+import hashlib
+from pathlib import Path
+from typing import Any, Callable, Dict, List
+
+try:
+    import xxhash
+except ImportError:  # pragma: no cover - optional dependency
+    xxhash = None
+
+# Files smaller than this are read in one call, larger ones are memory-mapped
+CHUNK_SIZE = 1024 * 1024
+
+
+def _hashers() -> Dict[str, Callable[[], Any]]:
+    """Map the available algorithm names to hasher factories."""
+    hashers: Dict[str, Callable[[], Any]] = {
+        "sha256": hashlib.sha256,
+        "blake2b": lambda: hashlib.blake2b(digest_size=32),
+    }
+    if xxhash is not None:
+        hashers["xxh3"] = xxhash.xxh3_128
+    return hashers
+
+
+_HASHERS = _hashers()
+
+
+def available_algorithms() -> List[str]:
+    """List the hash algorithms that can be used in this environment."""
+    return list(_HASHERS)
+
+
+def hash_file(path: Path, algorithm: str = "blake2b") -> str:
+    """
+    Hash a file's content without holding more than one chunk in memory.
+
+    Small files are read at once; larger files are memory-mapped, falling
+    back to chunked reads when the file cannot be mapped.
+
+    Args:
+        path: File to hash
+        algorithm: One of available_algorithms()
+
+    Returns:
+        Hex digest of the file content
+
+    Raises:
+        ValueError: If the algorithm is not available
+        OSError: If the file cannot be read
+    """
+    try:
+        hasher = _HASHERS[algorithm]()
+    except KeyError:
+        raise ValueError(f"Unknown hash algorithm: {algorithm}") from None
+
+    with open(path, 'rb') as f:
+        data = f.read(CHUNK_SIZE)
+        hasher.update(data)
+        if len(data) < CHUNK_SIZE:
+            return str(hasher.hexdigest())
+
+        try:
+            with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mapped, \
+                    memoryview(mapped) as view, view[CHUNK_SIZE:] as rest:
+                hasher.update(rest)
+        except (OSError, ValueError):
+            for chunk in iter(lambda: f.read(CHUNK_SIZE), b""):
+                hasher.update(chunk)
+
+    return str(hasher.hexdigest())
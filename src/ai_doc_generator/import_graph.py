@@ -0,0 +1,208 @@
+"""
+Project import graph for finding the files affected by API changes.
+"""
+
+import hashlib
+from pathlib import Path
+from typing import Any, Dict, Iterable, List, Mapping, Optional, Set, Tuple
+
+
+class ImportGraph:
+    """
+    Maps every documented file to the project files it imports.
+
+    Files are identified by their path relative to the project root. Besides
+    the edges, the graph keeps a fingerprint of each file's public API, so a
+    change to private code or function bodies does not affect its importers.
+    """
+
+    def __init__(self, project_root: Path, data: Optional[Dict[str, Any]] = None):
+        self.project_root = project_root
+        data = data or {}
+        self.imports: Dict[str, List[str]] = dict(data.get("imports", {}))
+        self.api_hashes: Dict[str, str] = dict(data.get("api", {}))
+        self._modules: Dict[str, str] = {}
+        self._package_dirs: Dict[Path, bool] = {}
+
+    def to_dict(self) -> Dict[str, Any]:
+        """Get the graph in a JSON serializable form."""
+        return {"imports": self.imports, "api": self.api_hashes}
+
+    def add_modules(self, relative_paths: Iterable[str]) -> None:
+        """Register project files so imports of them can be resolved."""
+        for relative_path in relative_paths:
+            for name in self.module_names(relative_path):
+                self._modules.setdefault(name, relative_path)
+
+    def module_names(self, relative_path: str) -> List[str]:
+        """
+        Get the dotted names under which a file can be imported.
+
+        A file is importable by its path from the project root and, inside a
+        package, by its path from the directory containing the outermost
+        package (e.g. ``src/pkg/mod.py`` is both ``src.pkg.mod`` and
+        ``pkg.mod``).
+        """
+        parts, _ = self._module_parts(relative_path)
+        full_parts, _ = self._module_parts(relative_path, from_root=True)
+        names = [".".join(parts)] if parts else []
+        if full_parts and full_parts != parts:
+            names.append(".".join(full_parts))
+        return names
+
+    def resolve_imports(self, relative_path: str, analysis: Dict[str, Any]) -> List[str]:
+        """
+        Find the project files imported by a file.
+
+        Args:
+            relative_path: Importing file
+            analysis: CodeAnalyzer output for the file
+
+        Returns:
+            Sorted list of imported project files
+        """
+        package, is_package = self._module_parts(relative_path)
+        if not is_package:
+            package = package[:-1]
+
+        targets: Set[str] = set()
+        for imp in analysis.get("imports", []):
+            module = imp.get("module") or ""
+            if imp.get("type") == "import":
+                candidates = [module]
+            else:
+                level = imp.get("level") or 0
+                if level:
+                    if level - 1 > len(package):
+                        continue
+                    base = package[:len(package) - (level - 1)]
+                    module = ".".join(base + ([module] if module else []))
+                name = imp.get("name")
+                # "from pkg import mod" may import a submodule
+                candidates = [f"{module}.{name}", module] if name and name != "*" else [module]
+
+            for candidate in candidates:
+                target = self._lookup(candidate)
+                if target:
+                    if target != relative_path:
+                        targets.add(target)
+                    break
+
+        return sorted(targets)
+
+    def update(self, relative_path: str, analysis: Dict[str, Any]) -> bool:
+        """
+        Record the imports and public API of a documented file.
+
+        Args:
+            relative_path: Documented file
+            analysis: CodeAnalyzer output for the file
+
+        Returns:
+            True if the file's public API differs from the one recorded before
+        """
+        self.imports[relative_path] = self.resolve_imports(relative_path, analysis)
+        previous = self.api_hashes.get(relative_path)
+        current = self.api_hash(analysis)
+        self.api_hashes[relative_path] = current
+        return previous is not None and previous != current
+
+    def dependents(self, relative_path: str) -> List[str]:
+        """Get the files that directly import a file."""
+        return sorted(f for f, targets in self.imports.items() if relative_path in targets)
+
+    def retain(self, relative_paths: Iterable[str]) -> None:
+        """Drop every file that is not in relative_paths from the graph."""
+        keep = set(relative_paths)
+        self.imports = {f: targets for f, targets in self.imports.items() if f in keep}
+        self.api_hashes = {f: value for f, value in self.api_hashes.items() if f in keep}
+
+    @staticmethod
+    def public_api(analysis: Dict[str, Any]) -> List[str]:
+        """
+        Summarize the public API of a file as signature lines.
+
+        Covers public functions, classes with their bases and public or
+        special methods, and constants. Docstrings and bodies are left out.
+        """
+        lines = []
+        for func in analysis.get("functions", []):
+            if not func["name"].startswith("_"):
+                lines.append(format_signature(func))
+
+        for cls in analysis.get("classes", []):
+            if cls["name"].startswith("_"):
+                continue
+            bases = f"({', '.join(cls.get('bases', []))})" if cls.get("bases") else ""
+            lines.append(f"class {cls['name']}{bases}")
+            for method in cls.get("methods", []):
+                name = method["name"]
+                if not name.startswith("_") or (name.startswith("__") and name.endswith("__")):
+                    lines.append(f"    {format_signature(method)}")
+
+        for const in analysis.get("constants", []):
+            lines.append(const["name"])
+
+        return lines
+
+    @classmethod
+    def api_hash(cls, analysis: Dict[str, Any]) -> str:
+        """Fingerprint the public API of a file."""
+        text = "\n".join(cls.public_api(analysis))
+        return hashlib.sha256(text.encode("utf-8")).hexdigest()[:16]
+
+    def _lookup(self, name: str) -> Optional[str]:
+        """Find the file for a dotted name, or for its longest known prefix."""
+        parts = name.split(".")
+        for end in range(len(parts), 0, -1):
+            target = self._modules.get(".".join(parts[:end]))
+            if target:
+                return target
+        return None
+
+    def _module_parts(self, relative_path: str, from_root: bool = False) -> Tuple[List[str], bool]:
+        """Get the dotted name parts of a file and whether it is a package."""
+        path = Path(relative_path)
+        parts = list(path.with_suffix("").parts)
+        is_package = bool(parts) and parts[-1] == "__init__"
+        if is_package:
+            parts = parts[:-1]
+        if from_root:
+            return parts, is_package
+
+        # Count the enclosing directories that are packages
+        directories = len(path.parent.parts)
+        depth = 0
+        directory = self.project_root / path.parent
+        while depth < directories and self._is_package(directory):
+            directory = directory.parent
+            depth += 1
+
+        if directories and not depth:
+            # Not inside a package: only importable by its full path
+            return parts, is_package
+        return parts[directories - depth:], is_package
+
+    def _is_package(self, directory: Path) -> bool:
+        """Check if a directory is a regular package."""
+        if directory not in self._package_dirs:
+            self._package_dirs[directory] = (directory / "__init__.py").exists()
+        return self._package_dirs[directory]
+
+
+def format_signature(func: Mapping[str, Any]) -> str:
+    """Format a function's signature from its analysis."""
+    args = []
+    for arg in func.get("args", []):
+        prefix = {"vararg": "*", "kwarg": "**"}.get(arg.get("type", ""), "")
+        text = f"{prefix}{arg['name']}"
+        if arg.get("annotation"):
+            text += f": {arg['annotation']}"
+        if arg.get("has_default"):
+            text += "=..."
+        args.append(text)
+
+    returns = f" -> {func['returns']}" if func.get("returns") else ""
+    keyword = "async def" if func.get("is_async") else "def"
+    decorators = "".join(f"{dec} " for dec in func.get("decorators", []))
+    return f"{decorators}{keyword} {func['name']}({', '.join(args)}){returns}"
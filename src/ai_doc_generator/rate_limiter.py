@@ -0,0 +1,219 @@
+"""
+Client-side rate limiting and retry handling for LLM requests.
+"""
+
+import time
+import random
+import logging
+import threading
+from email.utils import parsedate_to_datetime
+from typing import Any, Callable, Dict, Optional, Tuple, Type, TypeVar
+
+logger = logging.getLogger(__name__)
+
+T = TypeVar("T")
+
+# Status codes worth retrying: timeouts, conflicts, rate limits and server errors
+RETRYABLE_STATUS_CODES = {408, 409, 429, 500, 502, 503, 504}
+
+
+class TokenBucket:
+    """Thread-safe token bucket refilled continuously at a fixed rate."""
+
+    def __init__(self, capacity: float, refill_per_second: float,
+                 clock: Callable[[], float] = time.monotonic):
+        self.capacity = capacity
+        self.refill_per_second = refill_per_second
+        self._clock = clock
+        self._tokens = capacity
+        self._updated = clock()
+        self._lock = threading.Lock()
+
+    def reserve(self, amount: float) -> float:
+        """
+        Reserve tokens from the bucket.
+
+        The bucket may go into debt, so concurrent callers are served in the
+        order they reserved instead of racing for the next refill.
+
+        Args:
+            amount: Number of tokens to take (capped at the bucket capacity)
+
+        Returns:
+            Seconds the caller must wait before using the reservation
+        """
+        amount = min(amount, self.capacity)
+        with self._lock:
+            now = self._clock()
+            elapsed = now - self._updated
+            self._tokens = min(self.capacity, self._tokens + elapsed * self.refill_per_second)
+            self._updated = now
+            self._tokens -= amount
+
+            if self._tokens >= 0:
+                return 0.0
+            return -self._tokens / self.refill_per_second
+
+
+class RateLimiter:
+    """Shared request/token budgets with jittered exponential backoff."""
+
+    def __init__(self, requests_per_minute: int = 0, tokens_per_minute: int = 0,
+                 max_retries: int = 5, base_delay: float = 1.0, max_delay: float = 60.0,
+                 sleep: Callable[[float], None] = time.sleep,
+                 clock: Callable[[], float] = time.monotonic):
+        """
+        Initialize the rate limiter.
+
+        Args:
+            requests_per_minute: Request budget (0 disables the limit)
+            tokens_per_minute: Token budget (0 disables the limit)
+            max_retries: Retries for a request before giving up
+            base_delay: Initial backoff delay in seconds
+            max_delay: Upper bound of the backoff delay in seconds
+            sleep: Sleep function (injectable for tests)
+            clock: Monotonic clock (injectable for tests)
+        """
+        self.max_retries = max_retries
+        self.base_delay = base_delay
+        self.max_delay = max_delay
+        self._sleep = sleep
+        self._clock = clock
+
+        self._request_bucket = (
+            TokenBucket(requests_per_minute, requests_per_minute / 60.0, clock)
+            if requests_per_minute > 0 else None
+        )
+        self._token_bucket = (
+            TokenBucket(tokens_per_minute, tokens_per_minute / 60.0, clock)
+            if tokens_per_minute > 0 else None
+        )
+
+        # When the API pushes back, every caller waits until this time
+        self._paused_until = 0.0
+        self._lock = threading.Lock()
+
+        self.throttled_waits = 0
+        self.throttled_seconds = 0.0
+        self.retries = 0
+        self.failures = 0
+
+    def acquire(self, tokens: int = 0) -> None:
+        """
+        Block until a request using the given number of tokens may be sent.
+
+        Args:
+            tokens: Estimated tokens (prompt + completion) for the request
+        """
+        wait = 0.0
+        if self._request_bucket:
+            wait = max(wait, self._request_bucket.reserve(1))
+        if self._token_bucket and tokens:
+            wait = max(wait, self._token_bucket.reserve(tokens))
+
+        with self._lock:
+            wait = max(wait, self._paused_until - self._clock())
+            if wait > 0:
+                self.throttled_waits += 1
+                self.throttled_seconds += wait
+
+        if wait > 0:
+            logger.debug(f"Rate limit reached, waiting {wait:.2f}s")
+            self._sleep(wait)
+
+    def call(self, func: Callable[[], T], tokens: int = 0,
+             retryable: Tuple[Type[BaseException], ...] = ()) -> T:
+        """
+        Call a function within the rate limits, retrying transient failures.
+
+        Args:
+            func: Function performing the request
+            tokens: Estimated tokens for the request
+            retryable: Exception types that are always retried; other
+                exceptions are retried only if they carry a retryable status code
+
+        Returns:
+            The function's return value
+
+        Raises:
+            The last exception raised by func once retries are exhausted
+        """
+        attempt = 0
+        while True:
+            self.acquire(tokens)
+            try:
+                return func()
+            except Exception as e:
+                if attempt >= self.max_retries or not self._is_retryable(e, retryable):
+                    with self._lock:
+                        self.failures += 1
+                    raise
+
+                delay = self._retry_delay(e, attempt)
+                with self._lock:
+                    self.retries += 1
+                    if _status_code(e) == 429:
+                        # Rate limited: hold back every caller, not just this one
+                        self._paused_until = max(self._paused_until, self._clock() + delay)
+
+                logger.warning(f"Request failed ({type(e).__name__}), retrying in {delay:.2f}s "
+                               f"(attempt {attempt + 1}/{self.max_retries})")
+                self._sleep(delay)
+                attempt += 1
+
+    def stats(self) -> Dict[str, Any]:
+        """Get the throttling and retry counters."""
+        with self._lock:
+            return {
+                "throttled_waits": self.throttled_waits,
+                "throttled_seconds": round(self.throttled_seconds, 2),
+                "retries": self.retries,
+                "failures": self.failures
+            }
+
+    def _is_retryable(self, error: Exception,
+                      retryable: Tuple[Type[BaseException], ...]) -> bool:
+        """Check whether a failed request should be retried."""
+        if retryable and isinstance(error, retryable):
+            return True
+        return _status_code(error) in RETRYABLE_STATUS_CODES
+
+    def _retry_delay(self, error: Exception, attempt: int) -> float:
+        """Get the delay before the next attempt, honouring Retry-After headers."""
+        retry_after = _retry_after(error)
+        if retry_after is not None:
+            return retry_after
+
+        # Exponential backoff with full jitter
+        return random.uniform(0, min(self.max_delay, self.base_delay * (2 ** attempt)))
+
+
+def _status_code(error: Exception) -> Optional[int]:
+    """Get the HTTP status code carried by an API error, if any."""
+    status = getattr(error, "status_code", None)
+    return status if isinstance(status, int) else None
+
+
+def _retry_after(error: Exception) -> Optional[float]:
+    """Parse the Retry-After delay (in seconds) from an API error's response."""
+    response = getattr(error, "response", None)
+    headers = getattr(response, "headers", None)
+    if not headers:
+        return None
+
+    try:
+        retry_after_ms = headers.get("retry-after-ms")
+        if retry_after_ms is not None:
+            return max(0.0, float(retry_after_ms) / 1000.0)
+
+        retry_after = headers.get("retry-after")
+        if retry_after is None:
+            return None
+        try:
+            return max(0.0, float(retry_after))
+        except ValueError:
+            # HTTP-date form
+            retry_at = parsedate_to_datetime(retry_after)
+            return max(0.0, retry_at.timestamp() - time.time())
+    except (TypeError, ValueError, AttributeError):
+        return None
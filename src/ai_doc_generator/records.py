@@ -0,0 +1,182 @@
+"""
+Compact record types for code analysis results.
+"""
+
+import sys
+from collections.abc import Mapping
+from typing import Any, Dict, FrozenSet, Iterator, List, Tuple, Type
+
+# Returned for fields that are absent from the dictionary form (unset slots)
+_MISSING = object()
+
+
+def _intern(value: Any) -> Any:
+    """Intern a string, or the strings in a list, so repeated names share memory."""
+    if isinstance(value, str):
+        return sys.intern(value)
+    if isinstance(value, list):
+        return [sys.intern(item) if isinstance(item, str) else item for item in value]
+    return value
+
+
+def _to_builtin(value: Any) -> Any:
+    """Convert records, and lists containing them, to dictionaries."""
+    if isinstance(value, Record):
+        return value.to_dict()
+    if isinstance(value, list):
+        return [_to_builtin(item) for item in value]
+    return value
+
+
+class Record(Mapping):  # type: ignore[type-arg]
+    """
+    Base class of compact, read-only analysis records.
+
+    A record keeps its fields in ``__slots__`` instead of a per-instance
+    dictionary, and interns its strings. It still behaves like the
+    dictionary CodeAnalyzer produces: it supports item access, get(),
+    ``in``, iteration over the dictionary's keys and comparison with
+    dictionaries. Keys missing from the dictionary a record was created from
+    are missing from the record too. Records cannot be modified through item
+    assignment.
+    """
+
+    __slots__: Tuple[str, ...] = ()
+    # Fields holding lists of nested records
+    _nested: Dict[str, Type["Record"]] = {}
+    # Keys accepted from older dictionaries but not stored
+    _ignored: FrozenSet[str] = frozenset({"file_path"})
+
+    def __init__(self, **fields: Any):
+        for name, value in fields.items():
+            setattr(self, name, value)
+
+    @classmethod
+    def from_dict(cls, data: Mapping) -> "Record":  # type: ignore[type-arg]
+        """
+        Create a record from its dictionary form.
+
+        Args:
+            data: Dictionary produced by CodeAnalyzer
+
+        Returns:
+            The record
+
+        Raises:
+            ValueError: If the dictionary has keys the record cannot hold
+        """
+        if isinstance(data, cls):
+            return data
+
+        unknown = set(data) - set(cls.__slots__) - cls._ignored
+        if unknown:
+            raise ValueError(f"Unknown {cls.__name__} fields: {', '.join(sorted(unknown))}")
+
+        fields = {}
+        for name in cls.__slots__:
+            if name not in data:
+                continue
+            value = data[name]
+            nested = cls._nested.get(name)
+            if nested is not None and value is not None:
+                value = [nested.from_dict(item) for item in value]
+            fields[name] = _intern(value)
+        return cls(**fields)
+
+    def to_dict(self) -> Dict[str, Any]:
+        """Get the dictionary form of the record."""
+        return {name: _to_builtin(getattr(self, name)) for name in self}
+
+    def __getitem__(self, key: str) -> Any:
+        if key in self.__slots__:
+            value = getattr(self, key, _MISSING)
+            if value is not _MISSING:
+                return value
+        raise KeyError(key)
+
+    def __iter__(self) -> Iterator[str]:
+        for name in self.__slots__:
+            if getattr(self, name, _MISSING) is not _MISSING:
+                yield name
+
+    def __len__(self) -> int:
+        return sum(1 for _ in self)
+
+    def __repr__(self) -> str:
+        return f"{type(self).__name__}({self.to_dict()!r})"
+
+
+class ArgumentRecord(Record):
+    """A function argument."""
+
+    __slots__ = ("name", "type", "annotation", "has_default")
+
+
+class ImportRecord(Record):
+    """An ``import`` or ``from ... import`` of a single name."""
+
+    __slots__ = ("type", "module", "name", "alias", "line", "level")
+
+
+class FunctionRecord(Record):
+    """A function or method."""
+
+    __slots__ = (
+        "name", "line", "start_line", "end_line", "docstring", "decorators", "args",
+        "returns", "is_async", "is_generator", "raises", "is_method",
+        "is_classmethod", "is_staticmethod", "is_property",
+    )
+    _nested = {"args": ArgumentRecord}
+
+
+class ClassRecord(Record):
+    """A class with its methods."""
+
+    __slots__ = (
+        "name", "line", "start_line", "end_line", "docstring", "bases", "decorators",
+        "methods", "attributes", "is_exception", "metaclass",
+    )
+    _nested = {"methods": FunctionRecord}
+
+
+# Analysis keys holding lists of records, with their record types
+_RECORD_LISTS: List[Tuple[str, Type[Record]]] = [
+    ("imports", ImportRecord),
+    ("functions", FunctionRecord),
+    ("classes", ClassRecord),
+]
+
+
+def compact_analysis(analysis: Dict[str, Any]) -> Dict[str, Any]:
+    """
+    Convert the imports, functions and classes of an analysis to records.
+
+    Entries with keys a record cannot hold are kept as dictionaries.
+
+    Args:
+        analysis: CodeAnalyzer output
+
+    Returns:
+        A new analysis dictionary holding records
+    """
+    compact = dict(analysis)
+    for key, record_type in _RECORD_LISTS:
+        items = analysis.get(key)
+        if items:
+            compact[key] = [_compact(record_type, item) for item in items]
+    return compact
+
+
+def _compact(record_type: Type[Record], item: Any) -> Any:
+    """Convert a dictionary to a record, keeping it as is if that is not possible."""
+    try:
+        return record_type.from_dict(item)
+    except (ValueError, TypeError, AttributeError):
+        return item
+
+
+def json_default(value: Any) -> Any:
+    """``default`` hook letting json serialize records in their dictionary form."""
+    if isinstance(value, Record):
+        return value.to_dict()
+    raise TypeError(f"Object of type {type(value).__name__} is not JSON serializable")
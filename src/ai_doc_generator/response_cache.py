@@ -0,0 +1,176 @@
+"""
+Persistent caches keyed by content hashes: LLM responses by the full request.
+"""
+
+import os
+import json
+import hashlib
+import logging
+import threading
+from pathlib import Path
+from typing import Any, Dict, List, Optional, Tuple
+
+from .fileutils import atomic_write
+
+logger = logging.getLogger(__name__)
+
+
+class FileCache:
+    """Content-addressed on-disk cache of JSON documents with LRU eviction."""
+
+    def __init__(self, cache_dir: Path, max_size: int, enabled: bool = True):
+        """
+        Initialize the cache.
+
+        Args:
+            cache_dir: Directory holding the cache entries
+            max_size: Maximum total size of the cache in bytes
+            enabled: If False, every lookup misses and nothing is stored
+        """
+        self.cache_dir = cache_dir
+        self.max_size = max_size
+        self.enabled = enabled
+        self.hits = 0
+        self.misses = 0
+        self._lock = threading.Lock()
+
+    def _read(self, key: str, field: str) -> Optional[Any]:
+        """
+        Read a field of a cached document, counting the lookup as a hit or miss.
+
+        Args:
+            key: Cache key
+            field: Name of the field holding the cached value
+
+        Returns:
+            The cached value, or None on a miss
+        """
+        if not self.enabled:
+            return None
+
+        entry_path = self._entry_path(key)
+        try:
+            with open(entry_path, 'r', encoding='utf-8') as f:
+                value = json.load(f)[field]
+            # Refresh the modification time so eviction is least-recently-used
+            os.utime(entry_path, None)
+        except FileNotFoundError:
+            self._record(hit=False)
+            return None
+        except (OSError, ValueError, KeyError, TypeError) as e:
+            logger.debug(f"Ignoring unreadable cache entry {entry_path}: {e}")
+            self._record(hit=False)
+            return None
+
+        self._record(hit=True)
+        return value
+
+    def contains(self, key: str) -> bool:
+        """Check if a key is cached, without counting a lookup."""
+        return self.enabled and self._entry_path(key).is_file()
+
+    def _write(self, key: str, document: Dict[str, Any]) -> None:
+        """Store a document in the cache."""
+        if not self.enabled:
+            return
+
+        try:
+            atomic_write(self._entry_path(key), json.dumps(document))
+        except (OSError, TypeError, ValueError) as e:
+            logger.warning(f"Could not write cache entry: {e}")
+
+    def prune(self, max_size: Optional[int] = None) -> Tuple[int, int]:
+        """
+        Evict least-recently-used entries until the cache fits in max_size.
+
+        Args:
+            max_size: Size limit in bytes (defaults to the configured limit)
+
+        Returns:
+            Tuple of (entries removed, bytes freed)
+        """
+        limit = self.max_size if max_size is None else max_size
+        entries = self._list_entries()
+        total_size = sum(size for _, _, size in entries)
+
+        removed = 0
+        freed = 0
+        # Oldest entries first
+        for _, entry_path, size in sorted(entries):
+            if total_size <= limit:
+                break
+            try:
+                entry_path.unlink()
+            except OSError:
+                continue
+            total_size -= size
+            removed += 1
+            freed += size
+
+        if removed:
+            logger.info(f"Pruned {removed} entries from {self.cache_dir} ({freed} bytes)")
+        return removed, freed
+
+    def clear(self) -> int:
+        """Remove every cache entry and return the number removed."""
+        removed, _ = self.prune(max_size=0)
+        return removed
+
+    def _entry_path(self, key: str) -> Path:
+        """Get the file holding the entry for a key."""
+        return self.cache_dir / key[:2] / f"{key}.json"
+
+    def _list_entries(self) -> List[Tuple[float, Path, int]]:
+        """List cache entries as (mtime, path, size) tuples."""
+        entries: List[Tuple[float, Path, int]] = []
+        if not self.cache_dir.is_dir():
+            return entries
+
+        for shard in os.scandir(self.cache_dir):
+            if not shard.is_dir():
+                continue
+            for entry in os.scandir(shard.path):
+                if entry.name.endswith(".json") and entry.is_file():
+                    stat = entry.stat()
+                    entries.append((stat.st_mtime, Path(entry.path), stat.st_size))
+        return entries
+
+    def _record(self, hit: bool) -> None:
+        """Update the hit/miss counters."""
+        with self._lock:
+            if hit:
+                self.hits += 1
+            else:
+                self.misses += 1
+
+
+class ResponseCache(FileCache):
+    """Content-addressed on-disk cache of LLM responses with LRU eviction."""
+
+    @staticmethod
+    def make_key(model: str, system_prompt: str, prompt: str,
+                 temperature: float, max_tokens: int) -> str:
+        """Build the cache key for a chat completion request."""
+        payload = json.dumps(
+            [model, system_prompt, prompt, temperature, max_tokens],
+            ensure_ascii=False
+        )
+        return hashlib.sha256(payload.encode("utf-8")).hexdigest()
+
+    def get(self, key: str) -> Optional[str]:
+        """
+        Look up a cached response.
+
+        Args:
+            key: Cache key from make_key()
+
+        Returns:
+            The cached response, or None on a miss
+        """
+        response = self._read(key, "response")
+        return None if response is None else str(response)
+
+    def put(self, key: str, response: Optional[str]) -> None:
+        """Store a response in the cache; empty responses are sent again next time."""
+        if isinstance(response, str) and response:
+            self._write(key, {"response": response})
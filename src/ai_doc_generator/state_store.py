@@ -0,0 +1,270 @@
+"""
+Storage backends for the change tracker state.
+"""
+
+import json
+import sqlite3
+import logging
+from pathlib import Path
+from typing import Any, Dict, Iterable, Iterator, List, Mapping, MutableMapping, Tuple, Union
+
+from .fileutils import atomic_write
+
+logger = logging.getLogger(__name__)
+
+# State key holding the per-file entries
+FILES_KEY = "files"
+
+
+def _empty_state() -> Dict[str, Any]:
+    """Create the contents of a new state."""
+    return {FILES_KEY: {}, "last_run": None}
+
+
+class StateStore(MutableMapping[str, Any]):
+    """
+    Base class for change tracker state storage.
+
+    A store behaves like the state dictionary: FILES_KEY maps relative file
+    paths to their entries, and every other key holds a small JSON
+    serializable value. File entries must be assigned back to the store after
+    they are modified. Changes are persisted by commit().
+    """
+
+    path: Path
+
+    def commit(self) -> None:
+        """Persist all changes."""
+        raise NotImplementedError
+
+    def reset(self) -> None:
+        """Replace the state with an empty one."""
+        raise NotImplementedError
+
+    def close(self) -> None:
+        """Release any resources held by the store."""
+
+
+class JsonStateStore(StateStore):
+    """State stored as a single JSON file, loaded into memory at once."""
+
+    def __init__(self, path: Path):
+        self.path = path
+        self._data = self._load()
+
+    def _load(self) -> Dict[str, Any]:
+        """Load state from file."""
+        if self.path.exists():
+            try:
+                with open(self.path, 'r') as f:
+                    data = json.load(f)
+                if isinstance(data, dict):
+                    return data
+                logger.error(f"Error loading state: {self.path} does not contain an object")
+            except Exception as e:
+                logger.error(f"Error loading state: {e}")
+
+        return _empty_state()
+
+    def __getitem__(self, key: str) -> Any:
+        return self._data[key]
+
+    def __setitem__(self, key: str, value: Any) -> None:
+        self._data[key] = value
+
+    def __delitem__(self, key: str) -> None:
+        del self._data[key]
+
+    def __iter__(self) -> Iterator[str]:
+        return iter(self._data)
+
+    def __len__(self) -> int:
+        return len(self._data)
+
+    def commit(self) -> None:
+        """Write the whole state to the JSON file."""
+        atomic_write(self.path, json.dumps(self._data, indent=2))
+
+    def reset(self) -> None:
+        """Replace the state with an empty one."""
+        self._data = _empty_state()
+
+
+class SqliteFileMap(MutableMapping[str, Dict[str, Any]]):
+    """File entries stored in the ``files`` table of a SQLite state database."""
+
+    def __init__(self, connection: sqlite3.Connection):
+        self._conn = connection
+
+    def __getitem__(self, path: str) -> Dict[str, Any]:
+        row = self._conn.execute("SELECT data FROM files WHERE path = ?", (path,)).fetchone()
+        if row is None:
+            raise KeyError(path)
+        return dict(json.loads(row[0]))
+
+    def __setitem__(self, path: str, entry: Dict[str, Any]) -> None:
+        self._conn.execute(
+            "INSERT OR REPLACE INTO files (path, data) VALUES (?, ?)", (path, json.dumps(entry))
+        )
+
+    def __delitem__(self, path: str) -> None:
+        cursor = self._conn.execute("DELETE FROM files WHERE path = ?", (path,))
+        if cursor.rowcount == 0:
+            raise KeyError(path)
+
+    def __contains__(self, path: object) -> bool:
+        row = self._conn.execute("SELECT 1 FROM files WHERE path = ?", (path,)).fetchone()
+        return row is not None
+
+    def __iter__(self) -> Iterator[str]:
+        # Fetch all keys first so the caller may write while iterating
+        return iter([row[0] for row in self._conn.execute("SELECT path FROM files")])
+
+    def __len__(self) -> int:
+        return int(self._conn.execute("SELECT COUNT(*) FROM files").fetchone()[0])
+
+    def items(self) -> List[Tuple[str, Dict[str, Any]]]:  # type: ignore[override]
+        """Get all (path, entry) pairs with a single query."""
+        rows = self._conn.execute("SELECT path, data FROM files").fetchall()
+        return [(path, json.loads(data)) for path, data in rows]
+
+    def values(self) -> List[Dict[str, Any]]:  # type: ignore[override]
+        """Get all entries with a single query."""
+        return [json.loads(data) for (data,) in self._conn.execute("SELECT data FROM files")]
+
+    def update(self, entries: Union[Mapping[str, Dict[str, Any]],  # type: ignore[override]
+                                    Iterable[Tuple[str, Dict[str, Any]]]] = ()) -> None:
+        """Insert or replace many entries in one batch."""
+        pairs = entries.items() if isinstance(entries, Mapping) else entries
+        self._conn.executemany(
+            "INSERT OR REPLACE INTO files (path, data) VALUES (?, ?)",
+            ((path, json.dumps(entry)) for path, entry in pairs)
+        )
+
+    def clear(self) -> None:
+        """Remove all entries."""
+        self._conn.execute("DELETE FROM files")
+
+
+class SqliteStateStore(StateStore):
+    """
+    State stored in a SQLite database in WAL mode.
+
+    File entries are read with point lookups and written in batches, and
+    readers in other processes see the last committed state while a run is
+    writing.
+    """
+
+    def __init__(self, path: Path):
+        self.path = path
+        self._conn = self._connect()
+        self._files = SqliteFileMap(self._conn)
+
+    def _connect(self) -> sqlite3.Connection:
+        """Open the database, creating the schema if needed."""
+        try:
+            return self._open()
+        except sqlite3.DatabaseError as e:
+            logger.error(f"Error loading state: {e}")
+            self.path.unlink()
+            return self._open()
+
+    def _open(self) -> sqlite3.Connection:
+        """Open the database and create its tables."""
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        conn = sqlite3.connect(str(self.path), check_same_thread=False)
+        try:
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.execute("PRAGMA synchronous=NORMAL")
+            conn.execute("CREATE TABLE IF NOT EXISTS files (path TEXT PRIMARY KEY, data TEXT NOT NULL)")
+            conn.execute("CREATE TABLE IF NOT EXISTS meta (key TEXT PRIMARY KEY, value TEXT NOT NULL)")
+            conn.commit()
+        except sqlite3.DatabaseError:
+            conn.close()
+            raise
+        return conn
+
+    def __getitem__(self, key: str) -> Any:
+        if key == FILES_KEY:
+            return self._files
+        row = self._conn.execute("SELECT value FROM meta WHERE key = ?", (key,)).fetchone()
+        if row is None:
+            raise KeyError(key)
+        return json.loads(row[0])
+
+    def __setitem__(self, key: str, value: Any) -> None:
+        if key == FILES_KEY:
+            self._files.clear()
+            self._files.update(value)
+            return
+        self._conn.execute(
+            "INSERT OR REPLACE INTO meta (key, value) VALUES (?, ?)", (key, json.dumps(value))
+        )
+
+    def __delitem__(self, key: str) -> None:
+        if key == FILES_KEY:
+            self._files.clear()
+            return
+        cursor = self._conn.execute("DELETE FROM meta WHERE key = ?", (key,))
+        if cursor.rowcount == 0:
+            raise KeyError(key)
+
+    def __iter__(self) -> Iterator[str]:
+        keys = [row[0] for row in self._conn.execute("SELECT key FROM meta")]
+        return iter([FILES_KEY] + keys)
+
+    def __len__(self) -> int:
+        return 1 + int(self._conn.execute("SELECT COUNT(*) FROM meta").fetchone()[0])
+
+    def commit(self) -> None:
+        """Commit the pending transaction."""
+        self._conn.commit()
+
+    def reset(self) -> None:
+        """Replace the state with an empty one."""
+        self._conn.execute("DELETE FROM meta")
+        self._files.clear()
+        self["last_run"] = None
+
+    def close(self) -> None:
+        """Close the database connection."""
+        self._conn.close()
+
+
+def open_state_store(state_file: Path, backend: str = "json") -> StateStore:
+    """
+    Open the state store for a state file.
+
+    The SQLite backend uses the state file with a ``.db`` suffix. When that
+    database does not exist yet but a JSON state does, the JSON state is
+    imported once and renamed with a ``.migrated`` suffix.
+
+    Args:
+        state_file: Configured state file path
+        backend: "json" or "sqlite"
+
+    Returns:
+        The opened store
+
+    Raises:
+        ValueError: If the backend is unknown
+    """
+    if backend == "json":
+        return JsonStateStore(state_file)
+    if backend != "sqlite":
+        raise ValueError(f"Unknown state backend: {backend}")
+
+    db_path = state_file.with_suffix(".db")
+    json_path = state_file.with_suffix(".json")
+    migrate = not db_path.exists() and json_path.exists()
+
+    store = SqliteStateStore(db_path)
+    if migrate:
+        legacy = JsonStateStore(json_path)
+        for key, value in legacy.items():
+            store[key] = value
+        store.commit()
+        json_path.rename(json_path.with_name(json_path.name + ".migrated"))
+        logger.info(f"Migrated {len(store[FILES_KEY])} file entries from {json_path} to {db_path}")
+
+    return store
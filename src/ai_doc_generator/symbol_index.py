@@ -0,0 +1,251 @@
+"""
+Read-only index of the classes and functions of the documented files.
+"""
+
+import json
+import logging
+from pathlib import Path
+from typing import Any, Dict, Iterator, List, Mapping, NamedTuple, Optional, Set, Tuple
+
+from .fileutils import atomic_write
+
+logger = logging.getLogger(__name__)
+
+# File holding the index inside the output directory
+SYMBOL_INDEX_FILE = ".symbol_index.json"
+
+# Version of the index file format
+INDEX_VERSION = 3
+
+# Symbol kinds and the analysis fields listing them
+SYMBOL_KINDS = {"class": "classes", "function": "functions"}
+
+
+class Symbol(NamedTuple):
+    """
+    A class or top-level function of a documented file.
+
+    Holds what the API reference shows of the symbol, so its section is
+    rendered without reading the file's documentation entry.
+    """
+
+    name: str
+    kind: str
+    file_path: str
+    line: int
+    # Functions: name, parameters and return type; empty for classes
+    signature: str
+    docstring: str
+    # Classes: base classes, and methods as (name, parameters, first docstring line)
+    bases: Tuple[str, ...]
+    methods: Tuple[Tuple[str, str, Optional[str]], ...]
+    # Functions: decorators and raised exceptions
+    decorators: Tuple[str, ...]
+    raises: Tuple[str, ...]
+
+
+class FileSymbols(NamedTuple):
+    """The parts of a file's analysis that the project-wide pages use."""
+
+    symbols: Tuple[Symbol, ...]
+    dependencies: Tuple[str, ...]
+    decorators: Tuple[str, ...]
+    # Whether a class derives from an abstract or base class
+    abstract_bases: bool
+
+
+def index_file(file_path: str, analysis: Mapping[str, Any]) -> FileSymbols:
+    """
+    Index the symbols of one file.
+
+    Args:
+        file_path: Documented file
+        analysis: The file's code analysis
+
+    Returns:
+        The file's index entry
+    """
+    symbols = []
+    for kind, field in SYMBOL_KINDS.items():
+        for info in analysis.get(field, []):
+            # Partial analyses may describe a class only by its bases
+            if not info.get("name"):
+                continue
+            symbols.append(index_symbol(kind, info, file_path))
+
+    abstract_bases = any(
+        any("Abstract" in base or "Base" in base for base in cls.get("bases") or [])
+        for cls in analysis.get("classes", [])
+    )
+    return FileSymbols(tuple(symbols), tuple(analysis.get("dependencies", [])),
+                       tuple(analysis.get("decorators_used", [])), abstract_bases)
+
+
+def index_symbol(kind: str, info: Mapping[str, Any], file_path: str) -> Symbol:
+    """
+    Index a class or function from its analysis.
+
+    Args:
+        kind: "class" or "function"
+        info: The symbol's analysis
+        file_path: Documented file
+
+    Returns:
+        The symbol
+    """
+    if kind == "class":
+        methods = tuple(
+            (method["name"],
+             ", ".join(arg["name"] for arg in method.get("args") or [] if arg["name"] != "self"),
+             method["docstring"].split('\n')[0] if method.get("docstring") else None)
+            for method in info.get("methods") or []
+        )
+        return Symbol(info["name"], kind, file_path, info.get("line", 0), "", info.get("docstring") or "",
+                      tuple(info.get("bases") or []), methods, (), ())
+
+    args = []
+    for arg in info.get("args") or []:
+        args.append(f"{arg['name']}: {arg['annotation']}" if arg.get("annotation") else arg["name"])
+    returns = f" -> {info['returns']}" if info.get("returns") else ""
+    return Symbol(info["name"], kind, file_path, info.get("line", 0),
+                  f"{info['name']}({', '.join(args)}){returns}", info.get("docstring") or "", (), (),
+                  tuple(info.get("decorators") or []), tuple(info.get("raises") or []))
+
+
+class SymbolIndex:
+    """
+    Index of the classes and functions of every documented file.
+
+    Entries are kept per file, in documentation order, as immutable tuples
+    holding each symbol's location and what the API reference shows of it. refresh()
+    only re-indexes the files it is told have changed, so the project-wide
+    pages are sorted, counted and summarized without walking every analysis
+    again. The index is saved next to the documentation so later runs
+    start from it.
+    """
+
+    def __init__(self, files: Optional[Dict[str, FileSymbols]] = None):
+        self._files: Dict[str, FileSymbols] = files or {}
+        self._sorted: Dict[str, List[Symbol]] = {}
+
+    def __len__(self) -> int:
+        return len(self._files)
+
+    def __contains__(self, file_path: object) -> bool:
+        return file_path in self._files
+
+    def refresh(self, documentation: Mapping[str, Any], changed: Optional[Set[str]]) -> bool:
+        """
+        Update the index to match the documentation.
+
+        Files missing from the index are indexed, and files no longer
+        documented are dropped.
+
+        Args:
+            documentation: Documentation entries by file path
+            changed: Files whose analysis changed since they were indexed,
+                or None to index every file again
+
+        Returns:
+            True if the index changed
+        """
+        files: Dict[str, FileSymbols] = {}
+        indexed = 0
+        for file_path in documentation:
+            entry = None if changed is None or file_path in changed else self._files.get(file_path)
+            if entry is None:
+                entry = index_file(file_path, documentation[file_path].get("analysis", {}))
+                indexed += 1
+            files[file_path] = entry
+
+        removed = len(self._files.keys() - files.keys())
+        # Also detects a reordered documentation, which changes the API reference
+        if not indexed and not removed and list(files) == list(self._files):
+            return False
+
+        self._files = files
+        self._sorted = {}
+        logger.debug(f"Indexed {indexed} files, removed {removed} from the symbol index")
+        return True
+
+    def files(self) -> Iterator[Tuple[str, FileSymbols]]:
+        """Iterate over the (file path, entry) pairs in documentation order."""
+        return iter(self._files.items())
+
+    def symbols(self, kind: str) -> List[Symbol]:
+        """
+        Get all symbols of a kind, sorted by name.
+
+        Symbols with the same name are in documentation order.
+
+        Args:
+            kind: "class" or "function"
+        """
+        if kind not in self._sorted:
+            symbols = [symbol for entry in self._files.values() for symbol in entry.symbols
+                       if symbol.kind == kind]
+            symbols.sort(key=lambda symbol: symbol.name)
+            self._sorted[kind] = symbols
+        return self._sorted[kind]
+
+    def count(self, kind: str) -> int:
+        """Count the symbols of a kind."""
+        return sum(1 for entry in self._files.values() for symbol in entry.symbols if symbol.kind == kind)
+
+    def dependencies(self) -> Set[str]:
+        """Get the dependencies of all files."""
+        return {dep for entry in self._files.values() for dep in entry.dependencies}
+
+    def save(self, path: Path) -> None:
+        """Write the index to a file."""
+        files = {
+            file_path: {
+                "symbols": [[symbol.name, symbol.kind, symbol.line, symbol.signature, symbol.docstring,
+                             symbol.bases, symbol.methods, symbol.decorators, symbol.raises]
+                            for symbol in entry.symbols],
+                "dependencies": list(entry.dependencies),
+                "decorators": list(entry.decorators),
+                "abstract_bases": entry.abstract_bases,
+            }
+            for file_path, entry in self._files.items()
+        }
+        atomic_write(path, json.dumps({"version": INDEX_VERSION, "files": files}, separators=(",", ":")))
+
+    @classmethod
+    def load(cls, path: Path) -> Optional["SymbolIndex"]:
+        """
+        Read an index written by save().
+
+        Returns:
+            The index, or None if the file is missing, unreadable or was
+            written by another version
+        """
+        try:
+            with open(path, 'r', encoding='utf-8') as f:
+                data = json.load(f)
+            if data.get("version") != INDEX_VERSION:
+                logger.debug(f"Ignoring symbol index {path} of version {data.get('version')}")
+                return None
+            files = {
+                file_path: FileSymbols(
+                    tuple(_load_symbol(fields, file_path) for fields in entry["symbols"]),
+                    tuple(entry["dependencies"]),
+                    tuple(entry["decorators"]),
+                    bool(entry["abstract_bases"])
+                )
+                for file_path, entry in data["files"].items()
+            }
+        except FileNotFoundError:
+            return None
+        except (OSError, ValueError, KeyError, TypeError, AttributeError) as e:
+            logger.debug(f"Ignoring unreadable symbol index {path}: {e}")
+            return None
+        return cls(files)
+
+
+def _load_symbol(fields: List[Any], file_path: str) -> Symbol:
+    """Rebuild a symbol saved by SymbolIndex.save()."""
+    name, kind, line, signature, docstring, bases, methods, decorators, raises = fields
+    return Symbol(name, kind, file_path, line, signature, docstring, tuple(bases),
+                  tuple((method, params, summary) for method, params, summary in methods),
+                  tuple(decorators), tuple(raises))
@@ -0,0 +1,267 @@
+"""
+Symbol-level change tracking for incremental documentation updates.
+"""
+
+import re
+import hashlib
+from typing import Dict, List, Optional, Tuple, Any
+
+# Key for everything in a file that is not part of a class or function
+MODULE_SYMBOL = "<module>"
+
+# Above this fraction of changed symbols the whole file is re-documented
+MAX_SYMBOL_UPDATE_RATIO = 0.5
+
+_HEADING_RE = re.compile(r"^(#{1,6})\s+(.*)$")
+
+
+class SymbolTracker:
+    """Fingerprints the classes, methods and functions of a file."""
+
+    def fingerprint(self, content: str, analysis: Dict[str, Any]) -> Dict[str, str]:
+        """
+        Calculate a fingerprint for every symbol in a file.
+
+        Classes are fingerprinted without their method bodies, so changing a
+        method only changes the method's own fingerprint. Lines outside every
+        symbol (imports, constants, module docstring) are fingerprinted
+        together under MODULE_SYMBOL.
+
+        Args:
+            content: File content
+            analysis: CodeAnalyzer output for the content
+
+        Returns:
+            Dictionary mapping symbol names to fingerprints
+        """
+        lines = content.splitlines()
+        covered = [False] * len(lines)
+        fingerprints: Dict[str, str] = {}
+
+        for name, kind, info, start, end in self._iter_symbols(analysis):
+            if kind == "class":
+                source = self._class_header_lines(lines, info)
+            else:
+                source = lines[start - 1:end]
+            extra = "|".join(info.get("decorators", []))
+            fingerprints[name] = self._hash("\n".join(source) + extra)
+
+            for i in range(start - 1, min(end, len(lines))):
+                covered[i] = True
+
+        module_lines = [line for line, is_covered in zip(lines, covered) if not is_covered]
+        fingerprints[MODULE_SYMBOL] = self._hash("\n".join(module_lines))
+
+        return fingerprints
+
+    def diff(self, previous: Dict[str, str], current: Dict[str, str]) -> Tuple[List[str], List[str]]:
+        """
+        Compare two sets of fingerprints.
+
+        Args:
+            previous: Fingerprints stored for the documented version
+            current: Fingerprints of the current version
+
+        Returns:
+            Tuple of (changed or added symbols, removed symbols)
+        """
+        changed = [name for name, value in current.items() if previous.get(name) != value]
+        removed = [name for name in previous if name not in current]
+        return changed, removed
+
+    def can_update_symbols(self, changed: List[str], removed: List[str],
+                           fingerprints: Dict[str, str]) -> bool:
+        """Check whether a change is small enough to be applied symbol by symbol."""
+        if MODULE_SYMBOL in changed:
+            return False
+
+        total = max(len(fingerprints) - 1, 1)
+        return (len(changed) + len(removed)) / total <= MAX_SYMBOL_UPDATE_RATIO
+
+    def get_symbol_source(self, content: str, analysis: Dict[str, Any], name: str) -> Optional[str]:
+        """
+        Get the source code for a symbol.
+
+        For a class, method bodies are replaced by their signature line so the
+        source covers only the class itself.
+
+        Args:
+            content: File content
+            analysis: CodeAnalyzer output for the content
+            name: Symbol name as used in the fingerprints
+
+        Returns:
+            The symbol's source, or None if the symbol does not exist
+        """
+        lines = content.splitlines()
+        for symbol_name, kind, info, start, end in self._iter_symbols(analysis):
+            if symbol_name != name:
+                continue
+            if kind == "class":
+                return "\n".join(self._class_header_lines(lines, info, keep_signatures=True))
+            return "\n".join(lines[start - 1:end])
+        return None
+
+    def symbol_kind(self, analysis: Dict[str, Any], name: str) -> Optional[str]:
+        """
+        Get the kind of a symbol.
+
+        Args:
+            analysis: CodeAnalyzer output for the file
+            name: Symbol name as used in the fingerprints
+
+        Returns:
+            "class", "method" or "function", or None if the symbol does not exist
+        """
+        for symbol_name, kind, _, _, _ in self._iter_symbols(analysis):
+            if symbol_name == name:
+                return kind
+        return None
+
+    def splice(self, documentation: str, name: str, section: Optional[str],
+               keep_subsections: bool = False) -> str:
+        """
+        Replace, add or remove the documentation section for a symbol.
+
+        Sections written by this method are wrapped in HTML comment markers so
+        later updates can find them exactly. For documentation generated for a
+        whole file, the section is located by the heading naming the symbol
+        (methods are looked up inside their class's section).
+
+        Args:
+            documentation: Existing Markdown documentation of the file
+            name: Symbol name as used in the fingerprints
+            section: New section body, or None to remove the symbol's section
+            keep_subsections: Only replace the text before the first sub-heading
+                of a section found by its heading, keeping the nested sections
+                (a class's own text, without the sections of its methods)
+
+        Returns:
+            The updated documentation
+        """
+        lines = documentation.splitlines()
+        bounds = (self._find_marked_section(lines, name)
+                  or self._find_heading_section(lines, name, own_text_only=keep_subsections))
+
+        if bounds:
+            start, end, heading = bounds
+        else:
+            start = end = len(lines)
+            level = 4 if "." in name else 3
+            heading = f"{'#' * level} `{name.split('.')[-1]}`"
+
+        if section is None:
+            replacement: List[str] = []
+        else:
+            replacement = [
+                f"<!-- symbol: {name} -->",
+                heading,
+                "",
+                section.strip(),
+                f"<!-- /symbol: {name} -->",
+            ]
+            if start == len(lines) and lines and lines[-1].strip():
+                replacement.insert(0, "")
+
+        return "\n".join(lines[:start] + replacement + lines[end:])
+
+    def _iter_symbols(self, analysis: Dict[str, Any]) -> List[Tuple[str, str, Dict[str, Any], int, int]]:
+        """List (name, kind, info, start line, end line) for every symbol, with unique names."""
+        symbols: List[Tuple[str, str, Dict[str, Any], int, int]] = []
+        seen: Dict[str, int] = {}
+
+        def unique(name: str) -> str:
+            seen[name] = seen.get(name, 0) + 1
+            return name if seen[name] == 1 else f"{name}#{seen[name]}"
+
+        for func in analysis.get("functions", []):
+            if func.get("end_line"):
+                start = func.get("start_line") or func["line"]
+                symbols.append((unique(func["name"]), "function", func, start, func["end_line"]))
+
+        for cls in analysis.get("classes", []):
+            if not cls.get("end_line"):
+                continue
+            class_name = unique(cls["name"])
+            start = cls.get("start_line") or cls["line"]
+            symbols.append((class_name, "class", cls, start, cls["end_line"]))
+            for method in cls.get("methods", []):
+                if method.get("end_line"):
+                    method_start = method.get("start_line") or method["line"]
+                    symbols.append((unique(f"{class_name}.{method['name']}"), "method", method,
+                                    method_start, method["end_line"]))
+
+        return symbols
+
+    def _class_header_lines(self, lines: List[str], cls: Dict[str, Any],
+                            keep_signatures: bool = False) -> List[str]:
+        """Get the lines of a class excluding the bodies of its methods."""
+        start = cls.get("start_line") or cls["line"]
+        method_ranges = [
+            (method.get("start_line") or method["line"], method["end_line"], method["line"])
+            for method in cls.get("methods", []) if method.get("end_line")
+        ]
+
+        result: List[str] = []
+        for line_no in range(start, cls["end_line"] + 1):
+            in_method = next((r for r in method_ranges if r[0] <= line_no <= r[1]), None)
+            if in_method is None:
+                result.append(lines[line_no - 1] if line_no <= len(lines) else "")
+            elif keep_signatures and line_no == in_method[2]:
+                result.append(lines[line_no - 1] + " ...")
+        return result
+
+    def _find_marked_section(self, lines: List[str], name: str) -> Optional[Tuple[int, int, str]]:
+        """Find a section wrapped in symbol markers."""
+        begin_marker = f"<!-- symbol: {name} -->"
+        end_marker = f"<!-- /symbol: {name} -->"
+        try:
+            start = lines.index(begin_marker)
+            end = lines.index(end_marker, start) + 1
+        except ValueError:
+            return None
+
+        heading = lines[start + 1] if start + 1 < end - 1 else f"### `{name}`"
+        return start, end, heading
+
+    def _find_heading_section(self, lines: List[str], name: str, start: int = 0,
+                              stop: Optional[int] = None,
+                              own_text_only: bool = False) -> Optional[Tuple[int, int, str]]:
+        """
+        Find the section under the heading that names a symbol.
+
+        The section ends at the next heading of the same or a higher level,
+        or at the next heading of any level if own_text_only is set.
+        """
+        stop = len(lines) if stop is None else stop
+
+        if "." in name:
+            # Look for the method inside its class's section
+            class_name, _, method_name = name.partition(".")
+            class_bounds = self._find_heading_section(lines, class_name, start, stop)
+            if not class_bounds:
+                return None
+            return self._find_heading_section(lines, method_name, class_bounds[0] + 1, class_bounds[1])
+
+        short_name = name.split("#")[0]
+        pattern = re.compile(rf"(?<!\w){re.escape(short_name)}(?![\w])")
+        for i in range(start, stop):
+            match = _HEADING_RE.match(lines[i])
+            if not match or not pattern.search(match.group(2)):
+                continue
+
+            level = len(match.group(1))
+            end = i + 1
+            while end < stop:
+                next_heading = _HEADING_RE.match(lines[end])
+                if next_heading and (own_text_only or len(next_heading.group(1)) <= level):
+                    break
+                end += 1
+            return i, end, lines[i]
+
+        return None
+
+    @staticmethod
+    def _hash(text: str) -> str:
+        """Hash a piece of source text."""
+        return hashlib.sha256(text.encode("utf-8")).hexdigest()[:16]
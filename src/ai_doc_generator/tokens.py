@@ -0,0 +1,180 @@
+"""
+Token counting and per-run token accounting for LLM prompts.
+"""
+
+import re
+import math
+import logging
+import threading
+from typing import Any, Dict, Optional
+
+try:
+    import tiktoken
+except ImportError:  # pragma: no cover - optional dependency
+    tiktoken = None
+
+logger = logging.getLogger(__name__)
+
+# Context window sizes in tokens, matched by the longest model name prefix
+MODEL_CONTEXT_WINDOWS = {
+    "gpt-4.1": 1047576,
+    "gpt-4o": 128000,
+    "gpt-4-turbo": 128000,
+    "gpt-4-0125": 128000,
+    "gpt-4-1106": 128000,
+    "gpt-4-32k": 32768,
+    "gpt-4": 8192,
+    "gpt-3.5-turbo": 16385,
+    "o1": 200000,
+    "o3": 200000,
+    "o4-mini": 200000,
+}
+
+# Context window assumed for models missing from MODEL_CONTEXT_WINDOWS
+DEFAULT_CONTEXT_WINDOW = 8192
+
+# Characters per token of a word piece for the estimator; BPE vocabularies
+# encode common words in one token and split long identifiers every ~4 chars
+CHARS_PER_TOKEN = 4
+
+_PIECE_RE = re.compile(r"\w+|[^\w\s]+|\n")
+
+
+def context_window(model: str) -> int:
+    """Get the context window of a model in tokens."""
+    matches = [prefix for prefix in MODEL_CONTEXT_WINDOWS if model.startswith(prefix)]
+    if not matches:
+        return DEFAULT_CONTEXT_WINDOW
+    return MODEL_CONTEXT_WINDOWS[max(matches, key=len)]
+
+
+def estimate_tokens(text: str) -> int:
+    """
+    Estimate the number of tokens in a text without a tokenizer.
+
+    Words count one token per CHARS_PER_TOKEN characters, and each run of
+    punctuation and each line break counts as one token, which is closer to
+    BPE tokenizers for source code than a plain character count.
+    """
+    tokens = 0
+    for piece in _PIECE_RE.findall(text):
+        tokens += math.ceil(len(piece) / CHARS_PER_TOKEN) if piece[0].isalnum() or piece[0] == "_" else 1
+    return tokens
+
+
+def _load_encoding(model: str) -> Any:
+    """Load the tiktoken encoding for a model, or None if it is unavailable."""
+    if tiktoken is None:
+        return None
+    try:
+        try:
+            return tiktoken.encoding_for_model(model)
+        except KeyError:
+            return tiktoken.get_encoding("cl100k_base")
+    except Exception as e:
+        # Encodings are downloaded on first use, which may fail offline
+        logger.debug(f"Could not load a tokenizer for {model}, estimating tokens: {e}")
+        return None
+
+
+class TokenCounter:
+    """
+    Counts tokens for a model.
+
+    Uses the model's BPE tokenizer when tiktoken is installed and falls back
+    to estimate_tokens() otherwise.
+    """
+
+    def __init__(self, model: str):
+        self.model = model
+        self.context_window = context_window(model)
+        self._encoding = _load_encoding(model)
+
+    @property
+    def exact(self) -> bool:
+        """Whether counts come from the model's tokenizer."""
+        return self._encoding is not None
+
+    def count(self, text: str) -> int:
+        """Count the tokens in a text."""
+        if self._encoding is not None:
+            return len(self._encoding.encode(text, disallowed_special=()))
+        return estimate_tokens(text)
+
+    def truncate(self, text: str, max_tokens: int) -> str:
+        """
+        Cut a text to at most max_tokens tokens.
+
+        Args:
+            text: Text to cut
+            max_tokens: Token budget
+
+        Returns:
+            The longest prefix found that fits the budget
+        """
+        if self._encoding is not None:
+            tokens = self._encoding.encode(text, disallowed_special=())
+            if len(tokens) <= max_tokens:
+                return text
+            return str(self._encoding.decode(tokens[:max_tokens]))
+
+        count = estimate_tokens(text)
+        if count <= max_tokens:
+            return text
+        end = len(text) * max_tokens // count
+        while end > 0 and estimate_tokens(text[:end]) > max_tokens:
+            end = end * 9 // 10
+        return text[:end]
+
+
+class TokenUsage:
+    """Thread-safe counters of estimated and actual token usage for a run."""
+
+    def __init__(self) -> None:
+        self.requests = 0
+        self.estimated_prompt_tokens = 0
+        self.reported_requests = 0
+        self.reported_estimate = 0
+        self.prompt_tokens = 0
+        self.completion_tokens = 0
+        self._lock = threading.Lock()
+
+    def record(self, estimated_prompt_tokens: int, usage: Any = None) -> None:
+        """
+        Record an API request.
+
+        Args:
+            estimated_prompt_tokens: Prompt tokens counted before sending
+            usage: The ``usage`` of the API response, if any
+        """
+        prompt_tokens = _token_count(getattr(usage, "prompt_tokens", None))
+        completion_tokens = _token_count(getattr(usage, "completion_tokens", None))
+
+        with self._lock:
+            self.requests += 1
+            self.estimated_prompt_tokens += estimated_prompt_tokens
+            if prompt_tokens is not None:
+                self.reported_requests += 1
+                self.reported_estimate += estimated_prompt_tokens
+                self.prompt_tokens += prompt_tokens
+                self.completion_tokens += completion_tokens or 0
+
+    def stats(self) -> Dict[str, Any]:
+        """Get the token counters."""
+        with self._lock:
+            # Error of the estimates for requests whose usage was reported
+            error = None
+            if self.prompt_tokens:
+                error = round((self.reported_estimate - self.prompt_tokens) / self.prompt_tokens * 100, 1)
+            return {
+                "requests": self.requests,
+                "estimated_prompt_tokens": self.estimated_prompt_tokens,
+                "prompt_tokens": self.prompt_tokens,
+                "completion_tokens": self.completion_tokens,
+                "estimate_error_percent": error,
+            }
+
+
+def _token_count(value: Any) -> Optional[int]:
+    """Get a token count reported by the API, ignoring missing values."""
+    return value if isinstance(value, int) and not isinstance(value, bool) else None
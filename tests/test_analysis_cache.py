@@ -0,0 +1,66 @@
+"""
+Tests for the analysis cache module.
+"""
+
+import tempfile
+from pathlib import Path
+from unittest.mock import patch
+
+import pytest
+
+from ai_doc_generator.analysis_cache import AnalysisCache
+
+
+class TestAnalysisCache:
+    """Test cases for the AnalysisCache class."""
+
+    @pytest.fixture
+    def cache_dir(self):
+        """Create a temporary cache directory."""
+        with tempfile.TemporaryDirectory() as tmpdir:
+            yield Path(tmpdir) / "analysis"
+
+    @pytest.fixture
+    def cache(self, cache_dir):
+        """Create an AnalysisCache instance."""
+        return AnalysisCache(cache_dir, max_size=1024 * 1024)
+
+    def test_make_key_depends_on_content_and_versions(self):
+        """Test that content, analyzer version and Python version contribute to the key."""
+        base = AnalysisCache.make_key("x = 1\n", "1")
+
+        assert base == AnalysisCache.make_key("x = 1\n", "1")
+        assert base != AnalysisCache.make_key("x = 2\n", "1")
+        assert base != AnalysisCache.make_key("x = 1\n", "2")
+        with patch("ai_doc_generator.analysis_cache.sys.version_info", (2, 7, 18)):
+            assert base != AnalysisCache.make_key("x = 1\n", "1")
+
+    def test_put_and_get(self, cache):
+        """Test storing and retrieving an analysis."""
+        key = AnalysisCache.make_key("x = 1\n", "1")
+        analysis = {"classes": [], "constants": [{"name": "x"}], "loc": 1}
+
+        assert cache.get(key) is None
+        cache.put(key, analysis)
+
+        assert cache.get(key) == analysis
+        assert cache.hits == 1
+        assert cache.misses == 1
+
+    def test_unreadable_entry_is_a_miss(self, cache):
+        """Test that a corrupted entry is ignored."""
+        key = AnalysisCache.make_key("x = 1\n", "1")
+        entry_path = cache._entry_path(key)
+        entry_path.parent.mkdir(parents=True)
+        entry_path.write_text("{not json")
+
+        assert cache.get(key) is None
+        assert cache.misses == 1
+
+    def test_disabled_cache(self, cache_dir):
+        """Test that a disabled cache never stores or returns entries."""
+        cache = AnalysisCache(cache_dir, max_size=1024 * 1024, enabled=False)
+        cache.put("ab" * 32, {"loc": 1})
+
+        assert cache.get("ab" * 32) is None
+        assert not cache_dir.exists()
@@ -0,0 +1,155 @@
+"""
+Tests for the batch submission module.
+"""
+
+import json
+from unittest.mock import Mock
+
+import pytest
+
+from ai_doc_generator.batch import (
+    BATCH_ENDPOINT, LocalBatchBackend, OpenAIBatchBackend, create_batch_backend,
+    read_batch_output, write_batch_file
+)
+
+
+def make_body(prompt):
+    """Build a chat completion request body."""
+    return {"model": "gpt-4o", "messages": [{"role": "user", "content": prompt}], "max_tokens": 100}
+
+
+class TestBatchFiles:
+    """Test cases for writing and reading batch files."""
+
+    def test_write_batch_file(self, tmp_path):
+        """Test that every request becomes one JSONL line."""
+        path = tmp_path / "batches" / "input.jsonl"
+        write_batch_file(path, {"a": make_body("one"), "b": make_body("two")})
+
+        lines = [json.loads(line) for line in path.read_text().splitlines()]
+        assert [line["custom_id"] for line in lines] == ["a", "b"]
+        assert lines[0]["method"] == "POST"
+        assert lines[0]["url"] == BATCH_ENDPOINT
+        assert lines[1]["body"] == make_body("two")
+
+    def test_read_batch_output(self):
+        """Test parsing completions, usage and failures."""
+        text = "\n".join(json.dumps(entry) for entry in [
+            {"custom_id": "ok", "error": None, "response": {"status_code": 200, "body": {
+                "choices": [{"message": {"content": "Docs"}}],
+                "usage": {"prompt_tokens": 10, "completion_tokens": 5}}}},
+            {"custom_id": "rejected", "error": None, "response": {"status_code": 400, "body": {
+                "error": {"message": "Bad request"}}}},
+            {"custom_id": "expired", "response": None, "error": {"message": "Batch expired"}},
+        ]) + "\n\n"
+
+        results = read_batch_output(text)
+
+        assert results["ok"].content == "Docs"
+        assert results["ok"].usage == {"prompt_tokens": 10, "completion_tokens": 5}
+        assert results["rejected"].content is None
+        assert results["rejected"].error == "Bad request"
+        assert results["expired"].error == "Batch expired"
+
+
+class TestLocalBatchBackend:
+    """Test cases for the file-based batch stand-in."""
+
+    @pytest.fixture
+    def batch_file(self, tmp_path):
+        """Write a batch input file."""
+        path = tmp_path / "input.jsonl"
+        write_batch_file(path, {"a": make_body("one"), "b": make_body("fail")})
+        return path
+
+    def test_batch_completed_on_submission(self, tmp_path, batch_file):
+        """Test that a respond function completes the batch immediately."""
+        def respond(body):
+            prompt = body["messages"][0]["content"]
+            if prompt == "fail":
+                raise RuntimeError("Invalid prompt")
+            return f"Docs for {prompt}"
+
+        backend = LocalBatchBackend(tmp_path / "local", respond=respond)
+        batch_id = backend.submit(batch_file)
+
+        assert backend.status(batch_id) == "completed"
+        results = backend.results(batch_id)
+        assert results["a"].content == "Docs for one"
+        assert results["b"].content is None
+        assert results["b"].error == "Invalid prompt"
+
+    def test_batch_completed_by_another_process(self, tmp_path, batch_file):
+        """Test that a batch stays in progress until its output file is written."""
+        backend = LocalBatchBackend(tmp_path / "local")
+        batch_id = backend.submit(batch_file)
+        assert backend.status(batch_id) == "in_progress"
+
+        LocalBatchBackend(tmp_path / "local").complete(batch_id, lambda body: "Docs")
+
+        assert backend.status(batch_id) == "completed"
+        assert {key: result.content for key, result in backend.results(batch_id).items()} == {
+            "a": "Docs", "b": "Docs"}
+
+    def test_cleanup_removes_batch_files(self, tmp_path, batch_file):
+        """Test that cleaning up a collected batch deletes its input and output files."""
+        backend = LocalBatchBackend(tmp_path / "local", respond=lambda body: "Docs")
+        batch_id = backend.submit(batch_file)
+
+        backend.cleanup(batch_id)
+
+        assert not list((tmp_path / "local").iterdir())
+
+    def test_unknown_batch(self, tmp_path):
+        """Test that the status of an unknown batch is an error."""
+        with pytest.raises(ValueError):
+            LocalBatchBackend(tmp_path).status("batch_missing")
+
+
+class TestOpenAIBatchBackend:
+    """Test cases for the OpenAI batch backend."""
+
+    def test_submit_uploads_file_and_creates_batch(self, tmp_path):
+        """Test that submission uploads the input file for the batch endpoint."""
+        client = Mock()
+        client.files.create.return_value = Mock(id="file-1")
+        client.batches.create.return_value = Mock(id="batch-1")
+        path = tmp_path / "input.jsonl"
+        write_batch_file(path, {"a": make_body("one")})
+
+        assert OpenAIBatchBackend(client).submit(path) == "batch-1"
+        assert client.files.create.call_args.kwargs["purpose"] == "batch"
+        client.batches.create.assert_called_once_with(
+            input_file_id="file-1", endpoint=BATCH_ENDPOINT, completion_window="24h")
+
+    def test_results_merge_output_and_error_files(self):
+        """Test that results are read from both the output and the error file."""
+        files = {
+            "out": json.dumps({"custom_id": "a", "response": {"status_code": 200, "body": {
+                "choices": [{"message": {"content": "Docs"}}]}}}),
+            "err": json.dumps({"custom_id": "b", "response": None, "error": {"message": "Failed"}}),
+        }
+        client = Mock()
+        client.batches.retrieve.return_value = Mock(
+            status="completed", output_file_id="out", error_file_id="err")
+        client.files.content.side_effect = lambda file_id: Mock(text=files[file_id])
+
+        backend = OpenAIBatchBackend(client)
+        results = backend.results("batch-1")
+
+        assert backend.status("batch-1") == "completed"
+        assert results["a"].content == "Docs"
+        assert results["b"].error == "Failed"
+
+
+class TestCreateBatchBackend:
+    """Test cases for selecting the batch backend."""
+
+    def test_create_batch_backend(self, tmp_path):
+        """Test selecting the backend by name."""
+        assert isinstance(create_batch_backend("openai", Mock(), tmp_path), OpenAIBatchBackend)
+        local = create_batch_backend("local", Mock(), tmp_path)
+        assert isinstance(local, LocalBatchBackend)
+        assert local.directory == tmp_path / "local"
+        with pytest.raises(ValueError):
+            create_batch_backend("other", Mock(), tmp_path)
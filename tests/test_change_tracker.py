@@ -2,14 +2,21 @@
 Tests for the change tracker module.
 """
 
+import os
+import hashlib
 import time
+import shutil
 import tempfile
+import subprocess
 from pathlib import Path
+from unittest.mock import patch
+from concurrent.futures import ThreadPoolExecutor
 
 import pytest
 
 from ai_doc_generator.config import Config
 from ai_doc_generator.change_tracker import ChangeTracker
+from ai_doc_generator.file_scanner import FileScanner
 
 
 class TestChangeTracker:
@@ -253,6 +260,235 @@ class TestChangeTracker:
         assert "setup.py" not in file_names
         assert "test_file.py" not in file_names
 
+    def test_shared_file_scanner(self, temp_project):
+        """Test that a caller's scanner (and its compiled patterns) is reused."""
+        config = Config(project_root=temp_project)
+        scanner = FileScanner(config)
+        tracker = ChangeTracker(config, scanner)
+
+        assert tracker.file_scanner is scanner
+        assert len(tracker.get_changed_files()) == 3
+
+    def test_new_files_are_absolute(self, tracker, temp_project):
+        """Test that new files are returned as absolute paths."""
+        tracker.update_state(list(temp_project.rglob("*.py")))
+        (temp_project / "new_file.py").write_text("# New file")
+
+        changed_files = tracker.get_changed_files()
+
+        assert changed_files == [temp_project / "new_file.py"]
+
+    def test_unchanged_files_are_not_hashed(self, tracker, temp_project):
+        """Test that files with unchanged stat information are not read."""
+        tracker.update_state(list(temp_project.rglob("*.py")))
+
+        with patch.object(tracker, "_calculate_file_hash") as mock_hash:
+            assert tracker.get_changed_files() == []
+
+        mock_hash.assert_not_called()
+
+    def test_touched_file_is_not_changed(self, tracker, temp_project):
+        """Test that a touched file is hashed once and its stat refreshed."""
+        file1 = temp_project / "file1.py"
+        tracker.update_state([file1])
+        file1.touch()
+        future = time.time() + 10
+        os.utime(file1, (future, future))
+
+        assert tracker.get_changed_files() == sorted([
+            temp_project / "file2.py",
+            temp_project / "subdir" / "file3.py",
+        ])
+        assert tracker._state["files"]["file1.py"]["mtime_ns"] == file1.stat().st_mtime_ns
+
+        # The refreshed stat information is saved and trusted on the next run
+        tracker = ChangeTracker(Config(project_root=temp_project))
+        with patch.object(tracker, "_calculate_file_hash") as mock_hash:
+            tracker._has_file_changed(file1, tracker._state["files"]["file1.py"])
+        mock_hash.assert_not_called()
+
+    def test_same_size_modification_detected(self, tracker, temp_project):
+        """Test that a modification keeping the file size is found by hash."""
+        file1 = temp_project / "file1.py"
+        tracker.update_state(list(temp_project.rglob("*.py")))
+        file1.write_text("# File 9")
+        future = time.time() + 10
+        os.utime(file1, (future, future))
+
+        assert tracker.get_changed_files() == [file1]
+
+    def test_untrusted_stat_always_hashes(self, temp_project):
+        """Test that trust_file_stat=False verifies every file by hash."""
+        tracker = ChangeTracker(Config(project_root=temp_project, trust_file_stat=False))
+        tracker.update_state(list(temp_project.rglob("*.py")))
+
+        with patch.object(tracker, "_calculate_file_hash",
+                          wraps=tracker._calculate_file_hash) as mock_hash:
+            assert tracker.get_changed_files() == []
+
+        assert mock_hash.call_count == 3
+
+    def test_sqlite_state_backend(self, temp_project):
+        """Test change detection with the state stored in SQLite."""
+        config = Config(project_root=temp_project, state_backend="sqlite")
+        tracker = ChangeTracker(config)
+        assert not tracker.has_previous_run()
+        tracker.update_state(list(temp_project.rglob("*.py")))
+
+        tracker = ChangeTracker(config)
+        assert tracker.has_previous_run()
+        assert tracker.state_file == temp_project / ".doc_state.db"
+        assert tracker.get_documentation_stats()["total_files"] == 3
+
+        # A touched file is refreshed in the database, a modified one is reported
+        file1 = temp_project / "file1.py"
+        file2 = temp_project / "file2.py"
+        future = time.time() + 10
+        os.utime(file1, (future, future))
+        file2.write_text("# File 2 - Modified content")
+
+        assert tracker.get_changed_files() == [file2]
+        tracker = ChangeTracker(config)
+        assert tracker._state["files"]["file1.py"]["mtime_ns"] == file1.stat().st_mtime_ns
+
+    def test_parallel_hashing(self, temp_project):
+        """Test that several files are hashed on a thread pool."""
+        tracker = ChangeTracker(Config(project_root=temp_project, hash_workers=4))
+        files = sorted(temp_project.rglob("*.py"))
+
+        with patch("ai_doc_generator.change_tracker.ThreadPoolExecutor",
+                   wraps=ThreadPoolExecutor) as mock_executor:
+            hashes = tracker._hash_files(files)
+
+        mock_executor.assert_called_once_with(max_workers=3)
+        assert hashes == {f: tracker._calculate_file_hash(f) for f in files}
+
+    def test_update_state_reuses_detected_hashes(self, tracker, temp_project):
+        """Test that hashes from change detection are not calculated again."""
+        file1 = temp_project / "file1.py"
+        tracker.update_state(list(temp_project.rglob("*.py")))
+        file1.write_text("# File 9")
+        future = time.time() + 10
+        os.utime(file1, (future, future))
+
+        changed_files = tracker.get_changed_files()
+        assert changed_files == [file1]
+
+        with patch.object(tracker, "_calculate_file_hash") as mock_hash:
+            tracker.update_state(changed_files)
+
+        mock_hash.assert_not_called()
+        assert tracker._state["files"]["file1.py"]["hash"] == tracker._calculate_file_hash(file1)
+
+    def test_legacy_state_keeps_sha256(self, temp_project):
+        """Test that a state without a recorded algorithm is compared using SHA-256."""
+        tracker = ChangeTracker(Config(project_root=temp_project))
+        tracker.update_state(list(temp_project.rglob("*.py")))
+        assert tracker._state["hash_algorithm"] == "blake2b"
+
+        # Simulate a state written by an older version
+        for path, info in tracker._state["files"].items():
+            content = (temp_project / path).read_bytes()
+            info["hash"] = hashlib.sha256(content).hexdigest()
+            info.pop("mtime_ns")
+        del tracker._state["hash_algorithm"]
+        tracker._save_state()
+
+        tracker = ChangeTracker(Config(project_root=temp_project))
+        assert tracker.get_changed_files() == []
+        assert tracker._state["hash_algorithm"] == "sha256"
+
+        # Re-documenting every file switches to the configured algorithm
+        tracker.update_state(list(temp_project.rglob("*.py")))
+        assert tracker._state["hash_algorithm"] == "blake2b"
+
+    @pytest.mark.skipif(shutil.which("git") is None, reason="git is not installed")
+    def test_git_change_detection(self, temp_project):
+        """Test that changes are read from git instead of scanning every file."""
+        def git(*args):
+            subprocess.run(
+                ["git", "-c", "user.email=test@example.com", "-c", "user.name=Test", *args],
+                cwd=temp_project, capture_output=True, check=True
+            )
+
+        git("init")
+        (temp_project / ".gitignore").write_text(".doc_state.json\n")
+        git("add", ".")
+        git("commit", "-m", "Initial commit")
+
+        config = Config(project_root=temp_project, discovery="git")
+        tracker = ChangeTracker(config)
+        tracker.update_state(list(temp_project.rglob("*.py")))
+        assert tracker._state["last_commit"]
+
+        # Committed, uncommitted and untracked changes
+        time.sleep(0.01)
+        (temp_project / "file1.py").write_text("# File 1 - committed change")
+        git("commit", "-am", "Change file1")
+        (temp_project / "subdir" / "file3.py").write_text("# File 3 - work in progress")
+        (temp_project / "new_file.py").write_text("# New file")
+
+        tracker = ChangeTracker(config)
+        with patch.object(tracker.file_scanner, "scan_all_files") as mock_scan:
+            changed_files = tracker.get_changed_files()
+        mock_scan.assert_not_called()
+
+        assert changed_files == sorted([
+            temp_project / "file1.py",
+            temp_project / "new_file.py",
+            temp_project / "subdir" / "file3.py",
+        ])
+
+        # Once documented, reported files that did not change again are skipped
+        tracker.update_state(changed_files, record_commit=False)
+        assert tracker.get_changed_files() == []
+
+    @pytest.mark.skipif(shutil.which("git") is None, reason="git is not installed")
+    def test_git_change_detection_unknown_commit(self, tracker, temp_project):
+        """Test falling back to a full comparison when the commit is unknown."""
+        subprocess.run(["git", "init"], cwd=temp_project, capture_output=True, check=True)
+        tracker.config.discovery = "git"
+        tracker.update_state(list(temp_project.rglob("*.py")))
+        tracker._state["last_commit"] = "0" * 40
+        tracker._state["scan_signature"] = tracker._scan_signature()
+
+        (temp_project / "new_file.py").write_text("# New file")
+
+        assert tracker.get_changed_files() == [temp_project / "new_file.py"]
+
+    def test_scan_settings_change_disables_git_detection(self, tracker, temp_project):
+        """Test that changed scanner settings force a full comparison."""
+        tracker.config.discovery = "git"
+        tracker._state["last_commit"] = "0" * 40
+        tracker._state["scan_signature"] = "outdated"
+
+        with patch.object(tracker, "_run_git") as mock_git:
+            tracker.get_changed_files()
+
+        mock_git.assert_not_called()
+
+    @pytest.mark.skipif(shutil.which("git") is None, reason="git is not installed")
+    def test_walk_discovery_checks_ignored_files(self, temp_project):
+        """Test that files ignored by git are still checked when the walk finds them."""
+        subprocess.run(["git", "init"], cwd=temp_project, capture_output=True, check=True)
+        (temp_project / ".gitignore").write_text("_version.py\n")
+        version_file = temp_project / "_version.py"
+        version_file.write_text("version = '1.0'")
+        tracker = ChangeTracker(Config(project_root=temp_project))
+        tracker.update_state(list(temp_project.rglob("*.py")))
+
+        time.sleep(0.01)
+        version_file.write_text("version = '1.1'")
+        (temp_project / "_generated.py").write_text("# Ignored by git")
+        (temp_project / ".gitignore").write_text("_version.py\n_generated.py\n")
+
+        tracker = ChangeTracker(Config(project_root=temp_project))
+        with patch.object(tracker, "_run_git") as mock_git:
+            changed_files = tracker.get_changed_files()
+
+        mock_git.assert_not_called()
+        assert changed_files == [temp_project / "_generated.py", version_file]
+
     @pytest.mark.skipif(
         not Path(".git").exists(),
         reason="Git tests require git repository"
@@ -0,0 +1,80 @@
+"""
+Tests for the checkpoint module.
+"""
+
+import json
+
+import pytest
+
+from ai_doc_generator.checkpoint import Checkpoint
+
+
+class TestCheckpoint:
+    """Test cases for the Checkpoint class."""
+
+    @pytest.fixture
+    def project(self, tmp_path):
+        """Create a project with two files."""
+        (tmp_path / "a.py").write_text("A = 1\n")
+        (tmp_path / "b.py").write_text("B = 2\n")
+        return tmp_path
+
+    def _entry(self, name):
+        return {"path": name, "analysis": {"decorators_used": {"property"}}, "documentation": "Docs"}
+
+    def test_saved_every_interval(self, project):
+        """Test that the checkpoint is written after every interval files."""
+        checkpoint = Checkpoint(project / ".doc_checkpoint.json", project, interval=2)
+
+        checkpoint.add(project / "a.py", checkpoint.snapshot(project / "a.py"), self._entry("a.py"))
+        assert not checkpoint.exists()
+
+        checkpoint.add(project / "b.py", checkpoint.snapshot(project / "b.py"), self._entry("b.py"))
+        assert checkpoint.exists()
+        data = json.loads(checkpoint.path.read_text())
+        assert sorted(data["files"]) == ["a.py", "b.py"]
+        # Sets in analysis results are stored as lists
+        assert data["files"]["a.py"]["documentation"]["analysis"]["decorators_used"] == ["property"]
+
+    def test_load_and_get(self, project):
+        """Test that unchanged completed files are returned after loading."""
+        checkpoint = Checkpoint(project / ".doc_checkpoint.json", project, interval=1)
+        checkpoint.full_run = True
+        for name in ("a.py", "b.py"):
+            checkpoint.add(project / name, checkpoint.snapshot(project / name), self._entry(name))
+
+        (project / "b.py").write_text("B = 'changed'\n")
+
+        loaded = Checkpoint(project / ".doc_checkpoint.json", project)
+        assert loaded.load() == 2
+        assert loaded.full_run
+        assert loaded.get(project / "a.py")["documentation"] == "Docs"
+        assert loaded.get(project / "b.py") is None
+        assert loaded.get(project / "c.py") is None
+
+    def test_clear(self, project):
+        """Test that clearing removes the checkpoint file."""
+        checkpoint = Checkpoint(project / ".doc_checkpoint.json", project, interval=1)
+        checkpoint.add(project / "a.py", checkpoint.snapshot(project / "a.py"), self._entry("a.py"))
+
+        checkpoint.clear()
+
+        assert not checkpoint.exists()
+        assert checkpoint.get(project / "a.py") is None
+        checkpoint.clear()
+
+    def test_disabled(self, project):
+        """Test that an interval of 0 disables checkpointing."""
+        checkpoint = Checkpoint(project / ".doc_checkpoint.json", project, interval=0)
+        checkpoint.add(project / "a.py", checkpoint.snapshot(project / "a.py"), self._entry("a.py"))
+        checkpoint.save()
+
+        assert not checkpoint.enabled
+        assert not checkpoint.exists()
+
+    def test_corrupted_checkpoint(self, project):
+        """Test that a corrupted checkpoint is ignored."""
+        path = project / ".doc_checkpoint.json"
+        path.write_text("{ invalid json")
+
+        assert Checkpoint(path, project).load() == 0
@@ -0,0 +1,85 @@
+"""
+Tests for the chunker module.
+"""
+
+from pathlib import Path
+
+from ai_doc_generator.chunker import split_into_chunks
+from ai_doc_generator.code_analyzer import CodeAnalyzer
+
+
+def _function(name: str, body_lines: int) -> str:
+    body = "\n".join(f"    value_{i} = {i}" for i in range(body_lines))
+    return f"def {name}():\n{body}\n"
+
+
+def _split(content: str, budget: int):
+    analysis = CodeAnalyzer().analyze_file(Path("big.py"), content)
+    return split_into_chunks(content, analysis, budget)
+
+
+class TestChunker:
+    """Test cases for split_into_chunks."""
+
+    def test_chunks_cover_file_in_order(self):
+        """Test that chunks are contiguous and reproduce the whole file."""
+        content = '"""Big module."""\n\nimport os\n\n' + "\n".join(
+            _function(f"func_{i}", 20) for i in range(10)
+        ) + '\nif __name__ == "__main__":\n    func_0()\n'
+
+        chunks = _split(content, 1000)
+
+        assert len(chunks) > 1
+        assert "\n".join(chunk.source for chunk in chunks) == "\n".join(content.splitlines())
+        for previous, chunk in zip(chunks, chunks[1:]):
+            assert chunk.start_line == previous.end_line + 1
+        assert all(len(chunk.source) <= 1000 for chunk in chunks)
+
+    def test_functions_are_not_split_when_they_fit(self):
+        """Test that chunk boundaries fall between functions."""
+        content = "\n".join(_function(f"func_{i}", 20) for i in range(10))
+
+        chunks = _split(content, 1000)
+
+        symbols = [name for chunk in chunks for name in chunk.symbols]
+        assert symbols == [f"func_{i}" for i in range(10)]
+        for chunk in chunks:
+            # Blank lines before a function stay with it
+            assert chunk.source.lstrip("\n").startswith("def ")
+
+    def test_large_class_is_split_between_methods(self):
+        """Test that a class larger than the budget is split at its methods."""
+        methods = "\n".join(
+            "    " + _function(f"method_{i}", 20).replace("\n", "\n    ").rstrip()
+            for i in range(6)
+        )
+        content = f"class Big(Base):\n    \"\"\"A big class.\"\"\"\n\n{methods}\n"
+
+        chunks = _split(content, 1000)
+
+        assert len(chunks) > 1
+        assert chunks[0].symbols[0] == "Big"
+        assert chunks[0].context is None
+        for chunk in chunks[1:]:
+            assert chunk.context == "class Big(Base):"
+            assert chunk.symbols[0].startswith("Big.method_")
+        assert "\n".join(chunk.source for chunk in chunks) == "\n".join(content.splitlines())
+
+    def test_oversized_function_is_split_into_line_blocks(self):
+        """Test that a single function larger than the budget is split by lines."""
+        content = _function("huge", 200)
+
+        chunks = _split(content, 500)
+
+        assert len(chunks) > 1
+        assert all(chunk.symbols == ["huge"] for chunk in chunks)
+        assert all(len(chunk.source) <= 500 for chunk in chunks)
+
+    def test_unparsable_file_is_split_by_lines(self):
+        """Test that files without an analysis are still chunked."""
+        content = "def broken(:\n" + "x = 1\n" * 300
+
+        chunks = _split(content, 500)
+
+        assert len(chunks) > 1
+        assert "\n".join(chunk.source for chunk in chunks) == "\n".join(content.splitlines())
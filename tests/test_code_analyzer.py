@@ -2,10 +2,13 @@
 Tests for the code analyzer module.
 """
 
+import tempfile
 from pathlib import Path
+from unittest.mock import patch
 
 import pytest
 
+from ai_doc_generator.analysis_cache import AnalysisCache
 from ai_doc_generator.code_analyzer import CodeAnalyzer
 
 
@@ -236,6 +239,45 @@ async def async_generator():
         assert funcs["async_generator"]["is_async"]
         assert funcs["async_generator"]["is_generator"]
 
+    def test_nested_scopes_keep_their_own_facts(self, analyzer):
+        """Test that yields and raises in nested functions are not attributed to the outer one."""
+        code = '''
+def outer():
+    def helper():
+        yield 1
+        raise KeyError("nested")
+
+    class Local:
+        def method(self):
+            raise IndexError()
+
+    check = lambda: (yield)
+    LOCAL_LIMIT = 10
+    raise ValueError("outer")
+    raise TypeError
+    raise ValueError("again")
+
+class Service:
+    def run(self):
+        def callback():
+            raise RuntimeError()
+        count: int = 0
+        return callback
+'''
+
+        result = analyzer.analyze_file(Path("test.py"), code)
+
+        assert [f["name"] for f in result["functions"]] == ["outer"]
+        outer = result["functions"][0]
+        assert not outer["is_generator"]
+        assert outer["raises"] == ["ValueError", "TypeError"]
+        assert result["constants"] == []
+
+        service = result["classes"][0]
+        assert [c["name"] for c in result["classes"]] == ["Service"]
+        assert service["methods"][0]["raises"] == []
+        assert service["attributes"] == []
+
     def test_analyze_main_guard(self, analyzer):
         """Test detection of if __name__ == "__main__": guard."""
         code_with_main = '''
@@ -365,4 +407,51 @@ from .submodule import function
         levels = [imp["level"] for imp in relative_imports]
         assert 1 in levels
         assert 2 in levels
-        assert 3 in levels
\ No newline at end of file
+        assert 3 in levels
+
+    def test_syntax_error_results_are_json_serializable(self, analyzer):
+        """Test that a failed parse still returns lists rather than sets."""
+        result = analyzer.analyze_file(Path("test.py"), "def broken(:\n")
+
+        assert result["decorators_used"] == []
+        assert result["dependencies"] == []
+
+    def test_cached_analysis_skips_parsing(self):
+        """Test that unchanged content is analyzed once and then read from the cache."""
+        code = '''
+import requests
+
+@property
+def fetch(url: str) -> str:
+    return requests.get(url).text
+'''
+        with tempfile.TemporaryDirectory() as tmpdir:
+            cache = AnalysisCache(Path(tmpdir), max_size=1024 * 1024)
+            first = CodeAnalyzer(cache).analyze_file(Path("a.py"), code)
+
+            with patch("ai_doc_generator.code_analyzer.ast.parse") as parse:
+                second = CodeAnalyzer(cache).analyze_file(Path("b.py"), code)
+
+            parse.assert_not_called()
+            assert second["file_path"] == "b.py"
+            assert {**second, "file_path": "a.py"} == first
+            assert cache.hits == 1
+
+    def test_prepared_analyses_are_reused(self):
+        """Test that analyses computed by worker processes are returned without parsing."""
+        files = [(Path(f"mod_{i}.py"), f"def func_{i}(x: int) -> int:\n    return x\n")
+                 for i in range(20)]
+        expected = [CodeAnalyzer().analyze_file(path, content) for path, content in files]
+
+        with tempfile.TemporaryDirectory() as tmpdir:
+            cache = AnalysisCache(Path(tmpdir), max_size=1024 * 1024)
+            analyzer = CodeAnalyzer(cache)
+            assert analyzer.prepare(iter(files), workers=2) == 20
+
+            with patch("ai_doc_generator.code_analyzer.ast.parse") as parse:
+                results = [analyzer.analyze_file(path, content) for path, content in files]
+
+            parse.assert_not_called()
+            assert results == expected
+            # Prepared analyses were stored in the cache for later runs
+            assert CodeAnalyzer(cache).prepare(iter(files), workers=2) == 0
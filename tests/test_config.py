@@ -124,4 +124,40 @@ class TestConfig:
         )
         errors = config.validate()
 
-        assert len(errors) == 0
\ No newline at end of file
+        assert len(errors) == 0
+
+    def test_config_validation_invalid_concurrency(self):
+        """Test validation when max_concurrency is not positive."""
+        config = Config(
+            openai_api_key="test-key",
+            project_root=Path.cwd(),
+            max_concurrency=0
+        )
+        errors = config.validate()
+
+        assert len(errors) == 1
+        assert "max_concurrency" in errors[0]
+
+    def test_config_validation_unknown_hash_algorithm(self):
+        """Test validation when the hash algorithm is not available."""
+        config = Config(
+            openai_api_key="test-key",
+            project_root=Path.cwd(),
+            hash_algorithm="md4"
+        )
+        errors = config.validate()
+
+        assert len(errors) == 1
+        assert "hash_algorithm" in errors[0]
+
+    def test_config_validation_unknown_batch_backend(self):
+        """Test validation when the batch backend is unknown."""
+        config = Config(
+            openai_api_key="test-key",
+            project_root=Path.cwd(),
+            batch_backend="anthropic"
+        )
+        errors = config.validate()
+
+        assert len(errors) == 1
+        assert "batch_backend" in errors[0]
@@ -2,15 +2,19 @@
 Tests for the documentation builder module.
 """
 
+import os
 import json
 import tempfile
 from pathlib import Path
 from datetime import datetime
+from unittest.mock import patch
 
 import pytest
 
 from ai_doc_generator.config import Config
 from ai_doc_generator.doc_builder import DocumentationBuilder
+from ai_doc_generator.fileutils import atomic_write
+from ai_doc_generator.symbol_index import index_file as index_file_function, index_symbol
 
 
 class TestDocumentationBuilder:
@@ -178,6 +182,40 @@ class TestDocumentationBuilder:
         assert "### main" in content
         assert "### format_date" in content
 
+    def test_api_reference_split_by_letter(self, builder, sample_documentation, temp_output_dir):
+        """Test splitting the API reference into a page per initial letter."""
+        builder.config.api_reference_split = "letter"
+        builder.documentation = sample_documentation
+        builder._generate_api_reference()
+
+        pages_dir = temp_output_dir / "api-reference"
+        assert sorted(p.name for p in pages_dir.iterdir()) == ["A.md", "F.md", "M.md"]
+        assert "### class Application" in (pages_dir / "A.md").read_text()
+        assert "### format_date" in (pages_dir / "F.md").read_text()
+        index = (temp_output_dir / "api-reference.md").read_text()
+        assert "- [A](api-reference/A.md) - 1 classes, 0 functions" in index
+        assert "- [M](api-reference/M.md) - 0 classes, 1 functions" in index
+
+    def test_api_reference_split_by_package(self, builder, sample_documentation, temp_output_dir):
+        """Test splitting the API reference into a page per package, removing stale pages."""
+        builder.config.api_reference_split = "letter"
+        builder.documentation = sample_documentation
+        builder._generate_api_reference()
+
+        builder.config.api_reference_split = "package"
+        builder._generate_api_reference()
+
+        pages_dir = temp_output_dir / "api-reference"
+        assert sorted(p.name for p in pages_dir.iterdir()) == ["src.md", "src_utils.md"]
+        assert "### main" in (pages_dir / "src.md").read_text()
+        assert "### main" not in (pages_dir / "src_utils.md").read_text()
+        assert "[src/utils](api-reference/src_utils.md)" in (temp_output_dir / "api-reference.md").read_text()
+
+        builder.config.api_reference_split = "none"
+        builder._generate_api_reference()
+        assert not list(pages_dir.iterdir())
+        assert "### format_date" in (temp_output_dir / "api-reference.md").read_text()
+
     def test_generate_project_overview(self, builder, sample_documentation, temp_output_dir):
         """Test project overview generation."""
         builder.documentation = sample_documentation
@@ -196,7 +234,6 @@ class TestDocumentationBuilder:
         """Test formatting of class reference."""
         class_info = {
             "name": "TestClass",
-            "file_path": "test.py",
             "docstring": "Test class docstring.",
             "bases": ["BaseClass"],
             "methods": [
@@ -208,7 +245,7 @@ class TestDocumentationBuilder:
             ]
         }
 
-        lines = builder._format_class_reference(class_info)
+        lines = builder._format_class_reference(index_symbol("class", class_info, "test.py"))
 
         assert "### class TestClass" in lines[0]
         assert "*File: test.py*" in lines[1]
@@ -221,7 +258,6 @@ class TestDocumentationBuilder:
         """Test formatting of function reference."""
         func_info = {
             "name": "test_function",
-            "file_path": "test.py",
             "docstring": "Test function docstring.",
             "args": [
                 {"name": "arg1", "annotation": "str"},
@@ -232,7 +268,7 @@ class TestDocumentationBuilder:
             "raises": ["ValueError"]
         }
 
-        lines = builder._format_function_reference(func_info)
+        lines = builder._format_function_reference(index_symbol("function", func_info, "test.py"))
 
         assert "### test_function" in lines[0]
         assert "*File: test.py*" in lines[1]
@@ -300,6 +336,202 @@ class TestDocumentationBuilder:
         assert (temp_output_dir / "project-overview.md").exists()
         assert (temp_output_dir / "modules").exists()
 
+    def test_compact_documentation_round_trip(self, builder, sample_documentation, temp_output_dir):
+        """Test that compact analyses are saved, reloaded and rendered without modification."""
+        for path, doc in sample_documentation.items():
+            builder.add_file_documentation(Path(path), doc)
+        expected = json.loads(json.dumps(sample_documentation))
+
+        builder.build_documentation()
+
+        saved = json.loads((temp_output_dir / "documentation.json").read_text())
+        assert saved == expected
+        assert "*File: src/app.py*" in (temp_output_dir / "api-reference.md").read_text()
+
+        reloaded = DocumentationBuilder(builder.config)
+        reloaded.load_existing_documentation()
+        assert reloaded.documentation == expected
+
+    def test_incremental_build_renders_changed_modules(self, builder, sample_documentation,
+                                                       temp_output_dir):
+        """Test that an incremental build only rewrites the pages of changed files."""
+        for path, doc in sample_documentation.items():
+            builder.add_file_documentation(Path(path), doc)
+        builder.build_documentation()
+        pages = [p for p in temp_output_dir.rglob("*") if p.is_file()]
+        for page in pages:
+            os.utime(page, (0, 0))
+
+        incremental = DocumentationBuilder(builder.config)
+        incremental.load_existing_documentation()
+        changed = {**sample_documentation["src/app.py"], "documentation": "# Updated"}
+        incremental.add_file_documentation(Path("src/app.py"), changed)
+        # Re-adding an unchanged file does not make it stale
+        helpers = sample_documentation["src/utils/helpers.py"]
+        incremental.add_file_documentation(Path("src/utils/helpers.py"), helpers)
+        incremental.build_documentation()
+
+        rewritten = {str(p.relative_to(temp_output_dir)) for p in pages if p.stat().st_mtime != 0}
+        assert rewritten == {"modules/src/index.md", "documentation.json"}
+        assert "# Updated" in (temp_output_dir / "modules" / "src" / "index.md").read_text()
+
+    def test_analysis_change_renders_aggregate_pages(self, builder, sample_documentation,
+                                                     temp_output_dir):
+        """Test that a changed analysis re-renders the pages covering every file."""
+        builder.documentation = sample_documentation
+        builder.build_documentation()
+
+        builder.load_existing_documentation()
+        changed = json.loads(json.dumps(sample_documentation["src/utils/helpers.py"]))
+        changed["analysis"]["functions"][0]["name"] = "parse_date"
+        builder.add_file_documentation(Path("src/utils/helpers.py"), changed)
+        builder.build_documentation()
+
+        assert "parse_date" in (temp_output_dir / "api-reference.md").read_text()
+        # The README, overview and module page are rendered again but unchanged
+        assert builder.pages_written == 1
+        assert builder.pages_unchanged == 3
+
+    def test_identical_pages_not_rewritten(self, builder, sample_documentation, temp_output_dir):
+        """Test that rebuilding unchanged documentation writes no pages, ignoring the timestamp."""
+        builder.documentation = sample_documentation
+        builder.build_documentation()
+        readme = temp_output_dir / "README.md"
+        readme.write_text(readme.read_text().replace("Generated on: ", "Generated on: 1999-01-01 "))
+        before = readme.read_text()
+
+        rebuilt = DocumentationBuilder(builder.config)
+        rebuilt.documentation = sample_documentation
+        rebuilt.build_documentation()
+
+        assert rebuilt.pages_written == 0
+        assert rebuilt.pages_unchanged == 5
+        assert readme.read_text() == before
+
+    def test_missing_pages_are_rendered(self, builder, sample_documentation, temp_output_dir):
+        """Test that pages deleted from the output are rendered by an incremental build."""
+        builder.documentation = sample_documentation
+        builder.build_documentation()
+        (temp_output_dir / "api-reference.md").unlink()
+        (temp_output_dir / "modules" / "src" / "index.md").unlink()
+
+        builder.load_existing_documentation()
+        builder.build_documentation()
+
+        assert (temp_output_dir / "api-reference.md").exists()
+        assert (temp_output_dir / "modules" / "src" / "index.md").exists()
+        assert builder.pages_written == 2
+
+    def test_sharded_store_round_trip(self, builder, sample_documentation, temp_output_dir):
+        """Test that the sharded store is saved, opened lazily and updated incrementally."""
+        builder.config.doc_store = "sharded"
+        for path, doc in sample_documentation.items():
+            builder.add_file_documentation(Path(path), doc)
+        builder.build_documentation()
+        expected = json.loads(json.dumps(sample_documentation))
+
+        assert not (temp_output_dir / "documentation.json").exists()
+        assert (temp_output_dir / ".doc_store" / "manifest.json").exists()
+
+        incremental = DocumentationBuilder(builder.config)
+        incremental.load_existing_documentation()
+        assert sorted(incremental.documentation) == sorted(expected)
+        changed = {**sample_documentation["src/app.py"], "documentation": "# Updated"}
+        incremental.add_file_documentation(Path("src/app.py"), changed)
+        incremental.build_documentation()
+
+        reloaded = DocumentationBuilder(builder.config)
+        reloaded.load_existing_documentation()
+        assert reloaded.documentation["src/app.py"]["documentation"] == "# Updated"
+        assert reloaded.documentation["src/utils/helpers.py"] == expected["src/utils/helpers.py"]
+        assert "# Updated" in (temp_output_dir / "modules" / "src" / "index.md").read_text()
+
+    def test_sharded_incremental_build_touches_changed_shards_only(self, builder, sample_documentation,
+                                                                   temp_output_dir):
+        """Test that an analysis change only reads and writes the changed file's shard."""
+        builder.config.doc_store = "sharded"
+        documentation = {f"pkg{index}/mod.py": json.loads(json.dumps(sample_documentation["src/app.py"]))
+                         for index in range(10)}
+        builder.documentation = documentation
+        builder.build_documentation()
+
+        incremental = DocumentationBuilder(builder.config)
+        incremental.load_existing_documentation()
+        changed = json.loads(json.dumps(documentation["pkg3/mod.py"]))
+        changed["analysis"]["functions"].append({"name": "shutdown", "args": []})
+        incremental.add_file_documentation(Path("pkg3/mod.py"), changed)
+        with patch("ai_doc_generator.doc_store.atomic_write", wraps=atomic_write) as written:
+            incremental.build_documentation()
+
+        store = incremental.documentation
+        assert set(store._entries) == {"pkg3/mod.py"}
+        written_paths = [call.args[0] for call in written.call_args_list]
+        assert written_paths == [store._shard_path(store._shards["pkg3/mod.py"]), store.manifest_path]
+        assert "### shutdown" in (temp_output_dir / "api-reference.md").read_text()
+
+    def test_build_does_not_modify_analyses(self, builder, sample_documentation):
+        """Test that building leaves the documentation entries untouched."""
+        expected = json.loads(json.dumps(sample_documentation))
+        builder.documentation = sample_documentation
+        builder.build_documentation()
+
+        assert sample_documentation == expected
+
+    def test_symbol_index_reused_by_incremental_build(self, builder, sample_documentation, temp_output_dir):
+        """Test that project-wide pages are rendered without reading unchanged entries."""
+        builder.config.doc_store = "sharded"
+        builder.documentation = sample_documentation
+        builder.build_documentation()
+        index_file = temp_output_dir / ".symbol_index.json"
+        assert "Main application class." in index_file.read_text()
+        # Reference sections are rendered from the index, not stored rendered
+        assert "### class Application" not in index_file.read_text()
+
+        incremental = DocumentationBuilder(builder.config)
+        incremental.load_existing_documentation()
+        helpers = json.loads(json.dumps(sample_documentation["src/utils/helpers.py"]))
+        helpers["analysis"]["functions"].append({"name": "parse_date", "args": [{"name": "text"}]})
+        incremental.add_file_documentation(Path("src/utils/helpers.py"), helpers)
+        with patch("ai_doc_generator.symbol_index.index_file", wraps=index_file_function) as indexed:
+            incremental.build_documentation()
+
+        assert [call.args[0] for call in indexed.call_args_list] == ["src/utils/helpers.py"]
+        # Only the changed file's entry was read from the store
+        assert set(incremental.documentation._entries) == {"src/utils/helpers.py"}
+        api_reference = (temp_output_dir / "api-reference.md").read_text()
+        assert "### class Application" in api_reference
+        assert "### parse_date" in api_reference
+        assert "- Total Functions: 3" in (temp_output_dir / "README.md").read_text()
+
+        rebuilt = DocumentationBuilder(builder.config)
+        rebuilt.documentation = json.loads(json.dumps({**sample_documentation, "src/utils/helpers.py": helpers}))
+        rebuilt.build_documentation()
+        assert (temp_output_dir / "api-reference.md").read_text() == api_reference
+
+    @pytest.mark.parametrize("processes", [False, True])
+    def test_parallel_module_rendering(self, builder, sample_documentation, temp_output_dir, processes):
+        """Test that rendering module pages in parallel gives the serial output."""
+        documentation = dict(sample_documentation)
+        for index in range(6):
+            documentation[f"pkg{index}/mod.py"] = {**sample_documentation["src/app.py"],
+                                                    "documentation": f"Module {index}"}
+        builder.documentation = documentation
+        builder._generate_module_docs()
+        modules_dir = temp_output_dir / "modules"
+        serial = {str(p.relative_to(modules_dir)): p.read_text() for p in modules_dir.rglob("index.md")}
+
+        for page in modules_dir.rglob("index.md"):
+            page.unlink()
+        builder.config.render_workers = 4
+        builder.config.render_processes = processes
+        builder._generate_module_docs()
+
+        parallel = {str(p.relative_to(modules_dir)): p.read_text() for p in modules_dir.rglob("index.md")}
+        assert parallel == serial
+        assert len(parallel) == 8
+        assert sorted(builder.render_timings) == sorted(f"modules/{page}" for page in serial)
+        assert all(seconds >= 0 for seconds in builder.render_timings.values())
+
     def test_generate_tree_view(self, builder):
         """Test tree view generation."""
         structure = {
@@ -2,12 +2,17 @@
 Tests for the main documentation generator module.
 """
 
+import json
+import time
 import tempfile
+import threading
 from pathlib import Path
 from unittest.mock import Mock, patch, MagicMock
 
 import pytest
 
+from ai_doc_generator.batch import LocalBatchBackend
+from ai_doc_generator.code_analyzer import CodeAnalyzer
 from ai_doc_generator.config import Config
 from ai_doc_generator.doc_generator import DocumentationGenerator
 
@@ -176,6 +181,12 @@ The `App` class is the main entry point for the application.
 
         assert result is None
 
+    def test_document_file_empty_completion(self, generator, temp_project, mock_openai_client):
+        """Test that a completion without content is not recorded as documentation."""
+        mock_openai_client.chat.completions.create.return_value.choices[0].message.content = None
+
+        assert generator._document_file(temp_project / "src" / "app.py") is None
+
     def test_create_documentation_prompt(self, generator, temp_project):
         """Test prompt creation for documentation."""
         file_path = temp_project / "src" / "app.py"
@@ -211,6 +222,99 @@ The `App` class is the main entry point for the application.
         assert "... (truncated)" in prompt
         assert len(prompt) < len(large_content)
 
+    def test_large_file_documented_in_chunks(self, generator, temp_project, mock_openai_client):
+        """Test that files too large for one prompt are documented fully in chunks."""
+        generator.config.max_concurrency = 3
+        functions = "\n".join(
+            f"def func_{i}(value):\n    \"\"\"Function {i}.\"\"\"\n" + "    value += 1\n" * 60
+            for i in range(20)
+        )
+        large_file = temp_project / "src" / "large.py"
+        large_file.write_text('"""Large module."""\n\n' + functions)
+
+        result = generator._document_file(large_file)
+
+        prompts = [call.kwargs["messages"][1]["content"]
+                   for call in mock_openai_client.chat.completions.create.call_args_list]
+        # Prompts are sent concurrently, so their order is not fixed
+        overviews = [prompt for prompt in prompts if "Please write an overview" in prompt]
+        chunk_prompts = [prompt for prompt in prompts if prompt not in overviews]
+        assert len(overviews) == 1
+        assert len(chunk_prompts) > 1
+        assert all("(truncated)" not in prompt for prompt in prompts)
+        # Every function is shown in exactly one chunk
+        for i in range(20):
+            assert sum(f"def func_{i}(value):" in prompt for prompt in chunk_prompts) == 1
+        assert result["documentation"].count("Generated documentation content") == len(prompts)
+
+    def test_chunk_requests_respect_concurrency_limit(self, generator, temp_project, mock_openai_client):
+        """Test that concurrently documented files do not exceed max_concurrency requests."""
+        generator.config.max_concurrency = 2
+        generator.response_cache.enabled = False
+        functions = "\n".join(
+            f"def func_{i}(value):\n    \"\"\"Function {i}.\"\"\"\n" + "    value += 1\n" * 60
+            for i in range(20)
+        )
+        for name in ("large_a.py", "large_b.py"):
+            (temp_project / "src" / name).write_text('"""Large module."""\n\n' + functions)
+
+        lock = threading.Lock()
+        in_flight = []
+        peak = []
+        response = mock_openai_client.chat.completions.create.return_value
+
+        def create(**kwargs):
+            with lock:
+                in_flight.append(1)
+                peak.append(len(in_flight))
+            time.sleep(0.01)
+            with lock:
+                in_flight.pop()
+            return response
+
+        mock_openai_client.chat.completions.create.side_effect = create
+        generator.generate_documentation(force_full=True)
+
+        assert len(peak) > 4
+        assert max(peak) == 2
+
+    def test_completion_budget_fits_context_window(self, generator, mock_openai_client):
+        """Test that max_tokens is lowered so prompt and completion fit the model."""
+        generator.config.model = "gpt-4"
+        generator.config.max_tokens = 8150
+        generator.token_counter.context_window = 8192
+        mock_openai_client.chat.completions.create.return_value.usage = Mock(
+            prompt_tokens=120, completion_tokens=40
+        )
+
+        generator._request_completion("Describe this module.")
+
+        sent = mock_openai_client.chat.completions.create.call_args.kwargs["max_tokens"]
+        prompt_tokens = generator.token_counter.count(generator.config.system_prompt) + \
+            generator.token_counter.count("Describe this module.")
+        assert sent == 8192 - prompt_tokens
+        assert generator.token_usage.stats()["prompt_tokens"] == 120
+
+    def test_content_budget_follows_model(self, generator):
+        """Test that small context windows lower the source code budget."""
+        assert generator._content_budget() == generator.config.max_content_tokens
+
+        generator.token_counter.context_window = 4096
+        system_tokens = generator.token_counter.count(generator.config.system_prompt)
+        assert generator._content_budget() == 4096 - system_tokens - 1000 - generator.config.max_tokens
+
+    def test_large_file_truncated_without_chunking(self, generator, temp_project, mock_openai_client):
+        """Test that chunking can be disabled."""
+        generator.config.chunk_large_files = False
+        large_file = temp_project / "src" / "large.py"
+        large_file.write_text("x = 1\n" * 5000)
+
+        generator._document_file(large_file)
+
+        assert mock_openai_client.chat.completions.create.call_count == 1
+        prompt = mock_openai_client.chat.completions.create.call_args.kwargs["messages"][1]["content"]
+        assert "(truncated)" in prompt
+
     def test_no_files_to_document(self, generator, temp_project):
         """Test handling when no files need documentation."""
         # Document all files first
@@ -310,4 +414,355 @@ The `App` class is the main entry point for the application.
             mock_tqdm.assert_called_once()
 
             # Check that progress bar was updated
-            assert mock_pbar.update.call_count == 2  # Two files in our test project
\ No newline at end of file
+            assert mock_pbar.update.call_count == 2  # Two files in our test project
+
+    def test_concurrent_generation(self, generator, temp_project, mock_openai_client):
+        """Test that concurrent mode documents every file in a deterministic order."""
+        generator.config.max_concurrency = 4
+        for i in range(6):
+            (temp_project / "src" / f"module_{i}.py").write_text(f"def func_{i}():\n    pass\n")
+
+        generator.generate_documentation(force_full=True)
+
+        assert mock_openai_client.chat.completions.create.call_count == 8
+        documented = list(generator.doc_builder.documentation.keys())
+        assert documented == sorted(documented)
+
+    def test_parallel_analysis_matches_sequential(self, generator, temp_project):
+        """Test that analyses prepared in worker processes are used unchanged."""
+        generator.config.analysis_workers = 2
+        generator.code_analyzer.cache = None
+        for i in range(6):
+            (temp_project / "src" / f"module_{i}.py").write_text(f"def func_{i}():\n    raise ValueError\n")
+
+        with patch.object(generator.code_analyzer, "prepare",
+                          wraps=generator.code_analyzer.prepare) as prepare:
+            generator.generate_documentation(force_full=True)
+
+        prepare.assert_called_once()
+        assert not generator.code_analyzer._prepared
+        for path, doc in generator.doc_builder.documentation.items():
+            content = (temp_project / path).read_text()
+            expected = CodeAnalyzer().analyze_file(Path(doc["analysis"]["file_path"]), content)
+            assert doc["analysis"] == expected
+
+    def test_concurrent_generation_isolates_errors(self, generator, temp_project):
+        """Test that a failing file does not affect other files in concurrent mode."""
+        generator.config.max_concurrency = 2
+        original_method = generator._document_file
+
+        def mock_document_file(path):
+            if path.name == "app.py":
+                raise Exception("Test error")
+            return original_method(path)
+
+        generator._document_file = mock_document_file
+        generator.generate_documentation(force_full=True)
+
+        assert list(generator.doc_builder.documentation.keys()) == ["src/utils.py"]
+
+    def _interrupt_after_two_files(self, generator, temp_project, mock_openai_client):
+        """Run a full generation of four files that is interrupted after two."""
+        generator.response_cache.enabled = False
+        generator.checkpoint.interval = 1
+        for name in ("config.py", "models.py"):
+            (temp_project / "src" / name).write_text(f"# {name}\nVALUE = 1\n")
+
+        mock_response = mock_openai_client.chat.completions.create.return_value
+        mock_openai_client.chat.completions.create.side_effect = [
+            mock_response, mock_response, KeyboardInterrupt()
+        ]
+        with pytest.raises(KeyboardInterrupt):
+            generator.generate_documentation()
+
+        mock_openai_client.reset_mock()
+        mock_openai_client.chat.completions.create.side_effect = None
+        mock_openai_client.chat.completions.create.return_value = mock_response
+
+    def test_interrupted_run_can_be_resumed(self, generator, temp_project, mock_openai_client):
+        """Test that a resumed run only documents the files not completed before."""
+        self._interrupt_after_two_files(generator, temp_project, mock_openai_client)
+
+        checkpoint_file = temp_project / ".doc_checkpoint.json"
+        assert checkpoint_file.exists()
+        assert len(json.loads(checkpoint_file.read_text())["files"]) == 2
+        assert not generator.change_tracker.has_previous_run()
+
+        generator.generate_documentation(resume=True)
+
+        assert mock_openai_client.chat.completions.create.call_count == 2
+        assert len(generator.doc_builder.documentation) == 4
+        assert len(generator.change_tracker._state["files"]) == 4
+        assert not checkpoint_file.exists()
+
+    def test_resume_redocuments_changed_files(self, generator, temp_project, mock_openai_client):
+        """Test that completed files edited after the interruption are documented again."""
+        self._interrupt_after_two_files(generator, temp_project, mock_openai_client)
+        (temp_project / "src" / "app.py").write_text("# Rewritten after the interruption\n")
+
+        generator.generate_documentation(resume=True)
+
+        assert mock_openai_client.chat.completions.create.call_count == 3
+
+    def test_checkpoint_discarded_without_resume(self, generator, temp_project, mock_openai_client):
+        """Test that a run without --resume starts over."""
+        self._interrupt_after_two_files(generator, temp_project, mock_openai_client)
+
+        generator.generate_documentation()
+
+        assert mock_openai_client.chat.completions.create.call_count == 4
+        assert not (temp_project / ".doc_checkpoint.json").exists()
+
+    def test_full_rebuild_uses_response_cache(self, generator, temp_project, mock_openai_client):
+        """Test that a second full run of unchanged files makes no API calls."""
+        generator.generate_documentation(force_full=True)
+        assert mock_openai_client.chat.completions.create.call_count == 2
+
+        mock_openai_client.reset_mock()
+        generator.generate_documentation(force_full=True)
+
+        assert mock_openai_client.chat.completions.create.call_count == 0
+        assert len(generator.doc_builder.documentation) == 2
+
+    def test_full_rebuild_without_cache(self, generator, temp_project, mock_openai_client):
+        """Test that disabling the cache sends every request to the API."""
+        generator.response_cache.enabled = False
+        generator.generate_documentation(force_full=True)
+        generator.generate_documentation(force_full=True)
+
+        assert mock_openai_client.chat.completions.create.call_count == 4
+
+    def test_rate_limited_request_is_retried(self, generator, temp_project, mock_openai_client):
+        """Test that a 429 response is retried instead of dropping the file."""
+        rate_limit_error = Exception("Rate limit reached")
+        rate_limit_error.status_code = 429
+        rate_limit_error.response = Mock(headers={"retry-after": "0"})
+
+        mock_response = mock_openai_client.chat.completions.create.return_value
+        mock_openai_client.chat.completions.create.side_effect = [rate_limit_error, mock_response]
+
+        result = generator._document_file(temp_project / "src" / "app.py")
+
+        assert result is not None
+        assert mock_openai_client.chat.completions.create.call_count == 2
+        assert generator.rate_limiter.stats()["retries"] == 1
+
+    def test_symbol_level_updates(self, generator, temp_project, mock_openai_client):
+        """Test that only changed symbols are re-documented and spliced in."""
+        generator.config.symbol_level_updates = True
+        mock_openai_client.chat.completions.create.return_value.choices[0].message.content = (
+            "# App\n\n## Class `App`\nApp docs.\n\n### `run()`\nOld run docs."
+        )
+        generator.generate_documentation()
+        assert mock_openai_client.chat.completions.create.call_count == 2
+
+        mock_openai_client.reset_mock()
+        mock_openai_client.chat.completions.create.return_value.choices[0].message.content = (
+            "New run docs."
+        )
+        app_file = temp_project / "src" / "app.py"
+        app_file.write_text(app_file.read_text().replace("pass", "return 42"))
+
+        generator.generate_documentation()
+
+        assert mock_openai_client.chat.completions.create.call_count == 1
+        prompt = mock_openai_client.chat.completions.create.call_args.kwargs["messages"][1]["content"]
+        assert "`App.run`" in prompt
+        assert "return 42" in prompt
+
+        documentation = generator.doc_builder.documentation["src/app.py"]["documentation"]
+        assert "App docs." in documentation
+        assert "New run docs." in documentation
+        assert "Old run docs." not in documentation
+
+    def test_class_update_keeps_method_sections(self, generator, temp_project, mock_openai_client):
+        """Test that re-documenting a class does not drop the sections of its methods."""
+        generator.config.symbol_level_updates = True
+        mock_openai_client.chat.completions.create.return_value.choices[0].message.content = (
+            "# Application Module\n\n## Class `App`\nOld app docs.\n\n### `run()`\nRun docs."
+        )
+        generator.generate_documentation()
+
+        mock_openai_client.reset_mock()
+        mock_openai_client.chat.completions.create.return_value.choices[0].message.content = (
+            "New app docs."
+        )
+        app_file = temp_project / "src" / "app.py"
+        app_file.write_text(app_file.read_text().replace("Main application class.", "The application."))
+
+        generator.generate_documentation()
+
+        assert mock_openai_client.chat.completions.create.call_count == 1
+        documentation = generator.doc_builder.documentation["src/app.py"]["documentation"]
+        assert "New app docs." in documentation
+        assert "Old app docs." not in documentation
+        assert "### `run()`\nRun docs." in documentation
+
+    def test_empty_symbol_section_keeps_previous_docs(self, generator, temp_project, mock_openai_client):
+        """Test that a symbol documented as empty keeps its section and is retried."""
+        generator.config.symbol_level_updates = True
+        completion = mock_openai_client.chat.completions.create.return_value.choices[0].message
+        completion.content = "# App\n\n## Class `App`\nApp docs.\n\n### `run()`\nOld run docs."
+        generator.generate_documentation()
+
+        mock_openai_client.reset_mock()
+        completion.content = ""
+        app_file = temp_project / "src" / "app.py"
+        app_file.write_text(app_file.read_text().replace("pass", "return 42"))
+        generator.generate_documentation()
+
+        assert mock_openai_client.chat.completions.create.call_count == 1
+        assert "Old run docs." in generator.doc_builder.documentation["src/app.py"]["documentation"]
+
+        mock_openai_client.reset_mock()
+        completion.content = "New run docs."
+        generator.generate_documentation()
+
+        assert mock_openai_client.chat.completions.create.call_count == 1
+        documentation = generator.doc_builder.documentation["src/app.py"]["documentation"]
+        assert "New run docs." in documentation
+        assert "Old run docs." not in documentation
+
+    def test_missing_symbol_source_documents_whole_file(self, generator, temp_project, mock_openai_client):
+        """Test that a changed symbol whose source is not found re-documents the whole file."""
+        generator.config.symbol_level_updates = True
+        completion = mock_openai_client.chat.completions.create.return_value.choices[0].message
+        completion.content = "# App\n\n## Class `App`\nApp docs.\n\n### `run()`\nOld run docs."
+        generator.generate_documentation()
+
+        mock_openai_client.reset_mock()
+        completion.content = "# App\n\nWhole file docs."
+        app_file = temp_project / "src" / "app.py"
+        app_file.write_text(app_file.read_text().replace("pass", "return 42"))
+        with patch.object(generator.symbol_tracker, "get_symbol_source", return_value=None):
+            generator.generate_documentation()
+
+        prompt = mock_openai_client.chat.completions.create.call_args.kwargs["messages"][1]["content"]
+        assert "File Path:" in prompt
+        assert generator.doc_builder.documentation["src/app.py"]["documentation"] == "# App\n\nWhole file docs."
+
+    def test_public_api_change_redocuments_importers(self, generator, temp_project, mock_openai_client):
+        """Test that importers are re-documented only when a used public API changes."""
+        app_file = temp_project / "src" / "app.py"
+        utils_file = temp_project / "src" / "utils.py"
+        app_file.write_text("from src.utils import helper\n\n" + app_file.read_text())
+        generator.generate_documentation()
+        assert mock_openai_client.chat.completions.create.call_count == 2
+
+        # Changing a body keeps the API: only utils.py is documented
+        mock_openai_client.reset_mock()
+        utils_file.write_text(utils_file.read_text().replace("return True", "return 1 == 1"))
+        generator.generate_documentation()
+        assert mock_openai_client.chat.completions.create.call_count == 1
+
+        # Changing the signature also re-documents app.py with the new API
+        mock_openai_client.reset_mock()
+        utils_file.write_text(utils_file.read_text().replace("def helper()", "def helper(verbose=False)"))
+        generator.generate_documentation()
+
+        assert mock_openai_client.chat.completions.create.call_count == 2
+        prompts = [call.kwargs["messages"][1]["content"]
+                   for call in mock_openai_client.chat.completions.create.call_args_list]
+        app_prompt = next(p for p in prompts if "src/app.py" in p)
+        assert "Project APIs Used:" in app_prompt
+        assert "def helper(verbose=...)" in app_prompt
+
+    def test_dependency_api_context(self, generator, temp_project, mock_openai_client):
+        """Test that imported APIs are only added to every prompt when enabled."""
+        app_file = temp_project / "src" / "app.py"
+        app_file.write_text("from src.utils import helper\n\n" + app_file.read_text())
+
+        def app_prompt():
+            prompts = [call.kwargs["messages"][1]["content"]
+                       for call in mock_openai_client.chat.completions.create.call_args_list]
+            return next(p for p in prompts if "src/app.py" in p)
+
+        generator.generate_documentation()
+        assert "Project APIs Used:" not in app_prompt()
+
+        mock_openai_client.reset_mock()
+        generator.config.dependency_api_context = True
+        generator.generate_documentation(force_full=True)
+        assert "def helper()" in app_prompt()
+
+    def test_dependents_not_invalidated_when_disabled(self, generator, temp_project, mock_openai_client):
+        """Test that invalidate_dependents=False only documents changed files."""
+        generator.config.invalidate_dependents = False
+        app_file = temp_project / "src" / "app.py"
+        utils_file = temp_project / "src" / "utils.py"
+        app_file.write_text("from src.utils import helper\n\n" + app_file.read_text())
+        generator.generate_documentation()
+
+        mock_openai_client.reset_mock()
+        utils_file.write_text(utils_file.read_text().replace("def helper()", "def helper(verbose=False)"))
+        generator.generate_documentation()
+
+        assert mock_openai_client.chat.completions.create.call_count == 1
+
+    def test_batch_mode_full_run(self, generator, temp_project, mock_openai_client):
+        """Test that batch mode documents every file without synchronous requests."""
+        prompts = []
+
+        def respond(body):
+            prompts.append(body["messages"][1]["content"])
+            return "Batch documentation"
+
+        generator.config.batch_mode = True
+        generator.config.batch_poll_interval = 0
+        generator.batch_backend = LocalBatchBackend(temp_project / "batches", respond=respond)
+        generator.generate_documentation(force_full=True)
+
+        assert mock_openai_client.chat.completions.create.call_count == 0
+        assert len(prompts) == 2
+        assert len(generator.doc_builder.documentation) == 2
+        assert all(doc["documentation"] == "Batch documentation"
+                   for doc in generator.doc_builder.documentation.values())
+        assert generator.token_usage.stats()["requests"] == 2
+        assert not list((temp_project / ".doc_cache" / "batches").iterdir())
+        assert not list((temp_project / "batches").iterdir())
+
+        # Cached responses are not submitted again
+        prompts.clear()
+        generator.generate_documentation(force_full=True)
+        assert prompts == []
+
+    def test_batch_mode_failed_requests_sent_individually(self, generator, temp_project,
+                                                          mock_openai_client):
+        """Test that requests the batch failed to complete fall back to the API."""
+        def respond(body):
+            if "src/utils.py" in body["messages"][1]["content"]:
+                raise RuntimeError("Request failed")
+            return "Batch documentation"
+
+        generator.config.batch_mode = True
+        generator.batch_backend = LocalBatchBackend(temp_project / "batches", respond=respond)
+        generator.config.use_cache = generator.response_cache.enabled = False
+        generator.generate_documentation(force_full=True)
+
+        assert mock_openai_client.chat.completions.create.call_count == 1
+        docs = {Path(path).name: doc["documentation"]
+                for path, doc in generator.doc_builder.documentation.items()}
+        assert docs == {"app.py": "Batch documentation", "utils.py": "Generated documentation content"}
+
+    def test_batch_submitted_before_interruption_is_collected(self, generator, temp_project,
+                                                             mock_openai_client):
+        """Test that a rerun collects a pending batch instead of submitting it again."""
+        backend = LocalBatchBackend(temp_project / "batches")
+        generator.config.batch_mode = True
+        generator.config.batch_poll_interval = 0
+        generator.batch_backend = backend
+
+        # Interrupt the run while it waits for the batch
+        with patch.object(backend, "status", side_effect=KeyboardInterrupt):
+            with pytest.raises(KeyboardInterrupt):
+                generator.generate_documentation(force_full=True)
+        (batch_input,) = (temp_project / "batches").glob("*.input.jsonl")
+        batch_id = batch_input.name.split(".")[0]
+        backend.complete(batch_id, lambda body: "Batch documentation")
+
+        with patch.object(backend, "submit") as submit:
+            generator.generate_documentation(force_full=True)
+
+        submit.assert_not_called()
+        assert mock_openai_client.chat.completions.create.call_count == 0
+        assert len(generator.doc_builder.documentation) == 2
@@ -0,0 +1,149 @@
+"""
+Tests for the sharded documentation store module.
+"""
+
+import json
+from unittest.mock import patch
+
+import pytest
+
+from ai_doc_generator.doc_store import (
+    DOC_STORE_DIR, ShardedDocumentationStore, open_documentation_store
+)
+from ai_doc_generator.records import FunctionRecord
+
+
+def make_entry(name, documentation="Docs"):
+    """Build a documentation entry."""
+    return {
+        "path": f"src/{name}.py",
+        "analysis": {"functions": [{"name": name, "line": 1, "args": []}], "loc": 3},
+        "documentation": documentation,
+    }
+
+
+class TestShardedDocumentationStore:
+    """Test cases for the ShardedDocumentationStore class."""
+
+    @pytest.fixture
+    def store_dir(self, tmp_path):
+        """Get the store directory."""
+        return tmp_path / DOC_STORE_DIR
+
+    @pytest.fixture
+    def saved_store(self, store_dir):
+        """Create a store with two saved entries."""
+        store = ShardedDocumentationStore(store_dir)
+        store["src/a.py"] = make_entry("a")
+        store["src/b.py"] = make_entry("b")
+        assert store.save() == 2
+        return store
+
+    def shard_files(self, store_dir):
+        """List the shard files of a store."""
+        return sorted(p.name for p in (store_dir / "shards").rglob("*.json"))
+
+    def test_round_trip(self, saved_store, store_dir):
+        """Test that saved entries are read back."""
+        reopened = ShardedDocumentationStore(store_dir)
+
+        assert reopened.load()
+        assert list(reopened) == ["src/a.py", "src/b.py"]
+        assert reopened["src/a.py"] == make_entry("a")
+        assert "src/b.py" in reopened
+        assert len(self.shard_files(store_dir)) == 2
+
+    def test_missing_store(self, store_dir):
+        """Test opening a store that was never saved."""
+        store = ShardedDocumentationStore(store_dir)
+
+        assert not store.load()
+        assert len(store) == 0
+        with pytest.raises(KeyError):
+            store["src/a.py"]
+
+    def test_entries_read_on_first_access(self, saved_store, store_dir):
+        """Test that opening the store only reads the manifest."""
+        reopened = ShardedDocumentationStore(store_dir)
+        with patch("ai_doc_generator.doc_store.json.load", wraps=json.load) as load:
+            reopened.load()
+            assert load.call_count == 1
+
+            reopened["src/a.py"]
+            reopened["src/a.py"]
+            assert load.call_count == 2
+
+    def test_save_writes_changed_entries_only(self, saved_store, store_dir):
+        """Test that saving writes the shards of assigned entries and drops replaced ones."""
+        reopened = ShardedDocumentationStore(store_dir)
+        reopened.load()
+        before = self.shard_files(store_dir)
+
+        reopened["src/a.py"] = make_entry("a", documentation="Updated")
+        reopened["src/b.py"] = make_entry("b")
+
+        assert reopened.save() == 1
+        after = self.shard_files(store_dir)
+        assert len(after) == 2
+        assert len(set(before) & set(after)) == 1
+
+        final = ShardedDocumentationStore(store_dir)
+        final.load()
+        assert final["src/a.py"]["documentation"] == "Updated"
+
+    def test_deleted_entries_are_removed(self, saved_store, store_dir):
+        """Test that deleting an entry removes its shard on save."""
+        del saved_store["src/a.py"]
+        saved_store.save()
+
+        reopened = ShardedDocumentationStore(store_dir)
+        reopened.load()
+        assert list(reopened) == ["src/b.py"]
+        assert len(self.shard_files(store_dir)) == 1
+
+    def test_new_store_replaces_previous_entries(self, saved_store, store_dir):
+        """Test that saving a store built from scratch drops entries it does not hold."""
+        store = ShardedDocumentationStore(store_dir)
+        store["src/b.py"] = make_entry("b")
+
+        assert store.save() == 0
+        assert len(self.shard_files(store_dir)) == 1
+
+    def test_compact_entries(self, saved_store, store_dir):
+        """Test that analyses are read as records when compact is set."""
+        reopened = ShardedDocumentationStore(store_dir, compact=True)
+        reopened.load()
+
+        function = reopened["src/a.py"]["analysis"]["functions"][0]
+        assert isinstance(function, FunctionRecord)
+        assert reopened["src/a.py"] == make_entry("a")
+
+        # Records are saved in their dictionary form
+        reopened["src/a.py"] = reopened["src/a.py"]
+        assert reopened.save() == 0
+        plain = ShardedDocumentationStore(store_dir)
+        plain.load()
+        assert plain["src/a.py"]["analysis"]["functions"][0] == {"name": "a", "line": 1, "args": []}
+
+
+class TestOpenDocumentationStore:
+    """Test cases for opening and migrating the store."""
+
+    def test_migrates_documentation_json(self, tmp_path):
+        """Test that an existing documentation.json is imported once."""
+        legacy = {"src/a.py": make_entry("a"), "src/b.py": make_entry("b")}
+        (tmp_path / "documentation.json").write_text(json.dumps(legacy))
+
+        store = open_documentation_store(tmp_path)
+
+        assert dict(store) == legacy
+        assert not (tmp_path / "documentation.json").exists()
+        assert (tmp_path / "documentation.json.migrated").exists()
+        assert dict(open_documentation_store(tmp_path)) == legacy
+
+    def test_empty_output_directory(self, tmp_path):
+        """Test opening the store of an output directory without documentation."""
+        store = open_documentation_store(tmp_path)
+
+        assert len(store) == 0
+        assert not store.manifest_path.exists()
@@ -0,0 +1,65 @@
+"""
+Tests for the hashing module.
+"""
+
+import hashlib
+from unittest.mock import patch
+
+import pytest
+
+from ai_doc_generator import hashing
+from ai_doc_generator.hashing import hash_file, available_algorithms
+
+
+class TestHashFile:
+    """Test cases for hash_file."""
+
+    @pytest.fixture
+    def small_file(self, tmp_path):
+        """Create a file smaller than one chunk."""
+        path = tmp_path / "small.py"
+        path.write_bytes(b"print('hello')\n")
+        return path
+
+    @pytest.fixture
+    def large_file(self, tmp_path):
+        """Create a file spanning several chunks."""
+        path = tmp_path / "large.py"
+        path.write_bytes(bytes(range(256)) * (3 * hashing.CHUNK_SIZE // 256 + 7))
+        return path
+
+    def test_sha256_matches_hashlib(self, small_file, large_file):
+        """Test that streamed SHA-256 digests match hashing the whole content."""
+        for path in (small_file, large_file):
+            expected = hashlib.sha256(path.read_bytes()).hexdigest()
+            assert hash_file(path, "sha256") == expected
+
+    def test_blake2b_matches_hashlib(self, large_file):
+        """Test the BLAKE2b digest and its length."""
+        expected = hashlib.blake2b(large_file.read_bytes(), digest_size=32).hexdigest()
+        assert hash_file(large_file, "blake2b") == expected
+        assert len(expected) == 64
+
+    def test_chunked_fallback(self, large_file):
+        """Test hashing when the file cannot be memory-mapped."""
+        expected = hashlib.sha256(large_file.read_bytes()).hexdigest()
+        with patch("ai_doc_generator.hashing.mmap.mmap", side_effect=OSError("no mmap")):
+            assert hash_file(large_file, "sha256") == expected
+
+    def test_empty_file(self, tmp_path):
+        """Test hashing an empty file."""
+        path = tmp_path / "empty.py"
+        path.write_bytes(b"")
+        assert hash_file(path, "sha256") == hashlib.sha256(b"").hexdigest()
+
+    def test_unknown_algorithm(self, small_file):
+        """Test that an unknown algorithm is rejected."""
+        with pytest.raises(ValueError):
+            hash_file(small_file, "md4")
+
+    def test_available_algorithms(self):
+        """Test that the built-in algorithms are always available."""
+        algorithms = available_algorithms()
+        assert "sha256" in algorithms
+        assert "blake2b" in algorithms
+        assert ("xxh3" in algorithms) == (hashing.xxhash is not None)
@@ -0,0 +1,129 @@
+"""
+Tests for the import graph module.
+"""
+
+import pytest
+
+from ai_doc_generator.code_analyzer import CodeAnalyzer
+from ai_doc_generator.import_graph import ImportGraph
+
+
+class TestImportGraph:
+    """Test cases for the ImportGraph class."""
+
+    @pytest.fixture
+    def project(self, tmp_path):
+        """Create a src-layout project with a package and a top-level script."""
+        package = tmp_path / "src" / "pkg"
+        (package / "sub").mkdir(parents=True)
+        (package / "__init__.py").write_text("")
+        (package / "sub" / "__init__.py").write_text("")
+        (package / "core.py").write_text("def run(x):\n    return x\n")
+        (package / "util.py").write_text("def helper():\n    pass\n")
+        (package / "sub" / "leaf.py").write_text("")
+        (tmp_path / "script.py").write_text("")
+        return tmp_path
+
+    @pytest.fixture
+    def graph(self, project):
+        """Create a graph knowing the project's files."""
+        graph = ImportGraph(project)
+        graph.add_modules([
+            "src/pkg/core.py", "src/pkg/util.py", "src/pkg/sub/leaf.py", "script.py"
+        ])
+        return graph
+
+    def _analyze(self, source):
+        return CodeAnalyzer().analyze_file("module.py", source)
+
+    def test_module_names(self, graph):
+        """Test the names under which files can be imported."""
+        assert graph.module_names("src/pkg/core.py") == ["pkg.core", "src.pkg.core"]
+        assert graph.module_names("src/pkg/__init__.py") == ["pkg", "src.pkg"]
+        assert graph.module_names("script.py") == ["script"]
+
+    def test_resolve_absolute_imports(self, graph):
+        """Test resolving absolute imports to project files."""
+        analysis = self._analyze(
+            "import os\n"
+            "import pkg.util\n"
+            "from pkg.core import run\n"
+            "from pkg.sub import leaf\n"
+            "import requests\n"
+        )
+
+        assert graph.resolve_imports("script.py", analysis) == [
+            "src/pkg/core.py", "src/pkg/sub/leaf.py", "src/pkg/util.py"
+        ]
+
+    def test_resolve_relative_imports(self, graph):
+        """Test resolving relative imports against the importing package."""
+        analysis = self._analyze(
+            "from .core import run\n"
+            "from . import util\n"
+            "from ..missing import thing\n"
+        )
+        assert graph.resolve_imports("src/pkg/sub/leaf.py", self._analyze("from ..core import run\n")) == [
+            "src/pkg/core.py"
+        ]
+        assert graph.resolve_imports("src/pkg/sub/leaf.py", self._analyze("from ...x import y\n")) == []
+        assert graph.resolve_imports("src/pkg/__init__.py", analysis) == [
+            "src/pkg/core.py", "src/pkg/util.py"
+        ]
+
+    def test_update_detects_public_api_changes(self, graph):
+        """Test that only public signature changes count as API changes."""
+        assert not graph.update("src/pkg/core.py", self._analyze("def run(x):\n    return x\n"))
+
+        # Body and private changes keep the API
+        assert not graph.update("src/pkg/core.py", self._analyze(
+            "def run(x):\n    return x * 2\n\ndef _private(y):\n    pass\n"
+        ))
+        # A new parameter changes it
+        assert graph.update("src/pkg/core.py", self._analyze("def run(x, y=1):\n    return x\n"))
+
+    def test_dependents(self, graph):
+        """Test finding the direct importers of a file."""
+        graph.update("script.py", self._analyze("from pkg.core import run\n"))
+        graph.update("src/pkg/util.py", self._analyze("from .core import run\n"))
+        graph.update("src/pkg/sub/leaf.py", self._analyze("from pkg import util\n"))
+
+        assert graph.dependents("src/pkg/core.py") == ["script.py", "src/pkg/util.py"]
+        assert graph.dependents("src/pkg/util.py") == ["src/pkg/sub/leaf.py"]
+
+    def test_round_trip_and_retain(self, graph, project):
+        """Test persisting the graph and dropping files from it."""
+        graph.update("script.py", self._analyze("from pkg.core import run\n"))
+        graph.update("src/pkg/core.py", self._analyze("def run(x):\n    pass\n"))
+
+        restored = ImportGraph(project, graph.to_dict())
+        assert restored.dependents("src/pkg/core.py") == ["script.py"]
+
+        restored.retain(["src/pkg/core.py"])
+        assert restored.to_dict() == {"imports": {"src/pkg/core.py": []},
+                                      "api": {"src/pkg/core.py": graph.api_hashes["src/pkg/core.py"]}}
+
+    def test_public_api(self):
+        """Test the public API summary."""
+        analysis = self._analyze(
+            "MAX_SIZE = 10\n"
+            "class Store(Base):\n"
+            "    def __init__(self, path: str):\n"
+            "        pass\n"
+            "    def get(self, key, default=None) -> str:\n"
+            "        pass\n"
+            "    def _load(self):\n"
+            "        pass\n"
+            "class _Hidden:\n"
+            "    pass\n"
+            "async def fetch(*urls, **options):\n"
+            "    pass\n"
+        )
+
+        assert ImportGraph.public_api(analysis) == [
+            "async def fetch(*urls, **options)",
+            "class Store(Base)",
+            "    def __init__(self, path: str)",
+            "    def get(self, key, default=...) -> str",
+            "MAX_SIZE",
+        ]
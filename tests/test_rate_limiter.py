@@ -0,0 +1,175 @@
+"""
+Tests for the rate limiter module.
+"""
+
+from unittest.mock import Mock
+
+import pytest
+
+from ai_doc_generator.rate_limiter import RateLimiter, TokenBucket
+
+
+class FakeClock:
+    """Manually advanced clock whose sleep() moves time forward."""
+
+    def __init__(self):
+        self.now = 0.0
+        self.sleeps = []
+
+    def __call__(self):
+        return self.now
+
+    def sleep(self, seconds):
+        self.sleeps.append(seconds)
+        self.now += seconds
+
+
+class APIError(Exception):
+    """Stand-in for an API error carrying a status code and response headers."""
+
+    def __init__(self, status_code, headers=None):
+        super().__init__(f"HTTP {status_code}")
+        self.status_code = status_code
+        self.response = Mock(headers=headers or {})
+
+
+class TestTokenBucket:
+    """Test cases for the TokenBucket class."""
+
+    def test_reserve_within_capacity(self):
+        """Test that reservations within capacity do not wait."""
+        clock = FakeClock()
+        bucket = TokenBucket(capacity=10, refill_per_second=1, clock=clock)
+
+        assert bucket.reserve(4) == 0.0
+        assert bucket.reserve(6) == 0.0
+
+    def test_reserve_beyond_capacity_waits(self):
+        """Test that an exhausted bucket reports the wait until refill."""
+        clock = FakeClock()
+        bucket = TokenBucket(capacity=10, refill_per_second=2, clock=clock)
+
+        bucket.reserve(10)
+        assert bucket.reserve(4) == pytest.approx(2.0)
+        # Debt accumulates for queued callers
+        assert bucket.reserve(2) == pytest.approx(3.0)
+
+    def test_refill(self):
+        """Test that tokens are refilled over time."""
+        clock = FakeClock()
+        bucket = TokenBucket(capacity=10, refill_per_second=1, clock=clock)
+
+        bucket.reserve(10)
+        clock.now += 5
+        assert bucket.reserve(5) == 0.0
+
+
+class TestRateLimiter:
+    """Test cases for the RateLimiter class."""
+
+    @pytest.fixture
+    def clock(self):
+        """Create a fake clock."""
+        return FakeClock()
+
+    def make_limiter(self, clock, **kwargs):
+        """Create a RateLimiter driven by the fake clock."""
+        return RateLimiter(sleep=clock.sleep, clock=clock, **kwargs)
+
+    def test_unlimited_by_default(self, clock):
+        """Test that no waiting happens without configured budgets."""
+        limiter = self.make_limiter(clock)
+
+        for _ in range(100):
+            limiter.acquire(10000)
+
+        assert clock.sleeps == []
+        assert limiter.stats()["throttled_waits"] == 0
+
+    def test_requests_per_minute(self, clock):
+        """Test that the request budget throttles callers."""
+        limiter = self.make_limiter(clock, requests_per_minute=60)
+
+        for _ in range(61):
+            limiter.acquire()
+
+        assert clock.sleeps == [pytest.approx(1.0)]
+        assert limiter.stats()["throttled_waits"] == 1
+
+    def test_tokens_per_minute(self, clock):
+        """Test that the token budget throttles callers."""
+        limiter = self.make_limiter(clock, tokens_per_minute=6000)
+
+        limiter.acquire(6000)
+        limiter.acquire(100)
+
+        assert clock.sleeps == [pytest.approx(1.0)]
+
+    def test_retries_with_retry_after(self, clock):
+        """Test that Retry-After headers set the retry delay."""
+        limiter = self.make_limiter(clock, max_retries=3)
+        func = Mock(side_effect=[APIError(429, {"retry-after": "7"}), "ok"])
+
+        assert limiter.call(func) == "ok"
+        assert clock.sleeps == [7.0]
+        assert limiter.stats()["retries"] == 1
+
+    def test_retry_after_ms_header(self, clock):
+        """Test that the millisecond Retry-After header is preferred."""
+        limiter = self.make_limiter(clock)
+        func = Mock(side_effect=[APIError(429, {"retry-after-ms": "250", "retry-after": "1"}), "ok"])
+
+        limiter.call(func)
+
+        assert clock.sleeps == [0.25]
+
+    def test_rate_limit_pauses_other_callers(self, clock):
+        """Test that a 429 holds back subsequent requests as well."""
+        limiter = self.make_limiter(clock)
+        clock.sleep = Mock()  # Do not advance time during the retry
+        limiter._sleep = clock.sleep
+
+        limiter.call(Mock(side_effect=[APIError(429, {"retry-after": "5"}), "ok"]))
+        limiter.acquire()
+
+        assert limiter.stats()["throttled_waits"] == 2
+
+    def test_exponential_backoff_is_bounded(self, clock):
+        """Test that jittered backoff never exceeds the exponential bound."""
+        limiter = self.make_limiter(clock, max_retries=4, base_delay=1.0, max_delay=3.0)
+        func = Mock(side_effect=[APIError(503)] * 4 + ["ok"])
+
+        assert limiter.call(func) == "ok"
+        bounds = [1.0, 2.0, 3.0, 3.0]
+        assert all(0 <= delay <= bound for delay, bound in zip(clock.sleeps, bounds))
+
+    def test_gives_up_after_max_retries(self, clock):
+        """Test that the last error is raised once retries are exhausted."""
+        limiter = self.make_limiter(clock, max_retries=2)
+        func = Mock(side_effect=APIError(500))
+
+        with pytest.raises(APIError):
+            limiter.call(func)
+
+        assert func.call_count == 3
+        assert limiter.stats()["retries"] == 2
+        assert limiter.stats()["failures"] == 1
+
+    def test_non_retryable_errors_fail_immediately(self, clock):
+        """Test that client errors are not retried."""
+        limiter = self.make_limiter(clock)
+        func = Mock(side_effect=ValueError("bad request"))
+
+        with pytest.raises(ValueError):
+            limiter.call(func)
+
+        assert func.call_count == 1
+        assert limiter.stats()["failures"] == 1
+
+    def test_retryable_exception_types(self, clock):
+        """Test that listed exception types are retried without a status code."""
+        limiter = self.make_limiter(clock)
+        func = Mock(side_effect=[ConnectionError("reset"), "ok"])
+
+        assert limiter.call(func, retryable=(ConnectionError,)) == "ok"
+        assert limiter.stats()["retries"] == 1
@@ -0,0 +1,106 @@
+"""
+Tests for the analysis record types.
+"""
+
+import json
+import pickle
+from pathlib import Path
+
+import pytest
+
+from ai_doc_generator.code_analyzer import CodeAnalyzer
+from ai_doc_generator.records import (
+    ClassRecord, FunctionRecord, ImportRecord, compact_analysis, json_default
+)
+
+
+SOURCE = '''
+"""Sample module."""
+
+import os
+from typing import List as L
+from . import sibling
+
+MAX_ITEMS = 10
+
+
+class Store(Base, metaclass=Meta):
+    """A store."""
+
+    limit: int = 5
+
+    @property
+    def size(self) -> int:
+        return 0
+
+    @classmethod
+    def create(cls, *items: str, **options) -> "Store":
+        raise ValueError("no")
+
+
+async def fetch(url: str, retries=3):
+    yield url
+'''
+
+
+class TestRecords:
+    """Test cases for the record types."""
+
+    @pytest.fixture
+    def analysis(self):
+        """Analyze the sample module."""
+        return CodeAnalyzer().analyze_file(Path("sample.py"), SOURCE)
+
+    def test_round_trip_preserves_dictionary_form(self, analysis):
+        """Test that records convert back to exactly the analyzer's dictionaries."""
+        compact = compact_analysis(analysis)
+
+        assert isinstance(compact["classes"][0], ClassRecord)
+        assert isinstance(compact["classes"][0]["methods"][0], FunctionRecord)
+        assert all(isinstance(imp, ImportRecord) for imp in compact["imports"])
+        assert compact == analysis
+        assert json.loads(json.dumps(compact, default=json_default)) == analysis
+
+    def test_mapping_access(self, analysis):
+        """Test that records support the dictionary operations used by consumers."""
+        func = compact_analysis(analysis)["functions"][0]
+
+        assert func["name"] == "fetch"
+        assert func.get("is_classmethod") is None
+        assert "is_classmethod" not in func
+        assert func["args"][1].get("annotation") is None
+        assert func["args"][1]["has_default"] is True
+        with pytest.raises(KeyError):
+            func["is_classmethod"]
+
+    def test_records_are_compact_and_read_only(self, analysis):
+        """Test that records have no instance dictionary and reject item assignment."""
+        cls = compact_analysis(analysis)["classes"][0]
+
+        assert not hasattr(cls, "__dict__")
+        with pytest.raises(TypeError):
+            cls["file_path"] = "sample.py"
+
+    def test_names_are_interned(self):
+        """Test that equal names share a single string object."""
+        first = FunctionRecord.from_dict({"name": "".join(["get", "_value"])})
+        second = FunctionRecord.from_dict({"name": "".join(["get", "_val", "ue"])})
+
+        assert first["name"] is second["name"]
+
+    def test_records_pickle(self, analysis):
+        """Test that records can be sent to and from worker processes."""
+        compact = compact_analysis(analysis)
+
+        assert pickle.loads(pickle.dumps(compact)) == analysis
+
+    def test_unknown_keys_keep_dictionaries(self):
+        """Test that entries with unexpected keys are kept as dictionaries."""
+        analysis = {"functions": [{"name": "f", "custom": 1}], "classes": [{"name": "C", "file_path": "a.py"}]}
+
+        compact = compact_analysis(analysis)
+
+        assert compact["functions"][0] == {"name": "f", "custom": 1}
+        assert not isinstance(compact["functions"][0], FunctionRecord)
+        # Class file paths tagged by older builders are dropped
+        assert compact["classes"][0] == {"name": "C"}
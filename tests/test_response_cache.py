@@ -0,0 +1,108 @@
+"""
+Tests for the response cache module.
+"""
+
+import os
+import tempfile
+from pathlib import Path
+
+import pytest
+
+from ai_doc_generator.response_cache import ResponseCache
+
+
+class TestResponseCache:
+    """Test cases for the ResponseCache class."""
+
+    @pytest.fixture
+    def cache_dir(self):
+        """Create a temporary cache directory."""
+        with tempfile.TemporaryDirectory() as tmpdir:
+            yield Path(tmpdir) / "cache"
+
+    @pytest.fixture
+    def cache(self, cache_dir):
+        """Create a ResponseCache instance."""
+        return ResponseCache(cache_dir, max_size=1024 * 1024)
+
+    def test_make_key_depends_on_all_inputs(self):
+        """Test that every request parameter contributes to the key."""
+        base = ResponseCache.make_key("gpt-4o", "system", "prompt", 0.3, 2000)
+
+        assert base == ResponseCache.make_key("gpt-4o", "system", "prompt", 0.3, 2000)
+        assert base != ResponseCache.make_key("gpt-4o-mini", "system", "prompt", 0.3, 2000)
+        assert base != ResponseCache.make_key("gpt-4o", "other", "prompt", 0.3, 2000)
+        assert base != ResponseCache.make_key("gpt-4o", "system", "other", 0.3, 2000)
+        assert base != ResponseCache.make_key("gpt-4o", "system", "prompt", 0.5, 2000)
+        assert base != ResponseCache.make_key("gpt-4o", "system", "prompt", 0.3, 1000)
+
+    def test_put_and_get(self, cache):
+        """Test storing and retrieving a response."""
+        key = ResponseCache.make_key("gpt-4o", "system", "prompt", 0.3, 2000)
+
+        assert cache.get(key) is None
+        cache.put(key, "Cached documentation")
+
+        assert cache.get(key) == "Cached documentation"
+        assert cache.hits == 1
+        assert cache.misses == 1
+
+    def test_persists_across_instances(self, cache, cache_dir):
+        """Test that cached responses survive a new cache instance."""
+        cache.put("ab" * 32, "Persisted")
+
+        new_cache = ResponseCache(cache_dir, max_size=1024 * 1024)
+        assert new_cache.get("ab" * 32) == "Persisted"
+
+    def test_disabled_cache(self, cache_dir):
+        """Test that a disabled cache never stores or returns entries."""
+        cache = ResponseCache(cache_dir, max_size=1024 * 1024, enabled=False)
+        cache.put("ab" * 32, "Not stored")
+
+        assert cache.get("ab" * 32) is None
+        assert not cache_dir.exists()
+
+    def test_ignores_non_string_responses(self, cache):
+        """Test that empty responses are not cached."""
+        cache.put("ab" * 32, None)
+        cache.put("cd" * 32, "")
+
+        assert cache.get("ab" * 32) is None
+        assert cache.get("cd" * 32) is None
+
+    def test_prune_evicts_least_recently_used(self, cache):
+        """Test that pruning removes the oldest entries first."""
+        keys = [f"{i:02d}" * 32 for i in range(3)]
+        for i, key in enumerate(keys):
+            cache.put(key, "x" * 100)
+            entry_path = cache._entry_path(key)
+            os.utime(entry_path, (1000 + i, 1000 + i))
+
+        # Reading an entry makes it the most recently used
+        cache.get(keys[0])
+
+        entry_size = cache._entry_path(keys[0]).stat().st_size
+        removed, freed = cache.prune(max_size=entry_size * 2)
+
+        assert removed == 1
+        assert freed == entry_size
+        assert cache.get(keys[0]) is not None
+        assert cache.get(keys[1]) is None
+        assert cache.get(keys[2]) is not None
+
+    def test_clear(self, cache):
+        """Test removing every entry."""
+        cache.put("ab" * 32, "one")
+        cache.put("cd" * 32, "two")
+
+        assert cache.clear() == 2
+        assert cache.get("ab" * 32) is None
+
+    def test_corrupted_entry(self, cache):
+        """Test that an unreadable entry is treated as a miss."""
+        key = "ab" * 32
+        entry_path = cache._entry_path(key)
+        entry_path.parent.mkdir(parents=True)
+        entry_path.write_text("{ invalid json")
+
+        assert cache.get(key) is None
@@ -2,13 +2,17 @@
 Tests for the file scanner module.
 """
 
+import os
+import shutil
+import subprocess
 import tempfile
 from pathlib import Path
+from unittest.mock import patch
 
 import pytest
 
 from ai_doc_generator.config import Config
-from ai_doc_generator.file_scanner import FileScanner
+from ai_doc_generator.file_scanner import FileScanner, PatternMatcher, _glob_to_regex
 
 
 class TestFileScanner:
@@ -233,4 +237,173 @@ def initialize():
         files = scanner.scan_all_files()
         file_paths = [str(f) for f in files]
 
-        assert any("deep_module.py" in path for path in file_paths)
\ No newline at end of file
+        assert any("deep_module.py" in path for path in file_paths)
+
+    def test_multiple_patterns_single_walk(self, temp_project):
+        """Test that several include patterns are matched in one tree traversal."""
+        (temp_project / "src" / "types.pyi").write_text("x: int")
+        (temp_project / "docs" / "guide.md").write_text("# Guide")
+
+        config = Config(
+            project_root=temp_project,
+            include_patterns=["*.py", "*.pyi", "**/*.md"]
+        )
+        scanner = FileScanner(config)
+
+        with patch("ai_doc_generator.file_scanner.os.scandir", wraps=os.scandir) as mock_scandir:
+            files = scanner.scan_all_files()
+
+        scanned_dirs = [call.args[0] for call in mock_scandir.call_args_list]
+        assert len(scanned_dirs) == len(set(scanned_dirs))
+
+        relative = {f.relative_to(temp_project).as_posix() for f in files}
+        assert "main.py" in relative
+        assert "src/types.pyi" in relative
+        assert "README.md" in relative
+        assert "docs/guide.md" in relative
+        assert files == sorted(files)
+
+    def test_path_patterns(self, temp_project):
+        """Test include patterns containing directories."""
+        config = Config(
+            project_root=temp_project,
+            include_patterns=["src/*.py"]
+        )
+        scanner = FileScanner(config)
+
+        files = scanner.scan_all_files()
+        relative = {f.relative_to(temp_project).as_posix() for f in files}
+
+        assert relative == {"src/app.py"}
+
+    def test_glob_to_regex(self):
+        """Test translation of path globs to regular expressions."""
+        import re
+
+        def matches(pattern, path):
+            return re.match(_glob_to_regex(pattern), path) is not None
+
+        assert matches("**/*.py", "main.py")
+        assert matches("**/*.py", "src/models/user.py")
+        assert not matches("**/*.py", "src/models/user.pyc")
+        assert matches("src/**/*.py", "src/a.py")
+        assert matches("src/**/*.py", "src/a/b/c.py")
+        assert not matches("src/**/*.py", "lib/a.py")
+        assert matches("src/*.py", "src/a.py")
+        assert not matches("src/*.py", "src/a/b.py")
+        assert matches("src/?.py", "src/a.py")
+        assert matches("src/[ab].py", "src/b.py")
+        assert not matches("src/[!ab].py", "src/b.py")
+
+    def test_exclude_wildcard_patterns(self, temp_project):
+        """Test that wildcard and literal exclusion patterns are both applied."""
+        (temp_project / "pkg.egg-info").mkdir()
+        (temp_project / "pkg.egg-info" / "meta.py").write_text("# Metadata")
+        (temp_project / "src" / "generated_pb2.py").write_text("# Generated")
+
+        config = Config(
+            project_root=temp_project,
+            exclude_dirs=["*.egg-info", "__pycache__", ".git"],
+            exclude_files=["setup.py", "*_pb2.py"]
+        )
+        scanner = FileScanner(config)
+
+        file_names = [f.name for f in scanner.scan_all_files()]
+
+        assert "meta.py" not in file_names
+        assert "generated_pb2.py" not in file_names
+        assert "setup.py" not in file_names
+        assert "app.py" in file_names
+
+    @pytest.mark.skipif(shutil.which("git") is None, reason="git is not installed")
+    def test_git_discovery(self, temp_project):
+        """Test listing files from the git index."""
+        def git(*args):
+            subprocess.run(["git", *args], cwd=temp_project, capture_output=True, check=True)
+
+        shutil.rmtree(temp_project / ".git")
+        git("init")
+        (temp_project / ".gitignore").write_text("data/\n")
+        (temp_project / "data").mkdir()
+        (temp_project / "data" / "generated.py").write_text("# Ignored")
+        git("add", ".")
+        git("-c", "user.email=test@example.com", "-c", "user.name=Test", "commit", "-m", "init")
+        (temp_project / "src" / "untracked.py").write_text("# Untracked")
+
+        config = Config(project_root=temp_project, discovery="git")
+        scanner = FileScanner(config)
+
+        with patch.object(scanner, "_walk_files") as mock_walk:
+            files = scanner.scan_all_files()
+        mock_walk.assert_not_called()
+
+        relative = {f.relative_to(temp_project).as_posix() for f in files}
+        assert "main.py" in relative
+        assert "src/app.py" in relative
+        assert "src/models/user.py" in relative
+        assert "src/untracked.py" in relative
+        assert "data/generated.py" not in relative  # gitignored
+        assert "setup.py" not in relative  # in exclude_files
+        assert "tests/test_app.py" not in relative  # test file
+
+        # Same rules as the file system walk
+        walked = FileScanner(Config(project_root=temp_project)).scan_all_files()
+        assert set(files) == set(walked) - {temp_project / "data" / "generated.py"}
+
+    def test_git_discovery_falls_back_to_walk(self, temp_project):
+        """Test that discovery falls back to walking outside a git repository."""
+        config = Config(project_root=temp_project, discovery="git")
+        scanner = FileScanner(config)
+
+        files = scanner.scan_all_files()
+        file_names = [f.name for f in files]
+
+        assert "main.py" in file_names
+        assert "user.py" in file_names
+
+    def test_filter_paths(self, temp_project):
+        """Test applying the scanner rules to a list of relative paths."""
+        config = Config(project_root=temp_project)
+        scanner = FileScanner(config)
+
+        files = scanner.filter_paths([
+            "main.py",
+            "src/app.py",
+            "src/app.py",
+            "setup.py",
+            "README.md",
+            "__pycache__/cached.py",
+            "tests/test_app.py",
+            "src/deleted.py",
+        ])
+
+        assert files == [temp_project / "main.py", temp_project / "src" / "app.py"]
+
+
+class TestPatternMatcher:
+    """Test cases for the PatternMatcher class."""
+
+    def test_literal_and_wildcard_patterns(self):
+        """Test matching against literal names and wildcard patterns."""
+        matcher = PatternMatcher(["build", "*.egg-info", "test_?", ".tox"])
+
+        assert matcher.matches("build")
+        assert matcher.matches(".tox")
+        assert matcher.matches("pkg.egg-info")
+        assert matcher.matches("test_a")
+        assert not matcher.matches("builds")
+        assert not matcher.matches("test_ab")
+        assert not matcher.matches("src")
+
+    def test_literals_use_set_lookup(self):
+        """Test that plain names are not compiled into the regex."""
+        matcher = PatternMatcher(["build", "dist"])
+
+        assert matcher.literals == {"build", "dist"}
+        assert matcher._regex is None
+
+    def test_empty_patterns(self):
+        """Test a matcher without patterns."""
+        matcher = PatternMatcher([])
+
+        assert not matcher.matches("anything")
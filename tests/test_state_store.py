@@ -0,0 +1,133 @@
+"""
+Tests for the state store module.
+"""
+
+import json
+import sqlite3
+
+import pytest
+
+from ai_doc_generator.state_store import (
+    JsonStateStore, SqliteStateStore, open_state_store
+)
+
+
+class TestStateStores:
+    """Test cases shared by the JSON and SQLite state stores."""
+
+    @pytest.fixture(params=["json", "sqlite"])
+    def store_factory(self, request, tmp_path):
+        """Create a function opening a store of each backend."""
+        return lambda: open_state_store(tmp_path / ".doc_state.json", request.param)
+
+    def test_empty_state(self, store_factory):
+        """Test the contents of a new store."""
+        store = store_factory()
+
+        assert len(store["files"]) == 0
+        assert store.get("last_run") is None
+        assert store.get("last_commit") is None
+
+    def test_round_trip(self, store_factory):
+        """Test that committed entries and values are read back."""
+        store = store_factory()
+        store["files"]["a.py"] = {"size": 1, "hash": "abc"}
+        store["files"].update({"b.py": {"size": 2}, "c/d.py": {"size": 3}})
+        store["last_commit"] = "0" * 40
+        store.commit()
+        store.close()
+
+        store = store_factory()
+        assert store["files"]["a.py"] == {"size": 1, "hash": "abc"}
+        assert "b.py" in store["files"]
+        assert "missing.py" not in store["files"]
+        assert sorted(store["files"]) == ["a.py", "b.py", "c/d.py"]
+        assert dict(store["files"].items())["c/d.py"] == {"size": 3}
+        assert store["last_commit"] == "0" * 40
+
+    def test_delete_and_reset(self, store_factory):
+        """Test removing entries and resetting the state."""
+        store = store_factory()
+        store["files"]["a.py"] = {"size": 1}
+        store["scan_signature"] = "abc"
+
+        del store["files"]["a.py"]
+        del store["scan_signature"]
+        assert "a.py" not in store["files"]
+        assert "scan_signature" not in store
+
+        store["files"]["b.py"] = {"size": 2}
+        store.reset()
+        assert len(store["files"]) == 0
+        with pytest.raises(KeyError):
+            del store["scan_signature"]
+
+
+class TestSqliteStateStore:
+    """Test cases specific to the SQLite state store."""
+
+    def test_wal_mode(self, tmp_path):
+        """Test that the database is opened in WAL mode."""
+        store = SqliteStateStore(tmp_path / "state.db")
+        mode = store._conn.execute("PRAGMA journal_mode").fetchone()[0]
+
+        assert mode == "wal"
+
+    def test_readers_see_committed_state(self, tmp_path):
+        """Test that another connection only sees committed changes."""
+        writer = SqliteStateStore(tmp_path / "state.db")
+        writer["files"]["a.py"] = {"size": 1}
+        writer.commit()
+        writer["files"]["b.py"] = {"size": 2}
+
+        reader = SqliteStateStore(tmp_path / "state.db")
+        assert sorted(reader["files"]) == ["a.py"]
+
+        writer.commit()
+        assert sorted(reader["files"]) == ["a.py", "b.py"]
+
+    def test_migrates_json_state(self, tmp_path):
+        """Test that an existing JSON state is imported once."""
+        json_state = tmp_path / ".doc_state.json"
+        json_state.write_text(json.dumps({
+            "files": {"a.py": {"size": 1, "hash": "abc"}},
+            "last_run": "2024-01-01T00:00:00",
+            "hash_algorithm": "sha256",
+        }))
+
+        store = open_state_store(json_state, "sqlite")
+
+        assert store.path == tmp_path / ".doc_state.db"
+        assert store["files"]["a.py"] == {"size": 1, "hash": "abc"}
+        assert store["hash_algorithm"] == "sha256"
+        assert not json_state.exists()
+        assert (tmp_path / ".doc_state.json.migrated").exists()
+
+    def test_corrupted_database(self, tmp_path):
+        """Test that a corrupted database is replaced by an empty one."""
+        db_path = tmp_path / "state.db"
+        db_path.write_bytes(b"not a database" * 100)
+
+        store = SqliteStateStore(db_path)
+
+        assert len(store["files"]) == 0
+        with sqlite3.connect(str(db_path)) as conn:
+            assert conn.execute("SELECT COUNT(*) FROM files").fetchone()[0] == 0
+
+    def test_unknown_backend(self, tmp_path):
+        """Test that an unknown backend is rejected."""
+        with pytest.raises(ValueError):
+            open_state_store(tmp_path / ".doc_state.json", "redis")
+
+
+class TestJsonStateStore:
+    """Test cases specific to the JSON state store."""
+
+    def test_invalid_content(self, tmp_path):
+        """Test that a state file without an object starts an empty state."""
+        path = tmp_path / ".doc_state.json"
+        path.write_text("[]")
+
+        store = JsonStateStore(path)
+
+        assert store["files"] == {}
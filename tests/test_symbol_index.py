@@ -0,0 +1,112 @@
+"""
+Tests for the symbol index module.
+"""
+
+import json
+from unittest.mock import patch
+
+import pytest
+
+from ai_doc_generator.records import compact_analysis
+from ai_doc_generator.symbol_index import INDEX_VERSION, SymbolIndex, index_file
+
+
+def make_entry(*functions, classes=(), dependencies=()):
+    """Build a documentation entry."""
+    return {
+        "analysis": {
+            "classes": [{"name": name, "line": 1, "bases": ["BaseModel"]} for name in classes],
+            "functions": [{"name": name, "line": 10, "args": [{"name": "value", "annotation": "int"}],
+                           "returns": "str"} for name in functions],
+            "dependencies": list(dependencies),
+            "decorators_used": ["@property"],
+        },
+        "documentation": "Docs",
+    }
+
+
+class TestIndexFile:
+    """Test cases for indexing one file."""
+
+    def test_index_file(self):
+        """Test that a file's symbols are indexed with their location and signature."""
+        entry = index_file("src/a.py", make_entry("convert", classes=["User"])["analysis"])
+
+        user, convert = entry.symbols
+        assert (user.name, user.kind, user.file_path, user.line) == ("User", "class", "src/a.py", 1)
+        assert user.bases == ("BaseModel",)
+        assert convert.signature == "convert(value: int) -> str"
+        assert entry.decorators == ("@property",)
+        assert entry.abstract_bases
+
+    def test_index_compact_analysis(self):
+        """Test that analyses held as records are indexed like dictionaries."""
+        analysis = make_entry("convert", classes=["User"])["analysis"]
+
+        assert index_file("src/a.py", compact_analysis(analysis)) == index_file("src/a.py", analysis)
+
+
+class TestSymbolIndex:
+    """Test cases for the SymbolIndex class."""
+
+    @pytest.fixture
+    def documentation(self):
+        """Create documentation for three files."""
+        return {
+            "src/b.py": make_entry("load", "save", dependencies=["requests"]),
+            "src/a.py": make_entry("load", classes=["Store"], dependencies=["yaml"]),
+            "src/c.py": make_entry(),
+        }
+
+    @pytest.fixture
+    def index(self, documentation):
+        """Create an index of the documentation."""
+        index = SymbolIndex()
+        assert index.refresh(documentation, None)
+        return index
+
+    def test_queries(self, index):
+        """Test sorting, counts and dependencies."""
+        functions = index.symbols("function")
+
+        assert [(s.name, s.file_path) for s in functions] == [
+            ("load", "src/b.py"), ("load", "src/a.py"), ("save", "src/b.py")]
+        assert index.count("class") == 1
+        assert index.count("function") == 3
+        assert index.dependencies() == {"requests", "yaml"}
+        assert [path for path, _ in index.files()] == ["src/b.py", "src/a.py", "src/c.py"]
+
+    def test_refresh_indexes_changed_files_only(self, index, documentation):
+        """Test that a refresh only re-indexes changed, added and removed files."""
+        assert not index.refresh(documentation, set())
+
+        documentation["src/a.py"] = make_entry("dump")
+        documentation["src/d.py"] = make_entry("run")
+        del documentation["src/c.py"]
+        with patch("ai_doc_generator.symbol_index.index_file", wraps=index_file) as indexed:
+            assert index.refresh(documentation, {"src/a.py"})
+
+        assert [call.args[0] for call in indexed.call_args_list] == ["src/a.py", "src/d.py"]
+        assert "src/c.py" not in index
+        assert [s.name for s in index.symbols("function")] == ["dump", "load", "run", "save"]
+
+    def test_save_and_load(self, index, tmp_path):
+        """Test that a saved index is read back unchanged."""
+        path = tmp_path / "index.json"
+        index.save(path)
+
+        loaded = SymbolIndex.load(path)
+
+        assert list(loaded.files()) == list(index.files())
+        assert loaded.symbols("class") == index.symbols("class")
+
+    def test_load_unusable_index(self, tmp_path):
+        """Test that missing, corrupt and outdated index files are ignored."""
+        path = tmp_path / "index.json"
+        assert SymbolIndex.load(path) is None
+
+        path.write_text("{not json")
+        assert SymbolIndex.load(path) is None
+
+        path.write_text(json.dumps({"version": INDEX_VERSION + 1, "files": {}}))
+        assert SymbolIndex.load(path) is None
@@ -0,0 +1,213 @@
+"""
+Tests for the symbol tracker module.
+"""
+
+from pathlib import Path
+
+import pytest
+
+from ai_doc_generator.code_analyzer import CodeAnalyzer
+from ai_doc_generator.symbol_tracker import SymbolTracker, MODULE_SYMBOL
+
+
+SOURCE = '''"""Sample module."""
+import os
+
+
+class Service:
+    """A service."""
+
+    timeout = 10
+
+    def start(self):
+        """Start the service."""
+        return True
+
+    @property
+    def name(self):
+        return "service"
+
+
+def helper(value):
+    """Help."""
+    return value * 2
+'''
+
+
+class TestSymbolTracker:
+    """Test cases for the SymbolTracker class."""
+
+    @pytest.fixture
+    def tracker(self):
+        """Create a SymbolTracker instance."""
+        return SymbolTracker()
+
+    def fingerprint(self, tracker, content):
+        """Analyze and fingerprint source code."""
+        analysis = CodeAnalyzer().analyze_file(Path("sample.py"), content)
+        return tracker.fingerprint(content, analysis)
+
+    def test_fingerprint_symbols(self, tracker):
+        """Test that every class, method and function gets a fingerprint."""
+        fingerprints = self.fingerprint(tracker, SOURCE)
+
+        assert set(fingerprints) == {
+            MODULE_SYMBOL, "Service", "Service.start", "Service.name", "helper"
+        }
+
+    def test_method_change_only_affects_method(self, tracker):
+        """Test that editing a method body changes only that method."""
+        before = self.fingerprint(tracker, SOURCE)
+        after = self.fingerprint(tracker, SOURCE.replace("return True", "return False"))
+
+        changed, removed = tracker.diff(before, after)
+
+        assert changed == ["Service.start"]
+        assert removed == []
+
+    def test_class_body_change(self, tracker):
+        """Test that class-level changes outside methods change the class."""
+        before = self.fingerprint(tracker, SOURCE)
+        after = self.fingerprint(tracker, SOURCE.replace("timeout = 10", "timeout = 20"))
+
+        changed, _ = tracker.diff(before, after)
+
+        assert changed == ["Service"]
+
+    def test_decorator_change(self, tracker):
+        """Test that changing a decorator changes the decorated symbol only."""
+        before = self.fingerprint(tracker, SOURCE)
+        after = self.fingerprint(tracker, SOURCE.replace("@property", "@cached_property"))
+
+        changed, _ = tracker.diff(before, after)
+
+        assert changed == ["Service.name"]
+
+    def test_module_change(self, tracker):
+        """Test that module-level changes are reported as the module symbol."""
+        before = self.fingerprint(tracker, SOURCE)
+        after = self.fingerprint(tracker, SOURCE.replace("import os", "import sys"))
+
+        changed, _ = tracker.diff(before, after)
+
+        assert changed == [MODULE_SYMBOL]
+        assert not tracker.can_update_symbols(changed, [], after)
+
+    def test_added_and_removed_symbols(self, tracker):
+        """Test detection of added and removed functions."""
+        before = self.fingerprint(tracker, SOURCE)
+        after = self.fingerprint(
+            tracker, SOURCE.replace("def helper(value):", "def assist(value):")
+        )
+
+        changed, removed = tracker.diff(before, after)
+
+        assert changed == ["assist"]
+        assert removed == ["helper"]
+
+    def test_can_update_symbols_ratio(self, tracker):
+        """Test that large changes fall back to whole-file documentation."""
+        fingerprints = self.fingerprint(tracker, SOURCE)
+
+        assert tracker.can_update_symbols(["helper"], [], fingerprints)
+        assert not tracker.can_update_symbols(["helper", "Service", "Service.start"], [], fingerprints)
+
+    def test_get_symbol_source(self, tracker):
+        """Test extracting the source of methods and classes."""
+        analysis = CodeAnalyzer().analyze_file(Path("sample.py"), SOURCE)
+
+        method_source = tracker.get_symbol_source(SOURCE, analysis, "Service.start")
+        assert method_source.strip().startswith("def start(self):")
+        assert "return True" in method_source
+
+        class_source = tracker.get_symbol_source(SOURCE, analysis, "Service")
+        assert "timeout = 10" in class_source
+        assert "def start(self): ..." in class_source
+        assert "return True" not in class_source
+
+        assert tracker.get_symbol_source(SOURCE, analysis, "missing") is None
+
+    def test_splice_replaces_heading_section(self, tracker):
+        """Test replacing a section found by its heading."""
+        documentation = "\n".join([
+            "# Overview",
+            "",
+            "## Class `Service`",
+            "Service docs.",
+            "### `start()`",
+            "Old start docs.",
+            "### `name`",
+            "Name docs.",
+            "## Function `helper`",
+            "Helper docs.",
+        ])
+
+        result = tracker.splice(documentation, "Service.start", "New start docs.")
+
+        assert "Old start docs." not in result
+        assert "New start docs." in result
+        assert "<!-- symbol: Service.start -->" in result
+        assert "### `start()`" in result
+        assert "Name docs." in result
+        assert "Helper docs." in result
+
+    def test_splice_class_keeps_method_sections(self, tracker):
+        """Test that replacing a class's own text keeps the sections of its methods."""
+        documentation = "\n".join([
+            "## Class `Service`",
+            "Service docs.",
+            "### `start()`",
+            "Start docs.",
+            "### `name`",
+            "Name docs.",
+            "## Function `helper`",
+            "Helper docs.",
+        ])
+
+        result = tracker.splice(documentation, "Service", "New service docs.", keep_subsections=True)
+
+        assert "Service docs." not in result
+        assert "New service docs." in result
+        assert "### `start()`\nStart docs." in result
+        assert "### `name`\nName docs." in result
+
+        # Methods are still found in the class's section
+        result = tracker.splice(result, "Service.start", "New start docs.")
+        assert "Start docs." not in result
+        assert "New start docs." in result
+        assert "Name docs." in result
+
+    def test_symbol_kind(self, tracker):
+        """Test looking up the kind of a symbol."""
+        analysis = CodeAnalyzer().analyze_file(Path("sample.py"), SOURCE)
+
+        assert tracker.symbol_kind(analysis, "Service") == "class"
+        assert tracker.symbol_kind(analysis, "Service.start") == "method"
+        assert tracker.symbol_kind(analysis, "helper") == "function"
+        assert tracker.symbol_kind(analysis, "missing") is None
+
+    def test_splice_replaces_marked_section(self, tracker):
+        """Test that spliced sections can be replaced again."""
+        documentation = tracker.splice("# Overview", "helper", "First version.")
+        documentation = tracker.splice(documentation, "helper", "Second version.")
+
+        assert "First version." not in documentation
+        assert documentation.count("Second version.") == 1
+        assert documentation.count("<!-- symbol: helper -->") == 1
+
+    def test_splice_appends_unknown_symbol(self, tracker):
+        """Test that new symbols are appended to the documentation."""
+        result = tracker.splice("# Overview\nText.", "assist", "Assist docs.")
+
+        assert result.startswith("# Overview\nText.")
+        assert "### `assist`" in result
+        assert result.rstrip().endswith("<!-- /symbol: assist -->")
+
+    def test_splice_removes_section(self, tracker):
+        """Test removing the section of a deleted symbol."""
+        documentation = "# Overview\n## `helper`\nHelper docs.\n## `other`\nOther docs."
+
+        result = tracker.splice(documentation, "helper", None)
+
+        assert "Helper docs." not in result
+        assert "Other docs." in result
@@ -0,0 +1,73 @@
+"""
+Tests for the token accounting module.
+"""
+
+from types import SimpleNamespace
+from unittest.mock import Mock, patch
+
+from ai_doc_generator.tokens import (
+    DEFAULT_CONTEXT_WINDOW, TokenCounter, TokenUsage, context_window, estimate_tokens
+)
+
+
+class TestTokenCounting:
+    """Test cases for token counting."""
+
+    def test_context_window_uses_longest_prefix(self):
+        """Test that model versions map to their family's context window."""
+        assert context_window("gpt-4") == 8192
+        assert context_window("gpt-4-0613") == 8192
+        assert context_window("gpt-4-turbo-preview") == 128000
+        assert context_window("gpt-4o-mini") == 128000
+        assert context_window("unknown-model") == DEFAULT_CONTEXT_WINDOW
+
+    def test_estimate_counts_words_punctuation_and_lines(self):
+        """Test the tokenizer-free estimate."""
+        assert estimate_tokens("") == 0
+        assert estimate_tokens("x = 1\n") == 4
+        assert estimate_tokens("very_long_identifier_name") == 7
+        assert estimate_tokens("def f(a, b):") == 7
+
+    def test_counter_falls_back_to_estimate(self):
+        """Test that counts are estimated when tiktoken is not installed."""
+        with patch("ai_doc_generator.tokens.tiktoken", None):
+            counter = TokenCounter("gpt-4o")
+
+        assert not counter.exact
+        assert counter.count("x = 1\n" * 10) == 40
+
+    def test_truncate_fits_budget(self):
+        """Test that truncated text fits the token budget."""
+        with patch("ai_doc_generator.tokens.tiktoken", None):
+            counter = TokenCounter("gpt-4o")
+        text = "value = compute(value)\n" * 500
+
+        truncated = counter.truncate(text, 300)
+
+        assert text.startswith(truncated)
+        assert 250 <= counter.count(truncated) <= 300
+        assert counter.truncate("short", 300) == "short"
+
+
+class TestTokenUsage:
+    """Test cases for the TokenUsage class."""
+
+    def test_records_estimated_and_actual_usage(self):
+        """Test that estimates are compared with the usage reported by the API."""
+        usage = TokenUsage()
+        usage.record(110, SimpleNamespace(prompt_tokens=100, completion_tokens=50))
+        usage.record(90, SimpleNamespace(prompt_tokens=100, completion_tokens=30))
+        # Responses without usage only count as estimates
+        usage.record(40, None)
+        usage.record(10, Mock())
+
+        stats = usage.stats()
+        assert stats["requests"] == 4
+        assert stats["estimated_prompt_tokens"] == 250
+        assert stats["prompt_tokens"] == 200
+        assert stats["completion_tokens"] == 80
+        assert stats["estimate_error_percent"] == 0.0
+
+    def test_no_reported_usage(self):
+        """Test the statistics before any usage is reported."""
+        assert TokenUsage().stats()["estimate_error_percent"] is None